@@ -0,0 +1,18 @@
+"""
+Performance benchmarks of medkit
+
+Benchmarks are written in the style of `asv <https://asv.readthedocs.io>`_:
+each `bench_*.py` module contains classes with an optional `setup()` method
+and `time_*()` methods, the duration of which is measured, or `track_*()`
+methods returning another measure (for instance a memory size). They only
+rely on synthetic data and can be run offline from the root of the repository
+with:
+
+.. code-block:: sh
+
+    python -m benchmarks --output results.json
+
+Results are written in a JSON file, that can be given to a later run with
+`--compare` to display the ratio between values (for instance to compare
+2 releases).
+"""
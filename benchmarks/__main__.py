@@ -0,0 +1,60 @@
+"""Command line interface to run benchmarks (cf `python -m benchmarks --help`)"""
+
+import argparse
+import json
+from pathlib import Path
+
+from benchmarks._runner import BenchmarkResult, load_results, run_benchmarks
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks", description="Run medkit benchmarks"
+    )
+    parser.add_argument(
+        "-o", "--output", type=Path, help="JSON file in which to write results"
+    )
+    parser.add_argument(
+        "-k", "--filter", help="Only run benchmarks whose name contains this string"
+    )
+    parser.add_argument(
+        "-r", "--repeat", type=int, default=5, help="Number of measures (default: 5)"
+    )
+    parser.add_argument(
+        "--quick",
+        action="store_true",
+        help="Call each benchmark only once, to check that all benchmarks work",
+    )
+    parser.add_argument(
+        "--compare",
+        type=Path,
+        help="JSON file with previous results to compare values with",
+    )
+    args = parser.parse_args()
+
+    previous_values = load_results(args.compare) if args.compare else {}
+
+    def print_result(result: BenchmarkResult):
+        if result.unit == "seconds":
+            line = f"{result.name:<70} {result.median * 1000:>10.3f} ms"
+        else:
+            line = f"{result.name:<70} {result.median:>10.3f} {result.unit}"
+        previous_value = previous_values.get(result.name)
+        if previous_value is not None:
+            line += f"  x{result.median / previous_value:.2f}"
+        print(line, flush=True)
+
+    results = run_benchmarks(
+        name_filter=args.filter,
+        repeat=args.repeat,
+        quick=args.quick,
+        on_result=print_result,
+    )
+
+    if args.output is not None:
+        with open(args.output, mode="w", encoding="utf-8") as fp:
+            json.dump(results, fp, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""Generators of synthetic documents used by benchmarks"""
+
+__all__ = [
+    "generate_text",
+    "generate_docs",
+    "generate_entities",
+    "generate_doc_with_entities",
+]
+
+import random
+from typing import List
+
+from medkit.core import Attribute
+from medkit.core.text import Entity, Segment, Span, TextDocument
+
+_SENTENCES = [
+    "Le patient présente un diabète de type 2 depuis 2010.",
+    "Pas d'hypertension artérielle ni de dyslipidémie.",
+    "Antécédents d'infarctus du myocarde chez le père.",
+    "Il n'y a pas de signe de pneumopathie à la radiographie.",
+    "Traitement par metformine 1000 mg deux fois par jour.",
+    "La patiente se plaint de céphalées et de nausées depuis 3 jours.",
+    "Suspicion de covid, un test PCR sera réalisé demain.",
+    "L'examen clinique ne retrouve pas d'anomalie.",
+    "Allergie connue à la pénicilline.",
+    "Il pourrait s'agir d'une insuffisance cardiaque débutante.",
+    "Scanner thoracique : absence d'embolie pulmonaire.",
+    "Tabagisme actif estimé à 20 paquets-années.",
+]
+
+_LABELS = ["disorder", "drug", "anatomy", "procedure", "sign"]
+
+
+def generate_text(nb_sentences: int, rng: random.Random) -> str:
+    """Generate a clinical-like text made of `nb_sentences` sentences"""
+    lines = []
+    for _ in range(nb_sentences):
+        lines.append(rng.choice(_SENTENCES))
+        # group sentences in paragraphs
+        lines.append("\n" if rng.random() < 0.2 else " ")
+    return "".join(lines)
+
+
+def generate_docs(
+    nb_docs: int, nb_sentences: int = 20, seed: int = 0
+) -> List[TextDocument]:
+    """Generate `nb_docs` documents without annotations"""
+    rng = random.Random(seed)
+    return [TextDocument(text=generate_text(nb_sentences, rng)) for _ in range(nb_docs)]
+
+
+def generate_entities(
+    text: str, nb_entities: int, rng: random.Random, nb_attrs: int = 1
+) -> List[Entity]:
+    """Generate `nb_entities` entities at random positions of `text`"""
+    entities = []
+    for _ in range(nb_entities):
+        start = rng.randrange(len(text) - 10)
+        end = start + rng.randint(1, 10)
+        attrs = [
+            Attribute(label=f"attr_{i}", value=rng.random() < 0.5)
+            for i in range(nb_attrs)
+        ]
+        entity = Entity(
+            label=rng.choice(_LABELS),
+            spans=[Span(start, end)],
+            text=text[start:end],
+            attrs=attrs,
+        )
+        entities.append(entity)
+    return entities
+
+
+def generate_doc_with_entities(
+    nb_entities: int, nb_sentences: int = 200, seed: int = 0
+) -> TextDocument:
+    """Generate a document with `nb_entities` entities and 1 segment per sentence"""
+    rng = random.Random(seed)
+    text = generate_text(nb_sentences, rng)
+    doc = TextDocument(text=text)
+
+    start = 0
+    for sentence_text in text.split(". "):
+        end = start + len(sentence_text)
+        doc.anns.add(
+            Segment(label="sentence", spans=[Span(start, end)], text=sentence_text)
+        )
+        start = end + 2
+
+    for entity in generate_entities(text, nb_entities, rng):
+        doc.anns.add(entity)
+    return doc
@@ -0,0 +1,259 @@
+"""Discovery and execution of asv-style benchmarks"""
+
+__all__ = [
+    "BenchmarkResult",
+    "find_benchmarks",
+    "run_benchmark",
+    "run_benchmarks",
+    "load_results",
+]
+
+import dataclasses
+import datetime
+import functools
+import importlib
+import importlib.metadata
+import inspect
+import itertools
+import json
+import pkgutil
+import platform
+import statistics
+import subprocess
+import timeit
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+import benchmarks
+
+# prefix of benchmark modules, of timed methods and of tracked methods
+_MODULE_PREFIX = "bench_"
+_TIME_METHOD_PREFIX = "time_"
+_TRACK_METHOD_PREFIX = "track_"
+# version of the format of results files
+_RESULTS_FORMAT_VERSION = 2
+
+
+@dataclasses.dataclass
+class BenchmarkResult:
+    """
+    Measures of a benchmark
+
+    Attributes
+    ----------
+    name:
+        Full name of the benchmark (`<module>.<class>.<method>`)
+    number:
+        Number of calls of the benchmark per measure
+    values:
+        Duration of a call for each measure for timed benchmarks, or value
+        returned by the method for tracked benchmarks
+    unit:
+        Unit of `values` ("seconds" for timed benchmarks)
+    """
+
+    name: str
+    number: int
+    values: List[float]
+    unit: str = "seconds"
+
+    @property
+    def min(self) -> float:
+        return min(self.values)
+
+    @property
+    def median(self) -> float:
+        return statistics.median(self.values)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return dict(
+            name=self.name,
+            number=self.number,
+            values=self.values,
+            unit=self.unit,
+            min=self.min,
+            median=self.median,
+        )
+
+
+def find_benchmarks(
+    name_filter: Optional[str] = None,
+) -> Iterator[Tuple[str, type, str, Tuple[Any, ...]]]:
+    """
+    Find all benchmarks in `bench_*` modules of the `benchmarks` package
+
+    As with asv, a class can have a `params` attribute (a list of values, or a
+    list of lists of values for several parameters), in which case each of its
+    benchmarks is run for each combination of values, which are passed to
+    `setup()`, to the benchmark method and to `teardown()`
+
+    Benchmark methods are either timed (`time_*()`) or tracked (`track_*()`,
+    returning a value such as a memory size, with an optional `unit`
+    attribute)
+
+    Parameters
+    ----------
+    name_filter:
+        Only return benchmarks whose full name contains this string
+
+    Returns
+    -------
+    Iterator[Tuple[str, type, str, Tuple[Any, ...]]]
+        Full name, class, method name and parameters of each benchmark
+    """
+    for module_info in pkgutil.iter_modules(benchmarks.__path__):
+        if not module_info.name.startswith(_MODULE_PREFIX):
+            continue
+        module = importlib.import_module(f"benchmarks.{module_info.name}")
+        for class_name, cls in inspect.getmembers(module, inspect.isclass):
+            if cls.__module__ != module.__name__:
+                continue
+            for method_name, _ in inspect.getmembers(cls, inspect.isfunction):
+                if not method_name.startswith(
+                    (_TIME_METHOD_PREFIX, _TRACK_METHOD_PREFIX)
+                ):
+                    continue
+                base_name = f"{module_info.name}.{class_name}.{method_name}"
+                for params in _get_param_combinations(cls):
+                    name = base_name
+                    if params:
+                        name += "(" + ", ".join(repr(p) for p in params) + ")"
+                    if name_filter is None or name_filter in name:
+                        yield name, cls, method_name, params
+
+
+def _get_param_combinations(cls: type) -> List[Tuple[Any, ...]]:
+    params = getattr(cls, "params", None)
+    if not params:
+        return [()]
+    # single parameter
+    if not all(isinstance(p, (list, tuple)) for p in params):
+        params = [params]
+    return list(itertools.product(*params))
+
+
+def run_benchmark(
+    name: str,
+    cls: type,
+    method_name: str,
+    params: Tuple[Any, ...] = (),
+    repeat: int = 5,
+    quick: bool = False,
+) -> BenchmarkResult:
+    """
+    Run a benchmark, calling `setup()` once on a new instance of `cls` before
+    timing its `method_name` method (or calling it once if it is a tracked
+    benchmark)
+
+    Parameters
+    ----------
+    name:
+        Full name of the benchmark
+    cls:
+        Class containing the benchmark
+    method_name:
+        Name of the timed or tracked method
+    params:
+        Parameters passed to `setup()`, to the benchmark method and to
+        `teardown()`
+    repeat:
+        Number of measures of timed benchmarks
+    quick:
+        If True, the method is only called once (useful to check that
+        benchmarks work)
+    """
+    instance = cls()
+    if hasattr(instance, "setup"):
+        instance.setup(*params)
+    method = getattr(instance, method_name)
+    func: Callable[[], Any] = functools.partial(method, *params)
+
+    if method_name.startswith(_TRACK_METHOD_PREFIX):
+        result = BenchmarkResult(
+            name=name,
+            number=1,
+            values=[func()],
+            unit=getattr(method, "unit", "unit"),
+        )
+    else:
+        timer = timeit.Timer(func)
+        if quick:
+            number, repeat = 1, 1
+        else:
+            # call method enough times for each measure to last at least 0.2s
+            number, _ = timer.autorange()
+        times = [t / number for t in timer.repeat(repeat=repeat, number=number)]
+        result = BenchmarkResult(name=name, number=number, values=times)
+
+    if hasattr(instance, "teardown"):
+        instance.teardown(*params)
+    return result
+
+
+def run_benchmarks(
+    name_filter: Optional[str] = None,
+    repeat: int = 5,
+    quick: bool = False,
+    on_result: Optional[Callable[[BenchmarkResult], None]] = None,
+) -> Dict[str, Any]:
+    """
+    Run all benchmarks and return their results, along with information about
+    the environment, in a JSON-serializable dict
+
+    Parameters
+    ----------
+    name_filter:
+        Only run benchmarks whose full name contains this string
+    repeat:
+        Number of measures for each benchmark
+    quick:
+        If True, each benchmark is only called once
+    on_result:
+        Optional callback called with the result of each benchmark
+    """
+    results = []
+    for name, cls, method_name, params in find_benchmarks(name_filter):
+        result = run_benchmark(
+            name, cls, method_name, params, repeat=repeat, quick=quick
+        )
+        if on_result is not None:
+            on_result(result)
+        results.append(result.to_dict())
+
+    return dict(
+        version=_RESULTS_FORMAT_VERSION,
+        date=datetime.datetime.now().isoformat(timespec="seconds"),
+        medkit_version=_get_medkit_version(),
+        commit=_get_commit(),
+        python_version=platform.python_version(),
+        platform=platform.platform(),
+        benchmarks=results,
+    )
+
+
+def load_results(path: Path) -> Dict[str, float]:
+    """Load the median values by benchmark name of a results file"""
+    with open(path, encoding="utf-8") as fp:
+        data = json.load(fp)
+    return {b["name"]: b["median"] for b in data["benchmarks"]}
+
+
+def _get_medkit_version() -> Optional[str]:
+    try:
+        return importlib.metadata.version("medkit-lib")
+    except importlib.metadata.PackageNotFoundError:
+        return None
+
+
+def _get_commit() -> Optional[str]:
+    try:
+        output = subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=Path(__file__).parent,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return output.stdout.strip()
@@ -0,0 +1,191 @@
+"""Benchmarks of the core data model"""
+
+import random
+import tracemalloc
+
+from medkit.core import Attribute, Pipeline, PipelineStep, ProvTracer, set_id_generator
+from medkit.core.text import Entity, Segment, Span, TextDocument, span_utils
+from medkit.text.ner import RegexpMatcher
+from medkit.text.segmentation import SentenceTokenizer
+
+from benchmarks._corpus import (
+    generate_doc_with_entities,
+    generate_entities,
+    generate_text,
+)
+
+
+class TextDocumentSuite:
+    """Construction of documents and access to their annotations"""
+
+    def setup(self):
+        rng = random.Random(0)
+        self.text = generate_text(200, rng)
+        self.entities = generate_entities(self.text, 1_000, rng)
+        self.doc = generate_doc_with_entities(nb_entities=1_000)
+
+    def time_construction(self):
+        doc = TextDocument(text=self.text)
+        for entity in self.entities:
+            doc.anns.add(entity)
+
+    def time_get_by_label(self):
+        for label in ("disorder", "drug", "anatomy", "procedure", "sign"):
+            self.doc.anns.get(label=label)
+
+    def time_get_entities(self):
+        self.doc.anns.get_entities()
+
+    def time_get_segments_by_label(self):
+        self.doc.anns.get_segments(label="sentence")
+
+    def time_iter_attrs(self):
+        for entity in self.doc.anns.get_entities():
+            entity.attrs.get(label="attr_0")
+
+    def time_get_entities_by_sentence(self):
+        for sentence in self.doc.anns.get_segments(label="sentence"):
+            span = sentence.spans[0]
+            self.doc.anns.get_contained(span.start, span.end, label="disorder")
+
+
+class AnnotationSuite:
+    """Creation of annotations, with and without attributes"""
+
+    def time_segment_creation(self):
+        for _ in range(1_000):
+            Segment(label="sentence", spans=[Span(0, 6)], text="asthme")
+
+    def time_segment_creation_with_attr(self):
+        for _ in range(1_000):
+            segment = Segment(label="sentence", spans=[Span(0, 6)], text="asthme")
+            segment.attrs.add(Attribute(label="negation", value=False))
+
+
+class IdGeneratorSuite:
+    """Creation of annotations with each builtin identifier generator"""
+
+    params = ["uuid", "counter", "base32"]
+    param_names = ["id_generator"]
+
+    def setup(self, id_generator):
+        set_id_generator(id_generator)
+
+    def teardown(self, id_generator):
+        set_id_generator("uuid")
+
+    def time_entity_creation(self, id_generator):
+        for _ in range(1_000):
+            Entity(label="disorder", spans=[Span(0, 6)], text="asthme")
+
+
+class SpanSuite:
+    """Creation and memory footprint of spans"""
+
+    def time_creation(self):
+        for i in range(10_000):
+            Span(i, i + 10)
+
+    def track_memory_per_span(self):
+        nb_spans = 100_000
+        spans = [None] * nb_spans
+        tracemalloc.start()
+        for i in range(nb_spans):
+            spans[i] = Span(i, i + 10)
+        size, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        return size / nb_spans
+
+    track_memory_per_span.unit = "bytes"
+
+
+class SpanUtilsSuite:
+    """Operations on spans of a text with many modifications"""
+
+    def setup(self):
+        rng = random.Random(0)
+        self.text = generate_text(200, rng)
+        self.spans = [Span(0, len(self.text))]
+        # replace all occurrences of a char, leading to many fragmented spans
+        self.ranges = [(i, i + 1) for i, c in enumerate(self.text) if c == "e"]
+        self.replacements = ["é"] * len(self.ranges)
+        _, self.fragmented_spans = span_utils.replace(
+            self.text, self.spans, self.ranges, self.replacements
+        )
+        self.extract_ranges = [
+            (start, start + 20) for start in range(0, len(self.text) - 20, 50)
+        ]
+
+    def time_replace(self):
+        span_utils.replace(self.text, self.spans, self.ranges, self.replacements)
+
+    def time_remove(self):
+        span_utils.remove(self.text, self.spans, self.ranges)
+
+    def time_extract(self):
+        span_utils.extract(self.text, self.fragmented_spans, self.extract_ranges)
+
+    def time_normalize_spans(self):
+        span_utils.normalize_spans(self.fragmented_spans)
+
+
+class SpanUtilsScalingSuite:
+    """
+    Scaling of span modifications with text length and number of edits, which
+    should be linear in both
+    """
+
+    params = [[10_000, 100_000, 1_000_000], [100, 1_000, 10_000]]
+    param_names = ["text_length", "nb_edits"]
+
+    def setup(self, text_length, nb_edits):
+        rng = random.Random(0)
+        text = generate_text(text_length // 40 + 1, rng)
+        while len(text) < text_length:
+            text += text
+        self.text = text[:text_length]
+        self.spans = [Span(0, text_length)]
+        # evenly spaced edits
+        step = text_length // nb_edits
+        self.ranges = [(i, i + 1) for i in range(0, step * nb_edits, step)]
+        self.replacements = ["xyz"] * nb_edits
+        self.positions = [start for start, _ in self.ranges]
+
+    def time_replace(self, text_length, nb_edits):
+        span_utils.replace(self.text, self.spans, self.ranges, self.replacements)
+
+    def time_remove(self, text_length, nb_edits):
+        span_utils.remove(self.text, self.spans, self.ranges)
+
+    def time_insert(self, text_length, nb_edits):
+        span_utils.insert(self.text, self.spans, self.positions, self.replacements)
+
+
+class ProvTracerSuite:
+    """Overhead of provenance tracing on a simple pipeline"""
+
+    def setup(self):
+        rng = random.Random(0)
+        texts = [generate_text(20, rng) for _ in range(20)]
+        self.segments = [
+            Segment(label="raw_text", spans=[Span(0, len(text))], text=text)
+            for text in texts
+        ]
+        self.pipeline = self._build_pipeline()
+        self.traced_pipeline = self._build_pipeline()
+
+    @staticmethod
+    def _build_pipeline():
+        steps = [
+            PipelineStep(SentenceTokenizer(), ["raw"], ["sentences"]),
+            PipelineStep(RegexpMatcher(), ["sentences"], ["entities"]),
+        ]
+        return Pipeline(steps, input_keys=["raw"], output_keys=["entities"])
+
+    def time_pipeline(self):
+        self.pipeline.run(self.segments)
+
+    def time_pipeline_with_prov(self):
+        # use a new tracer for each run
+        self.traced_pipeline.set_prov_tracer(ProvTracer())
+        self.traced_pipeline.run(self.segments)
@@ -0,0 +1,84 @@
+"""Benchmarks of medkit-json and parquet serialization"""
+
+import shutil
+import tempfile
+from pathlib import Path
+
+from medkit.core.utils import modules_are_available
+from medkit.io.medkit_json import (
+    build_text_documents_index,
+    load_text_document_at,
+    load_text_documents,
+    save_text_documents,
+)
+
+from benchmarks._corpus import generate_doc_with_entities
+
+
+class MedkitJsonSuite:
+    """Saving and loading documents with many annotations"""
+
+    def setup(self):
+        self.docs = [
+            generate_doc_with_entities(nb_entities=200, nb_sentences=50, seed=i)
+            for i in range(20)
+        ]
+        self.tmp_dir = Path(tempfile.mkdtemp())
+        self.input_file = self.tmp_dir / "input.jsonl"
+        self.output_file = self.tmp_dir / "output.jsonl"
+        save_text_documents(self.docs, self.input_file)
+        build_text_documents_index(self.input_file)
+
+    def teardown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def time_save(self):
+        save_text_documents(self.docs, self.output_file)
+
+    def time_load(self):
+        for _ in load_text_documents(self.input_file):
+            pass
+
+    def time_load_shard(self):
+        for _ in load_text_documents(self.input_file, n_shards=4, shard_index=2):
+            pass
+
+    def time_load_document_at(self):
+        load_text_document_at(self.input_file, len(self.docs) - 1)
+
+
+if modules_are_available(["pyarrow"]):
+    from medkit.io import parquet
+
+    class ParquetSuite:
+        """Saving, loading and querying documents in the parquet format"""
+
+        def setup(self):
+            self.docs = [
+                generate_doc_with_entities(nb_entities=200, nb_sentences=50, seed=i)
+                for i in range(20)
+            ]
+            self.tmp_dir = Path(tempfile.mkdtemp())
+            self.input_dir = self.tmp_dir / "input"
+            self.output_dir = self.tmp_dir / "output"
+            parquet.save_text_documents(self.docs, self.input_dir)
+            self.label = self.docs[0].anns.entities[0].label
+
+        def teardown(self):
+            shutil.rmtree(self.tmp_dir)
+
+        def time_save(self):
+            parquet.save_text_documents(self.docs, self.output_dir)
+
+        def time_load(self):
+            for _ in parquet.load_text_documents(self.input_dir):
+                pass
+
+        def time_load_anns_with_label(self):
+            filters = [("label", "=", self.label)]
+            for _ in parquet.load_text_anns(self.input_dir, filters=filters):
+                pass
+
+        def time_count_labels(self):
+            table = parquet.read_table(self.input_dir, "entities", columns=["label"])
+            table.group_by("label").aggregate([("label", "count")])
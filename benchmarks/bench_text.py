@@ -0,0 +1,218 @@
+"""Benchmarks of rule-based text operations"""
+
+import random
+import shutil
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+from medkit.core import Attribute
+from medkit.core.text import CachedOperation, Segment, Span
+from medkit.core.utils import modules_are_available
+from medkit.text.context import HypothesisDetector, NegationDetector
+from medkit.text.ner import RegexpMatcher
+from medkit.text.ner._umls_embeddings_index import IVFIndex
+from medkit.text.postprocessing import AttributeDuplicator, filter_overlapping_entities
+from medkit.text.segmentation import SentenceTokenizer
+
+from benchmarks._corpus import generate_doc_with_entities, generate_text
+
+
+def _generate_segments(nb_segments, nb_sentences, label):
+    rng = random.Random(0)
+    segments = []
+    for _ in range(nb_segments):
+        text = generate_text(nb_sentences, rng)
+        segments.append(Segment(label=label, spans=[Span(0, len(text))], text=text))
+    return segments
+
+
+class SentenceTokenizerSuite:
+    def setup(self):
+        self.segments = _generate_segments(20, 50, "raw_text")
+        self.tokenizer = SentenceTokenizer()
+
+    def time_run(self):
+        self.tokenizer.run(self.segments)
+
+
+class RegexpMatcherSuite:
+    """RegexpMatcher with default rules"""
+
+    def setup(self):
+        self.sentences = _generate_segments(500, 1, "sentence")
+        self.matcher = RegexpMatcher()
+
+    def time_run(self):
+        self.matcher.run(self.sentences)
+
+
+class CachedOperationSuite:
+    """RegexpMatcher with default rules, with all results in the cache"""
+
+    def setup(self):
+        self.sentences = _generate_segments(500, 1, "sentence")
+        self.tmp_dir = Path(tempfile.mkdtemp())
+        self.matcher = CachedOperation(RegexpMatcher(), self.tmp_dir / "cache.db")
+        self.matcher.run(self.sentences)
+
+    def teardown(self):
+        self.matcher.cache.close()
+        shutil.rmtree(self.tmp_dir)
+
+    def time_run(self):
+        self.matcher.run(self.sentences)
+
+
+class ContextDetectorsSuite:
+    """Negation and hypothesis detectors with default rules"""
+
+    def setup(self):
+        self.texts = [s.text for s in _generate_segments(500, 1, "syntagma")]
+        self.negation_detector = NegationDetector(output_label="negation")
+        self.hypothesis_detector = HypothesisDetector(output_label="hypothesis")
+
+    def _get_syntagmas(self):
+        # new segments for each run since detectors add attributes to them
+        return [
+            Segment(label="syntagma", spans=[Span(0, len(text))], text=text)
+            for text in self.texts
+        ]
+
+    def time_negation_detector(self):
+        self.negation_detector.run(self._get_syntagmas())
+
+    def time_hypothesis_detector(self):
+        self.hypothesis_detector.run(self._get_syntagmas())
+
+
+class PostprocessingSuite:
+    """Post-processing of entities of a long document"""
+
+    def setup(self):
+        doc = generate_doc_with_entities(nb_entities=5_000, nb_sentences=2_000)
+        self.sentences = doc.anns.get_segments(label="sentence")
+        for sentence in self.sentences:
+            sentence.attrs.add(Attribute(label="negation", value=False))
+        self.entities = doc.anns.get_entities()
+        self.duplicator = AttributeDuplicator(attr_labels=["negation"])
+
+    def time_attribute_duplicator(self):
+        self.duplicator.run(self.sentences, self.entities)
+
+    def time_filter_overlapping_entities(self):
+        filter_overlapping_entities(self.entities)
+
+
+class UMLSEmbeddingsIndexSuite:
+    """
+    Search of the 5 nearest neighbours of 128 queries among 200k memory-mapped
+    float16 embeddings, exhaustive (no nb_probes) or with an IVF index
+    """
+
+    params = [None, 4, 32]
+    param_names = ["nb_probes"]
+
+    def setup(self, nb_probes):
+        rng = np.random.default_rng(0)
+        centers = rng.normal(size=(1_000, 128))
+        embeddings = centers[rng.integers(0, 1_000, size=200_000)]
+        embeddings += 0.3 * rng.normal(size=embeddings.shape)
+        embeddings /= np.linalg.norm(embeddings, axis=1, keepdims=True)
+
+        self.tmp_dir = Path(tempfile.mkdtemp())
+        np.save(self.tmp_dir / "embeddings.npy", embeddings.astype(np.float16))
+        self.embeddings = np.load(self.tmp_dir / "embeddings.npy", mmap_mode="r")
+        self.queries = embeddings[:128].astype(np.float32)
+        if nb_probes is not None:
+            self.index = IVFIndex.build(self.embeddings, nb_lists=512)
+
+    def teardown(self, nb_probes):
+        del self.embeddings
+        shutil.rmtree(self.tmp_dir)
+
+    def time_search(self, nb_probes):
+        if nb_probes is None:
+            scores = self.queries @ np.asarray(self.embeddings, dtype=np.float32).T
+            np.argpartition(-scores, 4, axis=1)[:, :5]
+        else:
+            self.index.search(self.queries, self.embeddings, k=5, nb_probes=nb_probes)
+
+
+if modules_are_available(["pysimstring"]):
+    from medkit.text.ner import SimstringMatcher, SimstringMatcherRule, UMLSMatcher
+
+    _SIMSTRING_TERMS = [
+        "diabète",
+        "hypertension artérielle",
+        "dyslipidémie",
+        "infarctus du myocarde",
+        "pneumopathie",
+        "metformine",
+        "céphalées",
+        "nausées",
+        "covid",
+        "pénicilline",
+        "insuffisance cardiaque",
+        "embolie pulmonaire",
+        "tabagisme",
+    ]
+
+    class SimstringMatcherSuite:
+        """SimstringMatcher on sentences, with and without candidate cache"""
+
+        params = [0, 100_000]
+        param_names = ["candidate_cache_size"]
+
+        def setup(self, candidate_cache_size):
+            self.sentences = _generate_segments(500, 1, "sentence")
+            rules = [
+                SimstringMatcherRule(term=t, label="problem") for t in _SIMSTRING_TERMS
+            ]
+            self.matcher = SimstringMatcher(
+                rules=rules, candidate_cache_size=candidate_cache_size
+            )
+
+        def time_run(self, candidate_cache_size):
+            self.matcher.run(self.sentences)
+
+    def _write_umls_files(umls_dir, nb_concepts):
+        """Write MRCONSO.RRF and MRSTY.RRF files with synthetic disorder concepts"""
+        rng = random.Random(0)
+        with open(umls_dir / "MRCONSO.RRF", mode="w", encoding="utf-8") as fp:
+            for i in range(nb_concepts):
+                cui = f"C{i:07d}"
+                for j in range(3):
+                    words = rng.sample(_SIMSTRING_TERMS, 2)
+                    term = f"{words[0]} {i} {words[1]}"
+                    row = [cui, "FRE", "P", f"L{i:07d}{j}"] + [""] * 7
+                    row += ["MDRFRE", "PT", "", term, "0", "N", ""]
+                    fp.write("|".join(row) + "\n")
+        with open(umls_dir / "MRSTY.RRF", mode="w", encoding="utf-8") as fp:
+            for i in range(nb_concepts):
+                fp.write(f"C{i:07d}|T047|B2.2.1.2.1|Disease or Syndrome|AT0|256|\n")
+
+    class UMLSMatcherBuildSuite:
+        """Build of the UMLSMatcher database from synthetic UMLS files"""
+
+        params = [1, 2]
+        param_names = ["n_workers"]
+
+        def setup(self, n_workers):
+            self.tmp_dir = Path(tempfile.mkdtemp())
+            self.umls_dir = self.tmp_dir / "2021AB"
+            self.umls_dir.mkdir()
+            _write_umls_files(self.umls_dir, nb_concepts=10_000)
+
+        def teardown(self, n_workers):
+            shutil.rmtree(self.tmp_dir)
+
+        def time_build_database(self, n_workers):
+            UMLSMatcher.build_database(
+                self.umls_dir,
+                self.tmp_dir / "cache",
+                language="FRE",
+                n_workers=n_workers,
+                show_progress=False,
+            )
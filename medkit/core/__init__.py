@@ -13,6 +13,8 @@ __all__ = [
     "Document",
     "generate_id",
     "generate_deterministic_id",
+    "set_id_generator",
+    "get_id_generator",
     "DocOperation",
     "Operation",
     "OperationDescription",
@@ -25,6 +27,8 @@ __all__ = [
     "Prov",
     "Store",
     "GlobalStore",
+    "SQLiteStore",
+    "ResultCache",
     "ProvStore",
     "create_prov_store",
     # not imported
@@ -42,7 +46,12 @@ from .conversion import InputConverter, OutputConverter
 from .data_item import IdentifiableDataItem, IdentifiableDataItemWithAttrs
 from .doc_pipeline import DocPipeline
 from .document import Document
-from .id import generate_id, generate_deterministic_id
+from .id import (
+    generate_id,
+    generate_deterministic_id,
+    set_id_generator,
+    get_id_generator,
+)
 from .operation import Operation, DocOperation
 from .operation_desc import OperationDescription
 from .pipeline import (
@@ -54,4 +63,6 @@ from .pipeline import (
 )
 from .prov_tracer import ProvTracer, Prov
 from .store import Store, GlobalStore
+from .sqlite_store import SQLiteStore
+from .result_cache import ResultCache
 from .prov_store import ProvStore, create_prov_store
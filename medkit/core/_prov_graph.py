@@ -1,8 +1,9 @@
 from __future__ import annotations
 
-__all__ = ["ProvGraph", "ProvNode"]
+__all__ = ["ProvGraph", "ProvNode", "CompactProvGraph"]
 
 import dataclasses
+from array import array
 from typing import Any, Dict, List, Optional
 
 
@@ -132,6 +133,53 @@ class ProvGraph:
         else:
             self._sub_graphs_by_op_id[operation_id] = sub_graph
 
+    def update(self, other_graph: ProvGraph):
+        """Add all nodes and sub graphs of another graph to this graph (in place).
+
+        Nodes already present in both graphs are merged: a "stub" node is
+        completed with the operation and sources of the other node, and
+        derivation edges are concatenated. Sub graphs of the same operation
+        are merged recursively.
+
+        Parameters
+        ----------
+        other_graph:
+            Graph to merge into this graph, for instance a graph that was built
+            in another process.
+        """
+
+        for other_node in other_graph.get_nodes():
+            node = self._nodes_by_id.get(other_node.data_item_id)
+            if node is None:
+                self._nodes_by_id[other_node.data_item_id] = ProvNode(
+                    data_item_id=other_node.data_item_id,
+                    operation_id=other_node.operation_id,
+                    source_ids=list(other_node.source_ids),
+                    derived_ids=list(other_node.derived_ids),
+                )
+                continue
+
+            if other_node.operation_id is not None:
+                if node.operation_id is None:
+                    node.operation_id = other_node.operation_id
+                    node.source_ids = list(other_node.source_ids)
+                else:
+                    assert node.operation_id == other_node.operation_id, (
+                        f"Node with uid {node.data_item_id} has different"
+                        " operation_id in merged graphs"
+                    )
+            derived_ids = set(node.derived_ids)
+            node.derived_ids.extend(
+                uid for uid in other_node.derived_ids if uid not in derived_ids
+            )
+
+        for operation_id, other_sub_graph in other_graph._sub_graphs_by_op_id.items():
+            sub_graph = self._sub_graphs_by_op_id.get(operation_id)
+            if sub_graph is None:
+                sub_graph = ProvGraph()
+                self._sub_graphs_by_op_id[operation_id] = sub_graph
+            sub_graph.update(other_sub_graph)
+
     def _merge(self, other_graph: ProvGraph) -> ProvGraph:
         merged_prov_graph = ProvGraph()
         merged_prov_graph._nodes_by_id = {
@@ -185,3 +233,219 @@ class ProvGraph:
             uid: s.to_dict() for uid, s in self._sub_graphs_by_op_id.items()
         }
         return dict(nodes=nodes, sub_graphs_by_op_id=sub_graphs_by_op_id)
+
+
+class _UidInterner:
+    """Mapping between string identifiers and consecutive integers"""
+
+    def __init__(self):
+        self._uids: List[str] = []
+        self._index_by_uid: Dict[str, int] = {}
+
+    def intern(self, uid: str) -> int:
+        index = self._index_by_uid.get(uid)
+        if index is None:
+            index = len(self._uids)
+            self._uids.append(uid)
+            self._index_by_uid[uid] = index
+        return index
+
+    def get_index(self, uid: str) -> Optional[int]:
+        return self._index_by_uid.get(uid)
+
+    def get_uid(self, index: int) -> str:
+        return self._uids[index]
+
+    def __len__(self) -> int:
+        return len(self._uids)
+
+
+# value of CompactProvGraph._op_indices for nodes without operation
+_STUB_NODE = -1
+
+
+class CompactProvGraph(ProvGraph):
+    """
+    Provenance graph with the same behavior as :class:`ProvGraph` but storing
+    nodes and edges in compact integer arrays rather than in `ProvNode`
+    objects.
+
+    Identifiers are interned to integers by an interner that can be shared
+    with other graphs (for instance sub graphs and graphs of sub-provenance
+    tracers using the same store). Each node of the graph is given a local
+    number, in order of creation, by which per-node arrays are indexed, so
+    that the size of the graph only depends on its own nodes and not on all
+    the identifiers of the interner. Each derivation link is stored once as an
+    edge. The source edges of a node are contiguous (they are all added by
+    the same `add_node()` call) and the derived edges of a node form a linked
+    list, so that both can be retrieved without any index rebuilding.
+
+    `ProvNode` objects returned by accessors are built on the fly and
+    modifying them does not modify the graph.
+    """
+
+    def __init__(self, interner: Optional[_UidInterner] = None):
+        if interner is None:
+            interner = _UidInterner()
+
+        self._interner: _UidInterner = interner
+        # local numbers of nodes, by interned identifier of their data item
+        self._nodes_by_index: Dict[int, int] = {}
+        # per node arrays, indexed by local number
+        self._uid_indices = array("i")
+        self._op_indices = array("i")
+        self._source_edge_starts = array("i")
+        self._source_edge_counts = array("i")
+        self._first_derived_edges = array("i")
+        self._last_derived_edges = array("i")
+        # per edge arrays, referencing nodes by local number
+        self._edge_source_nodes = array("i")
+        self._edge_derived_nodes = array("i")
+        self._next_derived_edges = array("i")
+        self._sub_graphs_by_op_id: Dict[str, ProvGraph] = {}
+
+    def get_nodes(self) -> List[ProvNode]:
+        return [self._build_node(node) for node in range(len(self._uid_indices))]
+
+    def get_node(self, data_item_id: str) -> ProvNode:
+        node = self._get_node(data_item_id)
+        if node is None:
+            raise KeyError(data_item_id)
+        return self._build_node(node)
+
+    def has_node(self, data_item_id: str) -> bool:
+        return self._get_node(data_item_id) is not None
+
+    def add_node(self, data_item_id: str, operation_id: str, source_ids: List[str]):
+        # same behavior as ProvGraph.add_node()
+        index = self._interner.intern(data_item_id)
+        op_index = self._interner.intern(operation_id)
+        source_indices = [self._interner.intern(uid) for uid in source_ids]
+
+        node = self._nodes_by_index.get(index)
+        if node is None:
+            node = self._create_node(index)
+        else:
+            assert (
+                self._op_indices[node] == _STUB_NODE
+            ), f"Node with uid {data_item_id} already added to graph"
+            assert self._source_edge_counts[node] == 0, (
+                "Inconsistent values for stub node: operation_id is None but source_ids"
+                " is not empty"
+            )
+
+        self._op_indices[node] = op_index
+        self._source_edge_starts[node] = len(self._edge_source_nodes)
+        self._source_edge_counts[node] = len(source_indices)
+        for source_index in source_indices:
+            source_node = self._nodes_by_index.get(source_index)
+            if source_node is None:
+                source_node = self._create_node(source_index)
+            self._add_edge(source_node, node)
+
+    def add_sub_graph(self, operation_id: str, sub_graph: ProvGraph):
+        current_sub_graph = self._sub_graphs_by_op_id.get(operation_id)
+        if current_sub_graph is None:
+            self._sub_graphs_by_op_id[operation_id] = sub_graph
+        elif current_sub_graph is not sub_graph:
+            # merge in place rather than copying the whole sub graph each time
+            current_sub_graph.update(sub_graph)
+
+    def update(self, other_graph: ProvGraph):
+        if other_graph is self:
+            return
+
+        for other_node in other_graph.get_nodes():
+            node = self._get_node(other_node.data_item_id)
+            if other_node.operation_id is None:
+                if node is None:
+                    self._create_node(self._interner.intern(other_node.data_item_id))
+            elif node is None or self._op_indices[node] == _STUB_NODE:
+                self.add_node(
+                    other_node.data_item_id,
+                    other_node.operation_id,
+                    other_node.source_ids,
+                )
+            else:
+                op_id = self._interner.get_uid(self._op_indices[node])
+                assert op_id == other_node.operation_id, (
+                    f"Node with uid {other_node.data_item_id} has different"
+                    " operation_id in merged graphs"
+                )
+
+        for operation_id, other_sub_graph in other_graph._sub_graphs_by_op_id.items():
+            sub_graph = self._sub_graphs_by_op_id.get(operation_id)
+            if sub_graph is None:
+                sub_graph = CompactProvGraph(self._interner)
+                self._sub_graphs_by_op_id[operation_id] = sub_graph
+            sub_graph.update(other_sub_graph)
+
+    def _merge(self, other_graph: ProvGraph) -> ProvGraph:
+        merged_prov_graph = CompactProvGraph(self._interner)
+        merged_prov_graph.update(self)
+        merged_prov_graph.update(other_graph)
+        return merged_prov_graph
+
+    def check_sanity(self):
+        ProvGraph(self.get_nodes(), self._sub_graphs_by_op_id).check_sanity()
+
+    def to_dict(self) -> Dict[str, Any]:
+        return ProvGraph(self.get_nodes(), self._sub_graphs_by_op_id).to_dict()
+
+    def _get_node(self, data_item_id: str) -> Optional[int]:
+        index = self._interner.get_index(data_item_id)
+        if index is None:
+            return None
+        return self._nodes_by_index.get(index)
+
+    def _create_node(self, index: int) -> int:
+        # create stub node and return its local number
+        node = len(self._uid_indices)
+        self._nodes_by_index[index] = node
+        self._uid_indices.append(index)
+        self._op_indices.append(_STUB_NODE)
+        self._source_edge_starts.append(0)
+        self._source_edge_counts.append(0)
+        self._first_derived_edges.append(-1)
+        self._last_derived_edges.append(-1)
+        return node
+
+    def _add_edge(self, source_node: int, derived_node: int):
+        edge = len(self._edge_source_nodes)
+        self._edge_source_nodes.append(source_node)
+        self._edge_derived_nodes.append(derived_node)
+        self._next_derived_edges.append(-1)
+
+        # append to linked list of derived edges of source
+        last_edge = self._last_derived_edges[source_node]
+        if last_edge == -1:
+            self._first_derived_edges[source_node] = edge
+        else:
+            self._next_derived_edges[last_edge] = edge
+        self._last_derived_edges[source_node] = edge
+
+    def _build_node(self, node: int) -> ProvNode:
+        get_uid = self._interner.get_uid
+        uid_indices = self._uid_indices
+
+        op_index = self._op_indices[node]
+        operation_id = get_uid(op_index) if op_index != _STUB_NODE else None
+
+        start = self._source_edge_starts[node]
+        end = start + self._source_edge_counts[node]
+        source_ids = [
+            get_uid(uid_indices[n]) for n in self._edge_source_nodes[start:end]
+        ]
+
+        derived_ids = []
+        edge = self._first_derived_edges[node]
+        while edge != -1:
+            derived_ids.append(get_uid(uid_indices[self._edge_derived_nodes[edge]]))
+            edge = self._next_derived_edges[edge]
+
+        return ProvNode(
+            data_item_id=get_uid(uid_indices[node]),
+            operation_id=operation_id,
+            source_ids=source_ids,
+            derived_ids=derived_ids,
+        )
@@ -1,10 +1,10 @@
 __all__ = ["AnnotationContainer"]
 
 import typing
-from typing import Dict, Iterator, Generic, List, Optional, Union
+from typing import Any, Dict, Iterator, Generic, List, Optional, Set, Union
 
 from medkit.core.annotation import AnnotationType
-from medkit.core.store import Store, GlobalStore
+from medkit.core.store import Store, GlobalStore, _release_when_collected
 
 
 class AnnotationContainer(Generic[AnnotationType]):
@@ -33,9 +33,17 @@ class AnnotationContainer(Generic[AnnotationType]):
         """
         self._store: Store = GlobalStore.get_store()
         self._doc_id = doc_id
+        # ordered list of all identifiers (for positional access) and set
+        # of the same identifiers (for constant-time membership tests)
         self._ann_ids: List[str] = []
-        self._ann_ids_by_label: Dict[str, List[str]] = {}
-        self._ann_ids_by_key: Dict[str, List[str]] = {}
+        self._ann_id_set: Set[str] = set()
+        # indexes are insertion-ordered dicts used as ordered sets
+        # (values are always None), so that each index keeps the relative
+        # order of self._ann_ids and supports constant-time membership tests
+        self._ann_ids_by_label: Dict[str, Dict[str, None]] = {}
+        self._ann_ids_by_key: Dict[str, Dict[str, None]] = {}
+        # release annotations from store once the container is discarded
+        _release_when_collected(self, self._store, self._ann_ids)
 
     def add(self, ann: AnnotationType):
         """
@@ -54,26 +62,27 @@ class AnnotationContainer(Generic[AnnotationType]):
         """
 
         uid = ann.uid
-        if uid in self._ann_ids:
+        if uid in self._ann_id_set:
             raise ValueError(
                 f"Impossible to add this annotation.The uid {uid} already"
                 " exists in the document"
             )
 
         self._ann_ids.append(uid)
+        self._ann_id_set.add(uid)
         self._store.store_data_item(data_item=ann, parent_id=self._doc_id)
 
         # update label index
         label = ann.label
         if label not in self._ann_ids_by_label:
-            self._ann_ids_by_label[label] = []
-        self._ann_ids_by_label[label].append(uid)
+            self._ann_ids_by_label[label] = {}
+        self._ann_ids_by_label[label][uid] = None
 
         # update key index
         for key in ann.keys:
             if key not in self._ann_ids_by_key:
-                self._ann_ids_by_key[key] = []
-            self._ann_ids_by_key[key].append(uid)
+                self._ann_ids_by_key[key] = {}
+            self._ann_ids_by_key[key][uid] = None
 
     def __len__(self) -> int:
         """Add support for calling `len()`"""
@@ -135,15 +144,47 @@ class AnnotationContainer(Generic[AnnotationType]):
             Key to use to filter annotations.
         """
 
-        uids = iter(self._ann_ids)
+        indexes = self._get_indexes(label=label, key=key)
+        return self._intersect_indexes(indexes)
 
-        if label is not None:
-            uids = (uid for uid in uids if uid in self._ann_ids_by_label.get(label, []))
+    def _get_indexes(
+        self, *, label: Optional[str] = None, key: Optional[str] = None
+    ) -> List[Dict[str, None]]:
+        """
+        Return the indexes (ordered sets of identifiers) corresponding to the
+        label and key filters that are not `None`.
+        """
 
+        indexes = []
+        if label is not None:
+            indexes.append(self._ann_ids_by_label.get(label, {}))
         if key is not None:
-            uids = (uid for uid in uids if uid in self._ann_ids_by_key.get(key, []))
+            indexes.append(self._ann_ids_by_key.get(key, {}))
+        return indexes
 
-        return uids
+    def _intersect_indexes(self, indexes: List[Dict[str, None]]) -> Iterator[str]:
+        """
+        Return an iterator of the identifiers present in all `indexes`, in
+        insertion order. All identifiers are returned if `indexes` is empty.
+
+        The smallest index is iterated over and each identifier is looked up in
+        the other indexes, so the cost only depends on the size of the smallest
+        index.
+        """
+
+        if not indexes:
+            return iter(self._ann_ids)
+
+        smallest_index = min(indexes, key=len)
+        other_indexes = [index for index in indexes if index is not smallest_index]
+        # build a list rather than a lazy generator so that annotations
+        # can be added to the container while iterating over the result
+        uids = [
+            uid
+            for uid in smallest_index
+            if all(uid in index for index in other_indexes)
+        ]
+        return iter(uids)
 
     def get_by_id(self, uid: str) -> AnnotationType:
         """Return the annotation corresponding to a specific identifier.
@@ -159,6 +200,26 @@ class AnnotationContainer(Generic[AnnotationType]):
             raise ValueError(f"No known annotation with uid '{uid}'")
         return typing.cast(AnnotationType, ann)
 
+    def __getstate__(self) -> Dict[str, Any]:
+        # the store is not pickled with the container (it is global and may be
+        # shared with many other documents), only the annotations it holds for
+        # this container are
+        state = self.__dict__.copy()
+        del state["_store"]
+        state["_anns"] = [self.get_by_id(uid) for uid in self._ann_ids]
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]):
+        # annotations of an unpickled container are added to the global store of
+        # the current process (for instance a worker process)
+        state = state.copy()
+        anns = state.pop("_anns")
+        self.__dict__.update(state)
+        self._store = GlobalStore.get_store()
+        _release_when_collected(self, self._store, self._ann_ids)
+        for ann in anns:
+            self._store.store_data_item(data_item=ann, parent_id=self._doc_id)
+
     def __eq__(self, other: object) -> bool:
         if not isinstance(other, self.__class__):
             return False
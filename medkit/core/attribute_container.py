@@ -1,10 +1,10 @@
 __all__ = ["AttributeContainer"]
 
 import typing
-from typing import Dict, List, Optional, Union, Iterator
+from typing import Any, Dict, List, Optional, Set, Union, Iterator
 
 from medkit.core.attribute import Attribute
-from medkit.core.store import Store, GlobalStore
+from medkit.core.store import Store, GlobalStore, _release_when_collected
 
 
 class AttributeContainer:
@@ -26,7 +26,10 @@ class AttributeContainer:
         self._store: Store = GlobalStore.get_store()
         self._owner_id = owner_id
         self._attr_ids: List[str] = []
+        self._attr_id_set: Set[str] = set()
         self._attr_ids_by_label: Dict[str, List[str]] = {}
+        # release attributes from store once the container is discarded
+        _release_when_collected(self, self._store, self._attr_ids)
 
     def __len__(self) -> int:
         """Add support for calling `len()`"""
@@ -83,10 +86,11 @@ class AttributeContainer:
         """
 
         uid = attr.uid
-        if uid in self._attr_ids:
+        if uid in self._attr_id_set:
             raise ValueError(f"Attribute with uid {uid} already attached to annotation")
 
         self._attr_ids.append(uid)
+        self._attr_id_set.add(uid)
         self._store.store_data_item(data_item=attr, parent_id=self._owner_id)
 
         # update label index
@@ -109,6 +113,26 @@ class AttributeContainer:
             raise ValueError(f"No known attribute with uid '{uid}'")
         return typing.cast(Attribute, attr)
 
+    def __getstate__(self) -> Dict[str, Any]:
+        # the store is not pickled with the container (it is global and may be
+        # shared with many other documents), only the attributes it holds for
+        # this container are
+        state = self.__dict__.copy()
+        del state["_store"]
+        state["_attrs"] = [self.get_by_id(uid) for uid in self._attr_ids]
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]):
+        # attributes of an unpickled container are added to the global store of
+        # the current process (for instance a worker process)
+        state = state.copy()
+        attrs = state.pop("_attrs")
+        self.__dict__.update(state)
+        self._store = GlobalStore.get_store()
+        _release_when_collected(self, self._store, self._attr_ids)
+        for attr in attrs:
+            self._store.store_data_item(data_item=attr, parent_id=self._owner_id)
+
     def __eq__(self, other: object) -> bool:
         if not isinstance(other, self.__class__):
             return False
@@ -103,6 +103,9 @@ class SubclassMapping:
     Base class for managing subclasses
     """
 
+    # allow slotted subclasses
+    __slots__ = ()
+
     _subclasses: Dict[str, Type[Self]]
 
     def __init_subclass__(cls):
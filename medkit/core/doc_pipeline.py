@@ -1,12 +1,43 @@
 __all__ = ["DocPipeline"]
 
-from typing import Dict, Generic, List, Optional, Tuple, cast
+import collections
+import copy
+import dataclasses
+import math
+import multiprocessing
+import multiprocessing.pool
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Generic,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+    cast,
+)
 
 from medkit.core.annotation import AnnotationType
+from medkit.core.attribute import Attribute
 from medkit.core.document import Document
+from medkit.core.id import get_id_generator, set_id_generator
 from medkit.core.operation import DocOperation
-from medkit.core.pipeline import Pipeline
+from medkit.core.pipeline import Pipeline, PipelineStep
 from medkit.core.prov_tracer import ProvTracer
+from medkit.core.store import GlobalStore
+from medkit.core.utils import batch_iter, batch_list
+
+# new annotations of a document, and new attributes of pre-existing annotations
+# (by annotation id), as computed by a worker process
+_DocChanges = Tuple[List[Any], Dict[str, List[Attribute]]]
+
+# doc pipeline used by a worker process, and whether provenance must be traced,
+# set when initializing the worker
+_worker_doc_pipeline: Optional["DocPipeline"] = None
+_worker_trace_prov: bool = False
 
 
 class DocPipeline(DocOperation, Generic[AnnotationType]):
@@ -19,6 +50,7 @@ class DocPipeline(DocOperation, Generic[AnnotationType]):
         self,
         pipeline: Pipeline,
         labels_by_input_key: Optional[Dict[str, List[str]]] = None,
+        n_workers: int = 1,
         uid: Optional[str] = None,
     ):
         """Initialize the pipeline
@@ -51,6 +83,15 @@ class DocPipeline(DocOperation, Generic[AnnotationType]):
             Because the values of `labels_by_input_key` are lists (one per
             input), it is possible to use annotation with different labels for
             the same input key.
+        n_workers:
+            Number of worker processes to use. If greater than 1, documents are
+            split into chunks that are processed in parallel by a pool of
+            processes. Documents are pickled and sent to the workers, and the
+            annotations and attributes created by the pipeline are sent back and
+            added to the original documents, in the same way as when
+            `n_workers` is 1. Provenance information gathered in each worker is
+            merged back into the provenance tracer of the doc pipeline.
+            The pipeline and all its operations must be picklable.
         """
 
         # Pass all arguments to super (remove self)
@@ -60,8 +101,10 @@ class DocPipeline(DocOperation, Generic[AnnotationType]):
 
         self.pipeline = pipeline
         self.labels_by_input_key: Optional[Dict[str, List[str]]] = labels_by_input_key
+        self.n_workers: int = n_workers
 
     def set_prov_tracer(self, prov_tracer: ProvTracer):
+        self._prov_tracer = prov_tracer
         self.pipeline.set_prov_tracer(prov_tracer)
 
     def run(self, docs: List[Document[AnnotationType]]) -> None:
@@ -77,8 +120,164 @@ class DocPipeline(DocOperation, Generic[AnnotationType]):
             be added to each corresponding document.
         """
 
-        for doc in docs:
-            self._process_doc(doc)
+        if self.n_workers > 1 and len(docs) > 1:
+            # use several chunks per worker to balance the load between workers
+            chunk_size = math.ceil(len(docs) / (self.n_workers * 4))
+            chunks = batch_list(docs, chunk_size)
+            nb_workers = min(self.n_workers, math.ceil(len(docs) / chunk_size))
+            for _ in self._run_with_workers(chunks, nb_workers):
+                pass
+        else:
+            for doc in docs:
+                self._process_doc(doc)
+
+    def run_iter(
+        self,
+        docs: Iterable[Document[AnnotationType]],
+        batch_size: int = 32,
+        max_docs_in_flight: Optional[int] = None,
+    ) -> Iterator[Document[AnnotationType]]:
+        """Run the pipeline on a stream of documents, yielding each document once
+        the output annotations have been added to it.
+
+        Documents are consumed lazily by batches, so that it is possible to
+        process a corpus that does not fit in memory, for instance with
+        documents loaded by :func:`~medkit.io.medkit_json.load_text_documents`:
+
+        >>> docs = load_text_documents("corpus.jsonl")
+        >>> for doc in doc_pipeline.run_iter(docs, batch_size=64):
+        >>>     save_text_document(doc, "annotated_corpus.jsonl")
+
+        Parameters
+        ----------
+        docs:
+            Iterable of documents on which to run the pipeline (for instance a
+            generator). Documents are yielded in the same order.
+        batch_size:
+            Number of documents read from `docs` at a time. When using several
+            worker processes, it is also the number of documents sent at once to
+            a worker. It only sets the granularity of reading and of the work
+            sent to workers: the pipeline is still run on one document at a
+            time, so operations don't receive the annotations of several
+            documents at once.
+        max_docs_in_flight:
+            Maximum number of documents that have been read from `docs` but not
+            yet yielded, when using several worker processes. Reading stops when
+            this limit is reached, until processed documents are consumed. Must
+            be at least `batch_size`, and at least `n_workers * batch_size` for
+            all workers to be used. Defaults to `2 * n_workers * batch_size`.
+            Ignored when `n_workers` is 1, since only one batch is being
+            processed at a time.
+
+        Returns
+        -------
+        Iterator[Document]
+            Iterator yielding the annotated documents
+
+        Raises
+        ------
+        ValueError
+            If `max_docs_in_flight` is lower than `batch_size` when using
+            several worker processes
+        """
+
+        batches = (b for b in batch_iter(iter(docs), batch_size) if len(b) > 0)
+
+        if self.n_workers > 1:
+            if max_docs_in_flight is None:
+                max_docs_in_flight = 2 * self.n_workers * batch_size
+            elif max_docs_in_flight < batch_size:
+                raise ValueError(
+                    f"max_docs_in_flight ({max_docs_in_flight}) must be at least"
+                    f" batch_size ({batch_size})"
+                )
+            max_batches_in_flight = max_docs_in_flight // batch_size
+            for batch in self._run_with_workers(
+                batches, self.n_workers, max_batches_in_flight
+            ):
+                yield from batch
+        else:
+            for batch in batches:
+                for doc in batch:
+                    self._process_doc(doc)
+                yield from batch
+
+    def _run_with_workers(
+        self,
+        chunks: Iterable[List[Document[AnnotationType]]],
+        nb_workers: int,
+        max_chunks_in_flight: Optional[int] = None,
+    ) -> Iterator[List[Document[AnnotationType]]]:
+        """
+        Process chunks of documents in a pool of worker processes, yielding each
+        chunk (in the same order) once its documents have been updated.
+
+        No more than `max_chunks_in_flight` chunks will be submitted to the pool
+        without having been yielded (no limit if `None`).
+        """
+
+        with multiprocessing.Pool(
+            processes=nb_workers,
+            initializer=_init_worker,
+            initargs=(
+                _copy_without_prov_tracer(self),
+                self._prov_tracer is not None,
+                get_id_generator(),
+            ),
+        ) as pool:
+            pending = collections.deque()
+            for chunk in chunks:
+                result = pool.apply_async(_process_docs_in_worker, (chunk,))
+                pending.append((chunk, result))
+                if max_chunks_in_flight is not None:
+                    while len(pending) >= max_chunks_in_flight:
+                        yield self._apply_chunk_result(*pending.popleft())
+            while pending:
+                yield self._apply_chunk_result(*pending.popleft())
+
+    def _apply_chunk_result(
+        self,
+        chunk: List[Document[AnnotationType]],
+        result: multiprocessing.pool.AsyncResult,
+    ) -> List[Document[AnnotationType]]:
+        all_doc_changes, prov_tracer = result.get()
+        for doc, doc_changes in zip(chunk, all_doc_changes):
+            self._apply_doc_changes(doc, doc_changes)
+        if prov_tracer is not None:
+            self._prov_tracer.add_prov_from_tracer(prov_tracer)
+        return chunk
+
+    def _apply_doc_changes(
+        self, doc: Document[AnnotationType], doc_changes: _DocChanges
+    ):
+        new_anns, new_attrs_by_ann_id = doc_changes
+        for ann_id, attrs in new_attrs_by_ann_id.items():
+            ann = doc.anns.get_by_id(ann_id)
+            for attr in attrs:
+                ann.attrs.add(attr)
+        for ann in new_anns:
+            doc.anns.add(ann)
+
+    def _process_doc_and_get_changes(
+        self, doc: Document[AnnotationType]
+    ) -> _DocChanges:
+        # keep track of pre-existing annotations and attributes
+        anns = [doc.raw_segment] + list(doc.anns)
+        attr_ids_by_ann_id = {ann.uid: {a.uid for a in ann.attrs} for ann in anns}
+
+        self._process_doc(doc)
+
+        new_anns = []
+        for ann in doc.anns:
+            if ann.uid not in attr_ids_by_ann_id:
+                new_anns.append(ann)
+        new_attrs_by_ann_id = {}
+        for ann in anns:
+            attr_ids = attr_ids_by_ann_id[ann.uid]
+            new_attrs = [a for a in ann.attrs if a.uid not in attr_ids]
+            if new_attrs:
+                new_attrs_by_ann_id[ann.uid] = new_attrs
+        return new_anns, new_attrs_by_ann_id
 
     def _process_doc(self, doc: Document[AnnotationType]):
         all_input_anns = []
@@ -119,3 +318,68 @@ class DocPipeline(DocOperation, Generic[AnnotationType]):
         for output_anns in all_output_anns:
             for output_ann in output_anns:
                 doc.anns.add(output_ann)
+
+
+def _init_worker(
+    doc_pipeline: DocPipeline,
+    trace_prov: bool,
+    id_generator: Union[str, Callable[[], str]],
+):
+    global _worker_doc_pipeline, _worker_trace_prov
+
+    _worker_doc_pipeline = doc_pipeline
+    _worker_trace_prov = trace_prov
+    # use the same kind of identifiers as the main process (not inherited when
+    # worker processes are spawned rather than forked)
+    set_id_generator(id_generator)
+    # start with an empty store rather than a copy of the store of the main process
+    GlobalStore.del_store()
+
+
+def _process_docs_in_worker(
+    docs: List[Document],
+) -> Tuple[List[_DocChanges], Optional[ProvTracer]]:
+    doc_pipeline = _worker_doc_pipeline
+    assert doc_pipeline is not None
+
+    # use a new provenance tracer for each chunk, that will be sent back
+    # to the main process with the changes
+    prov_tracer = None
+    if _worker_trace_prov:
+        prov_tracer = ProvTracer()
+        doc_pipeline.set_prov_tracer(prov_tracer)
+
+    all_doc_changes = [doc_pipeline._process_doc_and_get_changes(doc) for doc in docs]
+
+    # data items of this chunk will be released once the result has been sent
+    # (docs of the next chunk will be unpickled into a new store)
+    GlobalStore.del_store()
+    return all_doc_changes, prov_tracer
+
+
+def _copy_without_prov_tracer(operation: Any) -> Any:
+    """
+    Return a shallow copy of an operation without its provenance tracer (nor
+    those of the operations of its pipeline, if any), to be sent to worker
+    processes without the tracer and the data items of its store
+    """
+
+    if isinstance(operation, DocPipeline):
+        operation = copy.copy(operation)
+        operation._prov_tracer = None
+        operation.pipeline = _copy_without_prov_tracer(operation.pipeline)
+    elif isinstance(operation, Pipeline):
+        operation = copy.copy(operation)
+        operation._prov_tracer = None
+        operation._sub_prov_tracer = None
+        operation.steps = [_copy_step_without_prov_tracer(s) for s in operation.steps]
+    elif getattr(operation, "_prov_tracer", None) is not None:
+        operation = copy.copy(operation)
+        operation._prov_tracer = None
+    return operation
+
+
+def _copy_step_without_prov_tracer(step: PipelineStep) -> PipelineStep:
+    return dataclasses.replace(
+        step, operation=_copy_without_prov_tracer(step.operation)
+    )
@@ -1,13 +1,125 @@
-__all__ = ["generate_id", "generate_deterministic_id"]
+__all__ = [
+    "generate_id",
+    "generate_deterministic_id",
+    "set_id_generator",
+    "get_id_generator",
+]
 
+import base64
+import itertools
+import os
 import uuid
 import random
+from typing import Callable, Optional, Union
 
+from typing_extensions import Literal
 
-def generate_id() -> str:
+IdGeneratorName = Literal["uuid", "counter", "base32"]
+
+
+def _generate_uuid_id() -> str:
     return str(uuid.uuid1())
 
 
+# random prefix of counter-based identifiers, specific to each process,
+# and counter of identifiers generated in the process
+_process_prefix: Optional[str] = None
+_process_counter = itertools.count()
+
+
+def _reset_process_state():
+    global _process_prefix, _process_counter
+    _process_prefix = None
+    _process_counter = itertools.count()
+
+
+# forked processes (for instance workers of a DocPipeline) must not reuse the
+# prefix of their parent
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_process_state)
+
+
+def _generate_counter_id() -> str:
+    global _process_prefix
+    if _process_prefix is None:
+        # 80 random bits, encoded in 16 chars
+        _process_prefix = base64.b32encode(os.urandom(10)).decode().lower()
+    return f"{_process_prefix}-{next(_process_counter):x}"
+
+
+def _generate_base32_id() -> str:
+    # 128 random bits, encoded in 26 chars (without padding)
+    return base64.b32encode(os.urandom(16)).decode()[:26].lower()
+
+
+_ID_GENERATORS_BY_NAME = {
+    "uuid": _generate_uuid_id,
+    "counter": _generate_counter_id,
+    "base32": _generate_base32_id,
+}
+
+_id_generator: Union[IdGeneratorName, Callable[[], str]] = "uuid"
+_id_generator_func: Callable[[], str] = _generate_uuid_id
+
+
+def set_id_generator(generator: Union[IdGeneratorName, Callable[[], str]]):
+    """
+    Select the way identifiers of documents, annotations, attributes and
+    operations are generated by :func:`~medkit.core.generate_id`, for the
+    current process.
+
+    This should be called at the beginning of a script, before any
+    identifier is generated. Worker processes of a
+    :class:`~medkit.core.DocPipeline` use the generator of the main process.
+
+    Parameters
+    ----------
+    generator:
+        Either the name of a builtin generator:
+
+        - "uuid" (default): time-based UUID formatted as a 36-char string.
+        - "counter": incremental counter in hexadecimal, prefixed by a random
+          80-bit identifier of the process (e.g. "ajq4xh3b2mfpxk7s-1f"). This
+          is the fastest generator and yields the shortest identifiers.
+        - "base32": 128 random bits encoded in base32 as a 26-char string.
+
+        or a function returning a new identifier each time it is called. It
+        must be picklable (for instance a module-level function) to be used
+        in worker processes.
+
+        All builtin generators are unique across processes, the "counter" and
+        "base32" ones being so with a probability similar to random UUIDs.
+    """
+    global _id_generator, _id_generator_func
+
+    if isinstance(generator, str):
+        if generator not in _ID_GENERATORS_BY_NAME:
+            raise ValueError(
+                f"Unknown id generator '{generator}', valid names are:"
+                f" {list(_ID_GENERATORS_BY_NAME)}"
+            )
+        _id_generator_func = _ID_GENERATORS_BY_NAME[generator]
+    else:
+        _id_generator_func = generator
+    _id_generator = generator
+
+
+def get_id_generator() -> Union[IdGeneratorName, Callable[[], str]]:
+    """
+    Return the current identifier generator, as given to
+    :func:`~medkit.core.set_id_generator`
+    """
+    return _id_generator
+
+
+def generate_id() -> str:
+    """
+    Generate a new unique identifier, with the generator selected by
+    :func:`~medkit.core.set_id_generator` (time-based UUID by default)
+    """
+    return _id_generator_func()
+
+
 def generate_deterministic_id(reference_id: str) -> uuid.UUID:
     """Generate a deterministic UUID based on reference_id.
     The generated UUID will be the same if the reference_id is the same.
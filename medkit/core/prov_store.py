@@ -1,8 +1,13 @@
 __all__ = ["ProvStore", "create_prov_store"]
 
-from typing import Dict
+import pickle
+import sqlite3
+import weakref
+from pathlib import Path
+from typing import Dict, List, Optional, Union
 from typing_extensions import runtime_checkable, Literal, Protocol
 
+from medkit.core._prov_graph import CompactProvGraph, _UidInterner
 from medkit.core.data_item import IdentifiableDataItem
 from medkit.core.operation_desc import OperationDescription
 
@@ -40,10 +45,148 @@ class _DictStore:
         return self._op_descs_by_id[operation_id]
 
 
-StoreType = Literal["dict"]
+class _CompactStore:
+    """
+    Provenance store interning identifiers to integers, to be used with
+    :class:`~medkit.core._prov_graph.CompactProvGraph` (provenance tracers using
+    this store create such graphs, sharing the interned identifiers of the
+    store).
+
+    If `path` is provided, data items are pickled in a SQLite database at this
+    location rather than kept in memory. Data items still referenced elsewhere
+    are returned as the same objects, others are unpickled from the database.
+    A data item is (re)written each time it is stored, which happens each time
+    it is used as a source, and it is pickled when pending writes are flushed,
+    so the database reflects in-place changes (such as attributes added to an
+    annotation) made before that. Changes made after a data item was last
+    stored and flushed are only visible as long as it is referenced elsewhere.
+    """
+
+    def __init__(
+        self, path: Optional[Union[str, Path]] = None, write_batch_size: int = 1_000
+    ):
+        self.path = Path(path) if path is not None else None
+        self.write_batch_size = write_batch_size
+
+        self._interner = _UidInterner()
+        self._op_descs_by_id: Dict[str, OperationDescription] = {}
+
+        # in-memory mode: data items indexed by interned identifier
+        self._data_items: List[Optional[IdentifiableDataItem]] = []
+
+        # disk mode
+        self._conn: Optional[sqlite3.Connection] = None
+        if self.path is not None:
+            self._conn = sqlite3.connect(self.path)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS data_items"
+                " (idx INTEGER PRIMARY KEY, data BLOB NOT NULL)"
+            )
+            self._conn.commit()
+        # data items still in memory, by interned identifier
+        self._live_data_items: weakref.WeakValueDictionary[
+            int, IdentifiableDataItem
+        ] = weakref.WeakValueDictionary()
+        # data items waiting to be written, by interned identifier
+        self._pending_data_items: Dict[int, IdentifiableDataItem] = {}
+
+    def create_graph(self) -> CompactProvGraph:
+        return CompactProvGraph(self._interner)
+
+    def store_data_item(self, data_item: IdentifiableDataItem):
+        index = self._interner.intern(data_item.uid)
+
+        if self._conn is None:
+            if index >= len(self._data_items):
+                self._data_items.extend([None] * (index + 1 - len(self._data_items)))
+            self._data_items[index] = data_item
+            return
+
+        try:
+            self._live_data_items[index] = data_item
+        except TypeError:
+            # data item does not support weak references
+            pass
+        # data items are written again each time they are stored (they may
+        # have been modified since), but only once per batch
+        self._pending_data_items[index] = data_item
+        if len(self._pending_data_items) >= self.write_batch_size:
+            self.flush()
+
+    def get_data_item(self, data_item_id: str) -> IdentifiableDataItem:
+        index = self._interner.get_index(data_item_id)
+        if index is None:
+            raise KeyError(data_item_id)
+
+        if self._conn is None:
+            data_item = (
+                self._data_items[index] if index < len(self._data_items) else None
+            )
+            if data_item is None:
+                raise KeyError(data_item_id)
+            return data_item
+
+        data_item = self._live_data_items.get(index)
+        if data_item is None:
+            data_item = self._pending_data_items.get(index)
+        if data_item is not None:
+            return data_item
+        row = self._conn.execute(
+            "SELECT data FROM data_items WHERE idx = ?", (index,)
+        ).fetchone()
+        if row is None:
+            raise KeyError(data_item_id)
+        return pickle.loads(row[0])
 
-default_stores = {"dict": _DictStore}
+    def store_op_desc(self, op_desc: OperationDescription):
+        self._op_descs_by_id[op_desc.uid] = op_desc
 
+    def get_op_desc(self, operation_id: str) -> OperationDescription:
+        return self._op_descs_by_id[operation_id]
 
-def create_prov_store(store_type: StoreType = "dict"):
-    return default_stores.get(store_type, "dict")()
+    def flush(self):
+        """Write pending data items to the database (if any)"""
+        if self._conn is None or not self._pending_data_items:
+            return
+        rows = [
+            (index, pickle.dumps(data_item, protocol=pickle.HIGHEST_PROTOCOL))
+            for index, data_item in self._pending_data_items.items()
+        ]
+        self._pending_data_items.clear()
+        with self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO data_items VALUES (?, ?)", rows
+            )
+
+
+StoreType = Literal["dict", "compact"]
+
+default_stores = {"dict": _DictStore, "compact": _CompactStore}
+
+
+def create_prov_store(store_type: StoreType = "dict", **kwargs):
+    """
+    Create a provenance store.
+
+    Parameters
+    ----------
+    store_type:
+        Type of store to create:
+
+        - "dict": default store, keeping all data items in a dict;
+        - "compact": store to use when provenance is enabled on large corpora.
+          Provenance tracers using it store their provenance graph in compact
+          integer arrays. Data items can be pickled to a file on disk rather than
+          kept in memory by passing a `path` argument.
+    kwargs:
+        Additional arguments of the store (`path` and `write_batch_size` for
+        "compact" stores).
+
+    Returns
+    -------
+    ProvStore
+        The provenance store
+    """
+    return default_stores[store_type](**kwargs)
@@ -78,7 +78,9 @@ class ProvTracer:
         if store is None:
             store = create_prov_store()
         if _graph is None:
-            _graph = ProvGraph()
+            # some stores provide their own graph implementation
+            create_graph = getattr(store, "create_graph", None)
+            _graph = create_graph() if create_graph is not None else ProvGraph()
 
         self.store: ProvStore = store
         self._graph: ProvGraph = _graph
@@ -184,6 +186,50 @@ class ProvTracer:
         # the data item generation by the composed operation
         self._graph.add_node(data_item_id, operation_id, source_ids)
 
+    def add_prov_from_tracer(self, prov_tracer: ProvTracer):
+        """Append all provenance information gathered by another provenance tracer
+        having its own store, for instance a tracer used in a worker process
+        while running operations in parallel.
+
+        Nodes and sub-provenance information of `prov_tracer` are merged with
+        those of this tracer, and all data items and operation descriptions
+        they refer to are copied to the store of this tracer.
+
+        Parameters
+        ----------
+        prov_tracer:
+            Provenance tracer to merge into this tracer.
+        """
+
+        if prov_tracer.store is not self.store:
+            self._copy_store_items(prov_tracer.store, prov_tracer._graph, self._graph)
+        self._graph.update(prov_tracer._graph)
+
+    def _copy_store_items(
+        self,
+        other_store: ProvStore,
+        other_graph: ProvGraph,
+        graph: Optional[ProvGraph],
+    ):
+        for node in other_graph.get_nodes():
+            # data items already known to this tracer are not overwritten
+            # (those of the other tracer may be copies of them)
+            if graph is None or not graph.has_node(node.data_item_id):
+                data_item = other_store.get_data_item(node.data_item_id)
+                self.store.store_data_item(data_item)
+            if node.operation_id is not None:
+                self.store.store_op_desc(other_store.get_op_desc(node.operation_id))
+
+        for operation_id in other_graph._sub_graphs_by_op_id:
+            self.store.store_op_desc(other_store.get_op_desc(operation_id))
+            other_sub_graph = other_graph.get_sub_graph(operation_id)
+            sub_graph = (
+                graph.get_sub_graph(operation_id)
+                if graph is not None and graph.has_sub_graph(operation_id)
+                else None
+            )
+            self._copy_store_items(other_store, other_sub_graph, sub_graph)
+
     def has_prov(self, data_item_id: str) -> bool:
         """Check if the provenance tracer has provenance information about a
         specific data item.
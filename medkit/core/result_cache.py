@@ -0,0 +1,120 @@
+__all__ = ["ResultCache"]
+
+import sqlite3
+from pathlib import Path
+from typing import Optional, Union
+
+_CREATE_TABLE_QUERY = (
+    "CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, data BLOB NOT NULL,"
+    " size INTEGER NOT NULL, last_used INTEGER NOT NULL)"
+)
+_CREATE_INDEX_QUERY = (
+    "CREATE INDEX IF NOT EXISTS results_last_used ON results (last_used)"
+)
+_INIT_STATS_QUERY = (
+    "SELECT COALESCE(SUM(size), 0), COALESCE(MAX(last_used), 0) FROM results"
+)
+_SELECT_QUERY = "SELECT data FROM results WHERE key = ?"
+_SELECT_SIZE_QUERY = "SELECT size FROM results WHERE key = ?"
+_INSERT_QUERY = "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?)"
+_UPDATE_LAST_USED_QUERY = "UPDATE results SET last_used = ? WHERE key = ?"
+_SELECT_LEAST_USED_QUERY = "SELECT key, size FROM results ORDER BY last_used LIMIT ?"
+_DELETE_QUERY = "DELETE FROM results WHERE key = ?"
+_CLEAR_QUERY = "DELETE FROM results"
+
+# number of entries removed at a time when the cache is full
+_EVICTION_BATCH_SIZE = 100
+
+
+class ResultCache:
+    """
+    Disk-backed cache of serialized operation results, stored in a SQLite
+    database, used by :class:`~medkit.core.text.CachedOperation`.
+
+    Entries are identified by a key (typically a hash of the input and of the
+    configuration of the operation) and hold bytes. When the total size of the
+    entries exceeds `max_size`, the least recently used entries are removed.
+    Changes are written to the database when calling :meth:`~.flush` (or
+    :meth:`~.close`).
+    """
+
+    def __init__(self, path: Union[str, Path], max_size: int = 2**30):
+        """
+        Parameters
+        ----------
+        path:
+            Path of the SQLite database file (created if it does not exist).
+            Entries already present in the database can be retrieved.
+        max_size:
+            Maximum total size of the entries, in bytes
+        """
+        self.path = Path(path)
+        self.max_size = max_size
+
+        self._conn = sqlite3.connect(self.path)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(_CREATE_TABLE_QUERY)
+        self._conn.execute(_CREATE_INDEX_QUERY)
+        self._conn.commit()
+
+        self._size, self._last_used = self._conn.execute(_INIT_STATS_QUERY).fetchone()
+
+    @property
+    def size(self) -> int:
+        """Total size of the entries in the cache, in bytes"""
+        return self._size
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Return the data of the entry with `key`, or `None` if there is none"""
+        row = self._conn.execute(_SELECT_QUERY, (key,)).fetchone()
+        if row is None:
+            return None
+        self._conn.execute(_UPDATE_LAST_USED_QUERY, (self._next_last_used(), key))
+        return row[0]
+
+    def put(self, key: str, data: bytes):
+        """Add an entry to the cache (replacing any entry with the same key)"""
+        row = self._conn.execute(_SELECT_SIZE_QUERY, (key,)).fetchone()
+        if row is not None:
+            self._size -= row[0]
+        self._conn.execute(
+            _INSERT_QUERY, (key, data, len(data), self._next_last_used())
+        )
+        self._size += len(data)
+        self._evict_if_needed()
+
+    def clear(self):
+        """Remove all entries"""
+        self._conn.execute(_CLEAR_QUERY)
+        self._conn.commit()
+        self._size = 0
+
+    def flush(self):
+        """Write pending changes to the database"""
+        self._conn.commit()
+
+    def close(self):
+        """Flush pending changes and close the database connection"""
+        self.flush()
+        self._conn.close()
+
+    def __enter__(self) -> "ResultCache":
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def _next_last_used(self) -> int:
+        self._last_used += 1
+        return self._last_used
+
+    def _evict_if_needed(self):
+        while self._size > self.max_size:
+            rows = self._conn.execute(
+                _SELECT_LEAST_USED_QUERY, (_EVICTION_BATCH_SIZE,)
+            ).fetchall()
+            for key, size in rows:
+                if self._size <= self.max_size:
+                    break
+                self._conn.execute(_DELETE_QUERY, (key,))
+                self._size -= size
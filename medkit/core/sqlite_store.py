@@ -0,0 +1,249 @@
+__all__ = ["SQLiteStore"]
+
+import collections
+import io
+import pickle
+import sqlite3
+import weakref
+from pathlib import Path
+from typing import Any, Dict, Optional, OrderedDict, Tuple, Union
+
+from medkit.core.data_item import IdentifiableDataItem
+
+_CREATE_TABLE_QUERY = (
+    "CREATE TABLE IF NOT EXISTS data_items"
+    " (uid TEXT PRIMARY KEY, parent_id TEXT NOT NULL, data BLOB NOT NULL)"
+)
+_INSERT_QUERY = "INSERT OR REPLACE INTO data_items VALUES (?, ?, ?)"
+_SELECT_QUERY = "SELECT parent_id, data FROM data_items WHERE uid = ?"
+
+# persistent id used to pickle references to the store itself
+_STORE_PERSISTENT_ID = "store"
+
+
+class _Entry:
+    """Information about a data item of the store currently in memory"""
+
+    __slots__ = ("parent_id", "data")
+
+    def __init__(self, parent_id: str, data: Optional[bytes]):
+        self.parent_id = parent_id
+        # serialized data item as last written to the database
+        # (None if not written yet)
+        self.data = data
+
+
+class SQLiteStore:
+    """
+    Disk-backed store, keeping data items in a SQLite database, with an
+    in-memory LRU cache in front of it.
+
+    This store can be used instead of the default dict store when the
+    annotations of a corpus do not fit in memory:
+
+    >>> GlobalStore.init_store(SQLiteStore("annotations.db"))
+
+    Documents then only keep the identifiers of their annotations, and
+    annotations only keep the identifiers of their attributes. Data items are
+    pickled and written to the database by batches (in WAL mode).
+
+    The most recently used data items are kept in memory. Data items that are
+    not in the cache anymore are still returned as the same objects as long as
+    they are referenced elsewhere, and are written to the database once they are
+    garbage collected (only if they were modified), so that in-place
+    modifications (for instance attributes added to an annotation) are never
+    lost. :meth:`~.flush` (or :meth:`~.close`) must be called to write all data
+    items still in memory.
+
+    Data items are never removed from the database, the file must be deleted
+    when not needed anymore.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        cache_size: int = 10_000,
+        write_batch_size: int = 1_000,
+    ):
+        """
+        Parameters
+        ----------
+        path:
+            Path of the SQLite database file (created if it does not exist).
+            Data items already present in the database can be retrieved.
+        cache_size:
+            Maximum number of data items kept in memory by the store itself.
+        write_batch_size:
+            Number of data items to write to the database at once.
+        """
+        self.path = Path(path)
+        self.cache_size = cache_size
+        self.write_batch_size = write_batch_size
+
+        self._conn = sqlite3.connect(self.path)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(_CREATE_TABLE_QUERY)
+        self._conn.commit()
+
+        # LRU cache holding strong references to recently used data items
+        self._cache: OrderedDict[str, IdentifiableDataItem] = collections.OrderedDict()
+        # all data items currently in memory, and corresponding entries
+        self._items_by_id: weakref.WeakValueDictionary[
+            str, IdentifiableDataItem
+        ] = weakref.WeakValueDictionary()
+        self._entries_by_id: Dict[str, _Entry] = {}
+        # rows waiting to be written, by uid
+        self._pending_rows: Dict[str, Tuple[str, str, bytes]] = {}
+
+    def store_data_item(self, data_item: IdentifiableDataItem, parent_id: str):
+        uid = data_item.uid
+        self._track(uid, data_item, _Entry(parent_id, None))
+        self._use(uid, data_item)
+        self._write_pending_rows_if_needed()
+
+    def get_data_item(self, data_item_id: str) -> Optional[IdentifiableDataItem]:
+        data_item = self._items_by_id.get(data_item_id)
+        if data_item is None:
+            row = self._pending_rows.get(data_item_id)
+            if row is None:
+                row = self._conn.execute(_SELECT_QUERY, (data_item_id,)).fetchone()
+                if row is None:
+                    return None
+                row = (data_item_id, *row)
+            _, parent_id, data = row
+            data_item = self._deserialize(data)
+            self._track(data_item_id, data_item, _Entry(parent_id, data))
+
+        self._use(data_item_id, data_item)
+        self._write_pending_rows_if_needed()
+        return data_item
+
+    def get_parent_item(self, data_item_id: str) -> Optional[IdentifiableDataItem]:
+        if self.get_data_item(data_item_id) is None:
+            raise KeyError(data_item_id)
+        parent_id = self._entries_by_id[data_item_id].parent_id
+        return self.get_data_item(parent_id)
+
+    def flush(self):
+        """Write all data items in memory to the database"""
+        for uid, data_item in list(self._items_by_id.items()):
+            self._write(uid, data_item, self._entries_by_id[uid])
+        self._write_pending_rows()
+
+    def close(self):
+        """Flush data items and close the database connection"""
+        self.flush()
+        self._conn.close()
+
+    def __enter__(self) -> "SQLiteStore":
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def _track(self, uid: str, data_item: IdentifiableDataItem, entry: _Entry):
+        self._items_by_id[uid] = data_item
+        self._entries_by_id[uid] = entry
+        # write data item when it is garbage collected, using its state
+        # (the finalizer must not reference the data item itself)
+        finalizer = weakref.finalize(
+            data_item,
+            self._on_collected,
+            uid,
+            type(data_item),
+            data_item.__dict__,
+            entry,
+        )
+        finalizer.atexit = False
+
+    def _on_collected(self, uid: str, cls: type, state: Dict[str, Any], entry: _Entry):
+        # ignore data items replaced by another one with the same uid
+        if self._entries_by_id.get(uid) is not entry:
+            return
+        del self._entries_by_id[uid]
+
+        data_item = cls.__new__(cls)
+        data_item.__dict__.update(state)
+        self._write(uid, data_item, entry)
+
+    def _use(self, uid: str, data_item: IdentifiableDataItem):
+        self._cache[uid] = data_item
+        self._cache.move_to_end(uid)
+        while len(self._cache) > self.cache_size:
+            # data item will be written when garbage collected
+            self._cache.popitem(last=False)
+
+    def _write(self, uid: str, data_item: IdentifiableDataItem, entry: _Entry):
+        data = self._serialize(data_item)
+        # don't rewrite unmodified data items
+        if data == entry.data:
+            return
+        entry.data = data
+        self._pending_rows[uid] = (uid, entry.parent_id, data)
+
+    def _write_pending_rows_if_needed(self):
+        if len(self._pending_rows) >= self.write_batch_size:
+            self._write_pending_rows()
+
+    def _write_pending_rows(self):
+        if not self._pending_rows:
+            return
+        rows = list(self._pending_rows.values())
+        self._pending_rows.clear()
+        with self._conn:
+            self._conn.executemany(_INSERT_QUERY, rows)
+
+    def _serialize(self, data_item: IdentifiableDataItem) -> bytes:
+        file = io.BytesIO()
+        _StorePickler(file, self).dump(data_item)
+        return file.getvalue()
+
+    def _deserialize(self, data: bytes) -> IdentifiableDataItem:
+        return _StoreUnpickler(io.BytesIO(data), self).load()
+
+
+class _StorePickler(pickle.Pickler):
+    """
+    Pickler for data items of a :class:`SQLiteStore`.
+
+    Containers of data items (annotation and attribute containers) referencing
+    the store are pickled without the data items they contain, since these are
+    stored separately in the same store.
+    """
+
+    def __init__(self, file: io.BytesIO, store: SQLiteStore):
+        super().__init__(file, protocol=pickle.HIGHEST_PROTOCOL)
+        self._store = store
+
+    def persistent_id(self, obj: Any) -> Optional[str]:
+        if obj is self._store:
+            return _STORE_PERSISTENT_ID
+        return None
+
+    def reducer_override(self, obj: Any) -> Any:
+        if not isinstance(obj, type):
+            state = getattr(obj, "__dict__", None)
+            if state is not None and state.get("_store") is self._store:
+                state = state.copy()
+                del state["_store"]
+                return _restore_container, (type(obj), state, self._store)
+        return NotImplemented
+
+
+class _StoreUnpickler(pickle.Unpickler):
+    def __init__(self, file: io.BytesIO, store: SQLiteStore):
+        super().__init__(file)
+        self._store = store
+
+    def persistent_load(self, pid: str) -> SQLiteStore:
+        if pid != _STORE_PERSISTENT_ID:
+            raise pickle.UnpicklingError(f"Unsupported persistent id: {pid}")
+        return self._store
+
+
+def _restore_container(cls: type, state: Dict[str, Any], store: SQLiteStore) -> Any:
+    container = cls.__new__(cls)
+    container.__dict__.update(state)
+    container._store = store
+    return container
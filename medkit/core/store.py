@@ -1,6 +1,8 @@
 __all__ = ["Store", "GlobalStore"]
 
-from typing import Dict, Optional, Union
+import contextlib
+import weakref
+from typing import Dict, Iterable, Iterator, List, Optional, Union
 from typing_extensions import Protocol, runtime_checkable
 
 from medkit.core.data_item import IdentifiableDataItem
@@ -21,13 +23,42 @@ class Store(Protocol):
 
 
 class _DictStore:
+    """
+    Default store, keeping data items in a dict.
+
+    Data items are released by the annotation and attribute containers that
+    stored them when these containers are garbage collected (i.e. when the
+    document or annotation owning them is discarded), so the store only keeps
+    data items that are still reachable. A data item stored several times (for
+    instance by 2 copies of the same document) is kept until it has been
+    released as many times.
+    """
+
     def __init__(self) -> None:
         self._data_items_by_id: Dict[str, IdentifiableDataItem] = {}
         self._parent_ids_by_id: Dict[str, str] = {}
+        self._ref_counts_by_id: Dict[str, int] = {}
 
     def store_data_item(self, data_item: IdentifiableDataItem, parent_id: str):
-        self._data_items_by_id[data_item.uid] = data_item
-        self._parent_ids_by_id[data_item.uid] = parent_id
+        uid = data_item.uid
+        self._data_items_by_id[uid] = data_item
+        self._parent_ids_by_id[uid] = parent_id
+        self._ref_counts_by_id[uid] = self._ref_counts_by_id.get(uid, 0) + 1
+
+    def release_data_items(self, data_item_ids: Iterable[str]):
+        for uid in data_item_ids:
+            ref_count = self._ref_counts_by_id.get(uid)
+            if ref_count is None:
+                continue
+            if ref_count > 1:
+                self._ref_counts_by_id[uid] = ref_count - 1
+            else:
+                del self._ref_counts_by_id[uid]
+                del self._data_items_by_id[uid]
+                del self._parent_ids_by_id[uid]
+
+    def __len__(self) -> int:
+        return len(self._data_items_by_id)
 
     def get_data_item(self, data_item_id: str) -> Optional[IdentifiableDataItem]:
         return self._data_items_by_id.get(data_item_id)
@@ -37,6 +68,21 @@ class _DictStore:
         return self._data_items_by_id.get(parent_id)
 
 
+def _release_when_collected(owner: object, store: Store, data_item_ids: List[str]):
+    """
+    Release the data items in `data_item_ids` from `store` once `owner` (a
+    container) is garbage collected, if the store supports releasing items.
+
+    `data_item_ids` should be the list of ids maintained by the container, so
+    that ids added after this call are also released.
+    """
+    release_data_items = getattr(store, "release_data_items", None)
+    if release_data_items is not None:
+        finalizer = weakref.finalize(owner, release_data_items, data_item_ids)
+        # no need to release anything at interpreter exit
+        finalizer.atexit = False
+
+
 class GlobalStore:
     """Global store"""
 
@@ -80,6 +126,42 @@ class GlobalStore:
             cls._store = _DictStore()
         return cls._store
 
+    @classmethod
+    @contextlib.contextmanager
+    def scope(cls, store: Optional[Store] = None) -> Iterator[Store]:
+        """
+        Context manager temporarily replacing the global store, for instance to
+        use a dedicated store for a batch of documents. The previous global
+        store is restored when exiting the context.
+
+        Documents and annotations created in the context keep using the scoped
+        store after the context is exited. Once they are all discarded, the
+        scoped store and the data items it contains can be garbage collected.
+
+        >>> with GlobalStore.scope():
+        >>>     docs = load_text_documents("batch.jsonl")
+        >>>     doc_pipeline.run(docs)
+        >>>     save_text_documents(docs, "annotated_batch.jsonl")
+
+        Parameters
+        ----------
+        store:
+            Store to use in the context. If `None`, a new dict store is used.
+
+        Returns
+        -------
+        Iterator[Store]
+            The store used in the context
+        """
+        if store is None:
+            store = _DictStore()
+        previous_store = cls._store
+        cls._store = store
+        try:
+            yield store
+        finally:
+            cls._store = previous_store
+
     @classmethod
     def del_store(cls):
         """
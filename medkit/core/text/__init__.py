@@ -5,6 +5,7 @@ __all__ = [
     "Relation",
     "TextAnnotationContainer",
     "TextDocument",
+    "CachedOperation",
     "EntityAttributeContainer",
     "EntityNormAttribute",
     "ContextOperation",
@@ -23,6 +24,7 @@ __all__ = [
 
 from .annotation import TextAnnotation, Segment, Entity, Relation
 from .annotation_container import TextAnnotationContainer
+from .cached_operation import CachedOperation
 from .document import TextDocument
 from .entity_attribute_container import EntityAttributeContainer
 from .entity_norm_attribute import EntityNormAttribute
@@ -0,0 +1,250 @@
+__all__ = ["SpanIndex"]
+
+from typing import Generic, List, Optional, Tuple, TypeVar
+
+from medkit.core.text import span_utils
+from medkit.core.text.span import AnySpan
+
+ItemType = TypeVar("ItemType")
+
+# subtrees of this level or below are scanned linearly when querying
+_MAX_SCANNED_LEVEL = 3
+# minimum number of items added since the last build for the tree to be rebuilt
+# (items added since the last build are scanned linearly when querying)
+_MIN_NB_PENDING_ITEMS = 32
+
+
+def get_original_range(spans: List[AnySpan]) -> Optional[Tuple[int, int]]:
+    """
+    Return the range of the original text covered by `spans`, ie the start of
+    the first normalized span and the end of the last one, or `None` if there is
+    no such range
+    """
+    normalized_spans = span_utils.normalize_spans(spans)
+    if not normalized_spans:
+        return None
+    return normalized_spans[0].start, normalized_spans[-1].end
+
+
+class SpanIndex(Generic[ItemType]):
+    """
+    Interval index of items (annotations or annotation identifiers) by the range
+    of the original text covered by their spans, supporting incremental
+    additions and range queries in logarithmic time.
+
+    Items are returned in order of position (start then end of their range),
+    then in order of addition. Items without spans or with an empty range are
+    not indexed and are never returned.
+
+    Ranges are stored in arrays sorted by start, on top of which an implicit
+    interval tree is laid out (each node of the tree is an element of the arrays
+    and holds the max end of its subtree, as in cgranges [1]_). Items added after
+    the tree was built are kept apart and scanned linearly, until there are
+    enough of them for the tree to be rebuilt.
+
+    .. [1] https://github.com/lh3/cgranges
+    """
+
+    def __init__(self):
+        # items of the tree and their ranges, sorted by range and insertion order
+        self._starts: List[int] = []
+        self._ends: List[int] = []
+        self._max_ends: List[int] = []
+        self._items: List[ItemType] = []
+        self._max_level: int = -1
+        # items added since the last build (range, insertion index, item)
+        self._pending: List[Tuple[int, int, int, ItemType]] = []
+
+    def add(self, spans: List[AnySpan], item: ItemType) -> bool:
+        """
+        Add an item to the index
+
+        Parameters
+        ----------
+        spans:
+            Spans of the item
+        item:
+            Item to index
+
+        Returns
+        -------
+        bool
+            True if the item was indexed, False if its range is empty
+        """
+        original_range = get_original_range(spans)
+        if original_range is None:
+            return False
+        start, end = original_range
+        return self.add_range(start, end, item)
+
+    def add_range(self, start: int, end: int, item: ItemType) -> bool:
+        """
+        Add an item to the index, with an already known range
+
+        Parameters
+        ----------
+        start:
+            Start of the range of the item in the original text
+        end:
+            End of the range of the item in the original text
+        item:
+            Item to index
+
+        Returns
+        -------
+        bool
+            True if the item was indexed, False if its range is empty
+        """
+        if start >= end:
+            return False
+        self._pending.append((start, end, len(self), item))
+        return True
+
+    def get_overlapping(self, start: int, end: int) -> List[ItemType]:
+        """Return the items whose range overlaps with [`start`, `end`)"""
+        indices, pending = self._find_overlapping(start, end)
+        return self._get_items(indices, pending)
+
+    def get_contained(self, start: int, end: int) -> List[ItemType]:
+        """Return the items whose range is fully within [`start`, `end`)"""
+        indices, pending = self._find_overlapping(start, end)
+        indices = [
+            i for i in indices if self._starts[i] >= start and self._ends[i] <= end
+        ]
+        pending = [p for p in pending if p[0] >= start and p[1] <= end]
+        return self._get_items(indices, pending)
+
+    def get_at(self, position: int) -> List[ItemType]:
+        """Return the items whose range includes `position`"""
+        indices, pending = self._find_overlapping(position, position + 1)
+        return self._get_items(indices, pending)
+
+    def __len__(self) -> int:
+        return len(self._items) + len(self._pending)
+
+    def _find_overlapping(
+        self, start: int, end: int
+    ) -> Tuple[List[int], List[Tuple[int, int, int, ItemType]]]:
+        """
+        Return the indices of the items of the tree overlapping with
+        [`start`, `end`) (in increasing order) and the pending items overlapping
+        with it
+        """
+        if start >= end:
+            return [], []
+
+        if len(self._pending) >= max(_MIN_NB_PENDING_ITEMS, len(self._items) // 8):
+            self._build()
+
+        pending = [p for p in self._pending if p[0] < end and start < p[1]]
+
+        starts = self._starts
+        ends = self._ends
+        max_ends = self._max_ends
+        nb_items = len(starts)
+        indices = []
+        if nb_items == 0:
+            return indices, pending
+
+        # iterative in-order traversal of the implicit tree, each element of the
+        # stack being the level of a node, its index and whether its left
+        # subtree was already visited
+        stack = [(self._max_level, (1 << self._max_level) - 1, False)]
+        while stack:
+            level, i, left_visited = stack.pop()
+            if level <= _MAX_SCANNED_LEVEL:
+                # small subtree, scan all its nodes
+                i_start = i >> level << level
+                i_end = min(i_start + (1 << (level + 1)) - 1, nb_items)
+                for j in range(i_start, i_end):
+                    if starts[j] >= end:
+                        break
+                    if start < ends[j]:
+                        indices.append(j)
+            elif not left_visited:
+                stack.append((level, i, True))
+                # visit left subtree if it can contain overlapping items
+                left_i = i - (1 << (level - 1))
+                if left_i >= nb_items or max_ends[left_i] > start:
+                    stack.append((level - 1, left_i, False))
+            elif i < nb_items and starts[i] < end:
+                if start < ends[i]:
+                    indices.append(i)
+                # visit right subtree
+                stack.append((level - 1, i + (1 << (level - 1)), False))
+        return indices, pending
+
+    def _get_items(
+        self, indices: List[int], pending: List[Tuple[int, int, int, ItemType]]
+    ) -> List[ItemType]:
+        items = [self._items[i] for i in indices]
+        if not pending:
+            return items
+
+        # merge with pending items, which are after all items of the tree
+        # with the same range since they were added later
+        all_items = [(self._starts[i], self._ends[i], 0, i) for i in indices]
+        all_items += [(p[0], p[1], 1, k) for k, p in enumerate(pending)]
+        all_items.sort()
+        return [
+            self._items[i] if is_pending == 0 else pending[i][3]
+            for _, _, is_pending, i in all_items
+        ]
+
+    def _build(self):
+        """Insert pending items in sorted arrays and build the implicit tree"""
+        all_items = [
+            (start, end, k, item)
+            for k, (start, end, item) in enumerate(
+                zip(self._starts, self._ends, self._items)
+            )
+        ]
+        nb_items = len(all_items)
+        all_items += [
+            (start, end, nb_items + k, item)
+            for k, (start, end, _, item) in enumerate(self._pending)
+        ]
+        self._pending = []
+        # mostly sorted already, so this is close to linear
+        all_items.sort(key=lambda i: i[:3])
+
+        starts = [i[0] for i in all_items]
+        ends = [i[1] for i in all_items]
+        self._starts = starts
+        self._ends = ends
+        self._items = [i[3] for i in all_items]
+        self._max_ends, self._max_level = self._build_max_ends(starts, ends)
+
+    @staticmethod
+    def _build_max_ends(starts: List[int], ends: List[int]) -> Tuple[List[int], int]:
+        """
+        Compute the max end of the subtree of each node of the implicit tree
+        and the level of the root node
+        """
+        nb_items = len(starts)
+        if nb_items == 0:
+            return [], -1
+
+        # leaves, at level 0, are at even indices
+        max_ends = list(ends)
+        last_i = (nb_items - 1) & ~1
+        last_max_end = ends[last_i]
+
+        # nodes at level k are at indices i such that the k lowest bits of i
+        # are set and the following bit is not
+        level = 1
+        while (1 << level) <= nb_items:
+            half = 1 << (level - 1)
+            for i in range((half << 1) - 1, nb_items, half << 2):
+                left_max_end = max_ends[i - half]
+                right_max_end = (
+                    max_ends[i + half] if i + half < nb_items else last_max_end
+                )
+                max_ends[i] = max(ends[i], left_max_end, right_max_end)
+            # update max end of last node at this level, used by nodes whose
+            # right child is beyond the last item
+            last_i = last_i - half if (last_i >> level) & 1 else last_i + half
+            if last_i < nb_items and max_ends[last_i] > last_max_end:
+                last_max_end = max_ends[last_i]
+            level += 1
+        return max_ends, level - 1
@@ -10,6 +10,7 @@ from typing import (
     List,
     Optional,
     Set,
+    Tuple,
     Type,
 )
 from typing_extensions import Self
@@ -19,8 +20,9 @@ from medkit.core.attribute import Attribute
 from medkit.core.attribute_container import AttributeContainer
 from medkit.core.id import generate_id
 from medkit.core.store import Store
+from medkit.core.text import span_utils
 from medkit.core.text.entity_attribute_container import EntityAttributeContainer
-from medkit.core.text.span import AnySpan
+from medkit.core.text.span import AnySpan, Span
 
 
 @dataclasses.dataclass(init=False)
@@ -36,7 +38,7 @@ class TextAnnotation(abc.ABC, dict_conv.SubclassMapping):
     attrs:
         Attributes of the annotation. Stored in a
         :class:{~medkit.core.AttributeContainer} but can be passed as a list at
-        init.
+        init. The container is only created when first accessed.
     metadata:
         The metadata of the annotation
     keys:
@@ -49,6 +51,9 @@ class TextAnnotation(abc.ABC, dict_conv.SubclassMapping):
     metadata: Dict[str, Any]
     keys: Set[str]
 
+    # class of attribute container used when none is passed at init
+    _attr_container_class = AttributeContainer
+
     @abc.abstractmethod
     def __init__(
         self,
@@ -70,10 +75,30 @@ class TextAnnotation(abc.ABC, dict_conv.SubclassMapping):
         self.metadata = metadata
         self.keys = set()
 
-        self.attrs = attr_container_class(owner_id=self.uid)
+        # most annotations never receive attributes, so the attribute container
+        # (which registers itself with the global store) is created lazily
+        self._attrs: Optional[AttributeContainer] = None
+        if attr_container_class is not type(self)._attr_container_class:
+            self._attr_container_class = attr_container_class
         for attr in attrs:
             self.attrs.add(attr)
 
+    @property
+    def attrs(self) -> AttributeContainer:
+        if self._attrs is None:
+            self._attrs = self._attr_container_class(owner_id=self.uid)
+        return self._attrs
+
+    @attrs.setter
+    def attrs(self, attrs: AttributeContainer):
+        self._attrs = attrs
+
+    def _attrs_to_dicts(self) -> List[Dict[str, Any]]:
+        # avoid creating the attribute container when serializing
+        if self._attrs is None:
+            return []
+        return [a.to_dict() for a in self._attrs]
+
     def __init_subclass__(cls):
         TextAnnotation.register_subclass(cls)
         super().__init_subclass__()
@@ -148,9 +173,44 @@ class Segment(TextAnnotation):
         length = sum(s.length for s in self.spans)
         assert len(self.text) == length, "Spans length does not match text length"
 
+    @property
+    def normalized_spans(self) -> List[Span]:
+        """
+        Spans of the segment in the original text, as returned by
+        :func:`~medkit.core.text.span_utils.normalize_spans`.
+
+        They are computed only once and cached until `spans` is reassigned, so
+        the returned list must not be modified.
+        """
+        # cache is a tuple of the spans it was computed from and normalized spans
+        # (not a dataclass field, so it is ignored when comparing segments)
+        cache = getattr(self, "_normalized_spans_cache", None)
+        if cache is None or cache[0] is not self.spans:
+            cache = (self.spans, span_utils.normalize_spans(self.spans))
+            self._normalized_spans_cache = cache
+        return cache[1]
+
+    @property
+    def original_range(self) -> Optional[Tuple[int, int]]:
+        """
+        Range of the original text covered by the segment, ie the start of its
+        first normalized span and the end of its last normalized span, or `None`
+        if it has no normalized spans.
+        """
+        normalized_spans = self.normalized_spans
+        if not normalized_spans:
+            return None
+        return normalized_spans[0].start, normalized_spans[-1].end
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # normalized spans are recomputed when needed after unpickling
+        state = self.__dict__.copy()
+        state.pop("_normalized_spans_cache", None)
+        return state
+
     def to_dict(self) -> Dict[str, Any]:
         spans = [s.to_dict() for s in self.spans]
-        attrs = [a.to_dict() for a in self.attrs]
+        attrs = self._attrs_to_dicts()
         segment_dict = dict(
             uid=self.uid,
             label=self.label,
@@ -213,6 +273,8 @@ class Entity(Segment):
 
     attrs: EntityAttributeContainer
 
+    _attr_container_class = EntityAttributeContainer
+
     def __init__(
         self,
         label: str,
@@ -278,7 +340,7 @@ class Relation(TextAnnotation):
         self.target_id = target_id
 
     def to_dict(self) -> Dict[str, Any]:
-        attrs = [a.to_dict() for a in self.attrs]
+        attrs = self._attrs_to_dicts()
         relation_dict = dict(
             uid=self.uid,
             label=self.label,
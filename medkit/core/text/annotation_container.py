@@ -1,10 +1,11 @@
 __all__ = ["TextAnnotationContainer"]
 
 import typing
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Optional
 
 from medkit.core.annotation_container import AnnotationContainer
 from medkit.core.text.annotation import TextAnnotation, Segment, Entity, Relation
+from medkit.core.text._span_index import SpanIndex
 
 
 class TextAnnotationContainer(AnnotationContainer[TextAnnotation]):
@@ -15,7 +16,8 @@ class TextAnnotationContainer(AnnotationContainer[TextAnnotation]):
     supported. Additional filtering is available through the `get()` method.
 
     Also provides retrieval of entities, segments, relations, and handling of
-    raw segment.
+    raw segment, as well as retrieval of segments and entities by position in
+    the original text of the document.
     """
 
     def __init__(self, doc_id: str, raw_segment: Segment):
@@ -26,10 +28,15 @@ class TextAnnotationContainer(AnnotationContainer[TextAnnotation]):
         # and get_by_id()
         self.raw_segment = raw_segment
 
-        self._segment_ids: List[str] = []
-        self._entity_ids: List[str] = []
-        self._relation_ids: List[str] = []
-        self._relation_ids_by_source_id: Dict[str, List[str]] = {}
+        # annotation type indexes, stored as insertion-ordered dicts used as
+        # ordered sets (cf AnnotationContainer)
+        self._segment_ids: Dict[str, None] = {}
+        self._entity_ids: Dict[str, None] = {}
+        self._relation_ids: Dict[str, None] = {}
+        self._relation_ids_by_source_id: Dict[str, Dict[str, None]] = {}
+        # interval index of segment and entity ids by range of original text,
+        # built on first positional query then updated by add()
+        self._span_index: Optional[SpanIndex[str]] = None
 
     @property
     def segments(self) -> List[Segment]:
@@ -56,14 +63,18 @@ class TextAnnotationContainer(AnnotationContainer[TextAnnotation]):
 
         # update entity/segments/relations index
         if isinstance(ann, Entity):
-            self._entity_ids.append(ann.uid)
+            self._entity_ids[ann.uid] = None
         elif isinstance(ann, Segment):
-            self._segment_ids.append(ann.uid)
+            self._segment_ids[ann.uid] = None
         elif isinstance(ann, Relation):
-            self._relation_ids.append(ann.uid)
+            self._relation_ids[ann.uid] = None
             if ann.source_id not in self._relation_ids_by_source_id:
-                self._relation_ids_by_source_id[ann.source_id] = []
-            self._relation_ids_by_source_id[ann.source_id].append(ann.uid)
+                self._relation_ids_by_source_id[ann.source_id] = {}
+            self._relation_ids_by_source_id[ann.source_id][ann.uid] = None
+
+        # update span index of segments and entities, if already built
+        if isinstance(ann, Segment) and self._span_index is not None:
+            self._add_to_span_index(ann)
 
     def get(
         self, *, label: Optional[str] = None, key: Optional[str] = None
@@ -94,10 +105,10 @@ class TextAnnotationContainer(AnnotationContainer[TextAnnotation]):
             Key to use to filter segments.
         """
 
-        # get ids filtered by label/key
-        uids = self.get_ids(label=label, key=key)
-        # keep only segment ids
-        uids = (uid for uid in uids if uid in self._segment_ids)
+        # get ids filtered by label/key, keeping only segment ids
+        indexes = self._get_indexes(label=label, key=key)
+        indexes.append(self._segment_ids)
+        uids = self._intersect_indexes(indexes)
 
         segments = [self.get_by_id(uid) for uid in uids]
         return typing.cast(List[Segment], segments)
@@ -117,10 +128,10 @@ class TextAnnotationContainer(AnnotationContainer[TextAnnotation]):
             Key to use to filter entities.
         """
 
-        # get ids filtered by label/key
-        uids = self.get_ids(label=label, key=key)
-        # keep only entity ids
-        uids = (uid for uid in uids if uid in self._entity_ids)
+        # get ids filtered by label/key, keeping only entity ids
+        indexes = self._get_indexes(label=label, key=key)
+        indexes.append(self._entity_ids)
+        uids = self._intersect_indexes(indexes)
 
         entities = [self.get_by_id(uid) for uid in uids]
         return typing.cast(List[Entity], entities)
@@ -146,15 +157,113 @@ class TextAnnotationContainer(AnnotationContainer[TextAnnotation]):
             Identifier of the source entity to use to filter relations.
         """
 
-        # get ids filtered by label/key
-        uids = self.get_ids(label=label, key=key)
-        # keep only relation ids
+        # get ids filtered by label/key, keeping only relation ids
         # (either all relations or relations with specific source)
+        indexes = self._get_indexes(label=label, key=key)
         if source_id is None:
-            uids = (uid for uid in uids if uid in self._relation_ids)
+            indexes.append(self._relation_ids)
         else:
-            relation_ids = self._relation_ids_by_source_id.get(source_id, [])
-            uids = (uid for uid in uids if uid in relation_ids)
+            indexes.append(self._relation_ids_by_source_id.get(source_id, {}))
+        uids = self._intersect_indexes(indexes)
 
         entities = [self.get_by_id(uid) for uid in uids]
         return typing.cast(List[Relation], entities)
+
+    def get_overlapping(
+        self,
+        start: int,
+        end: int,
+        *,
+        label: Optional[str] = None,
+        key: Optional[str] = None,
+    ) -> List[Segment]:
+        """
+        Return a list of the segments and entities of the document overlapping
+        with the range [`start`, `end`) of the original text, optionally
+        filtering by label or key.
+
+        The range of a segment goes from the start of its first normalized span
+        to the end of its last normalized span. Segments are returned in order
+        of position, and segments with an empty range are never returned.
+
+        Parameters
+        ----------
+        start:
+            Start of the range in the original text.
+        end:
+            End of the range in the original text.
+        label:
+            Label to use to filter segments.
+        key:
+            Key to use to filter segments.
+        """
+
+        uids = self._get_span_index().get_overlapping(start, end)
+        return self._get_segments_by_ids(uids, label=label, key=key)
+
+    def get_contained(
+        self,
+        start: int,
+        end: int,
+        *,
+        label: Optional[str] = None,
+        key: Optional[str] = None,
+    ) -> List[Segment]:
+        """
+        Return a list of the segments and entities of the document fully within
+        the range [`start`, `end`) of the original text, optionally filtering by
+        label or key.
+
+        The range of a segment goes from the start of its first normalized span
+        to the end of its last normalized span. Segments are returned in order
+        of position, and segments with an empty range are never returned.
+
+        Parameters
+        ----------
+        start:
+            Start of the range in the original text.
+        end:
+            End of the range in the original text.
+        label:
+            Label to use to filter segments.
+        key:
+            Key to use to filter segments.
+        """
+
+        uids = self._get_span_index().get_contained(start, end)
+        return self._get_segments_by_ids(uids, label=label, key=key)
+
+    def _get_span_index(self) -> SpanIndex[str]:
+        if self._span_index is None:
+            self._span_index = SpanIndex()
+            for uid in self._ann_ids:
+                if uid in self._segment_ids or uid in self._entity_ids:
+                    self._add_to_span_index(self.get_by_id(uid))
+        return self._span_index
+
+    def _add_to_span_index(self, segment: Segment):
+        original_range = segment.original_range
+        if original_range is not None:
+            start, end = original_range
+            self._span_index.add_range(start, end, segment.uid)
+
+    def _get_segments_by_ids(
+        self,
+        uids: List[str],
+        *,
+        label: Optional[str] = None,
+        key: Optional[str] = None,
+    ) -> List[Segment]:
+        indexes = self._get_indexes(label=label, key=key)
+        segments = [
+            self.get_by_id(uid)
+            for uid in uids
+            if all(uid in index for index in indexes)
+        ]
+        return typing.cast(List[Segment], segments)
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # the span index is rebuilt when needed after unpickling
+        state = super().__getstate__()
+        state["_span_index"] = None
+        return state
@@ -0,0 +1,312 @@
+__all__ = ["CachedOperation"]
+
+import hashlib
+import json
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from medkit.core.data_item import IdentifiableDataItem
+from medkit.core.id import generate_id
+from medkit.core.operation import Operation
+from medkit.core.prov_tracer import ProvTracer
+from medkit.core.result_cache import ResultCache
+from medkit.core.text.annotation import Segment, TextAnnotation
+
+# references to the sources of a data item created by the wrapped operation,
+# relative to the input segment
+_SEGMENT_REF = "segment"
+_SEGMENT_ATTR_REF = "segment_attr"
+_CREATED_REF = "created"
+
+
+class CachedOperation(Operation):
+    """
+    Wrapper around a deterministic text operation creating annotations from
+    segments (such as a :class:`~medkit.text.ner.RegexpMatcher`, a
+    :class:`~medkit.text.ner.UMLSMatcher` or a
+    :class:`~medkit.text.ner.hf_entity_matcher.HFEntityMatcher`), that stores
+    the annotations created for each segment in a :class:`~medkit.core.ResultCache`.
+
+    When the operation is run again on a segment with the same text, spans and
+    attributes, the cached annotations are returned instead of running the
+    operation. They are new annotations and attributes, with new identifiers,
+    and their provenance is the same as if they had been created by the wrapped
+    operation.
+
+    Results are cached by operation class, configuration (as found in the
+    :class:`~medkit.core.OperationDescription` of the operation) and `version`,
+    so a different cache entry is used when any of them changes. The `version`
+    must be changed when the operation can return different results for the
+    same configuration, for instance when the rules file or the model it loads
+    have been modified. Configurations including objects without a stable
+    representation never match any cache entry.
+
+    The wrapped operation must create each annotation (and its attributes) from
+    one of the input segments, and trace it: it is run with its own provenance
+    tracer to find the segment from which each annotation was derived. If the
+    wrapped operation is a composite operation such as a pipeline, the
+    provenance of its inner operations is not kept.
+
+    >>> matcher = RegexpMatcher(rules=rules)
+    >>> cached_matcher = CachedOperation(matcher, "matcher_cache.db", version="v2")
+    >>> entities = cached_matcher.run(sentences)
+    """
+
+    def __init__(
+        self,
+        operation: Operation,
+        cache: Union[ResultCache, str, Path],
+        version: Optional[str] = None,
+        uid: Optional[str] = None,
+        name: Optional[str] = None,
+    ):
+        """
+        Parameters
+        ----------
+        operation:
+            The operation to wrap. Its `run()` method must take a list of
+            segments and return a list of new segments or entities.
+        cache:
+            The cache in which to store results, or the path of the SQLite
+            database of a new cache
+        version:
+            Optional version of the rules, model or resources used by
+            `operation`
+        uid:
+            Identifier of the wrapper
+        name:
+            Name of the wrapper
+        """
+        # Pass all arguments to super (remove self)
+        init_args = locals()
+        init_args.pop("self")
+        super().__init__(**init_args)
+
+        if not isinstance(cache, ResultCache):
+            cache = ResultCache(cache)
+
+        self.operation = operation
+        self.cache = cache
+        self.version = version
+
+        op_desc = operation.description
+        self._key_prefix = _to_json([op_desc.class_name, op_desc.config, version])
+
+    def run(self, segments: List[Segment]) -> List[TextAnnotation]:
+        """
+        Return the annotations created by the wrapped operation for each segment,
+        retrieved from the cache or computed by the operation
+
+        Parameters
+        ----------
+        segments:
+            List of segments on which to run the operation
+
+        Returns
+        -------
+        List[TextAnnotation]
+            Annotations created for all segments, in the order of the segments
+        """
+
+        keys = [self._get_key(s) for s in segments]
+        anns_by_segment: List[Optional[List[TextAnnotation]]] = []
+        missed_segments = []
+        missed_keys = []
+        for segment, key in zip(segments, keys):
+            data = self.cache.get(key)
+            if data is None:
+                anns_by_segment.append(None)
+                missed_segments.append(segment)
+                missed_keys.append(key)
+            else:
+                anns_by_segment.append(self._replay(json.loads(data), segment))
+
+        if missed_segments:
+            computed_anns = iter(self._compute(missed_segments, missed_keys))
+            anns_by_segment = [
+                anns if anns is not None else next(computed_anns)
+                for anns in anns_by_segment
+            ]
+        self.cache.flush()
+
+        return [ann for anns in anns_by_segment for ann in anns]
+
+    def _get_key(self, segment: Segment) -> str:
+        attr_dicts = []
+        for attr in segment.attrs:
+            attr_dict = attr.to_dict()
+            del attr_dict["uid"]
+            attr_dicts.append(attr_dict)
+        spans = [s.to_dict() for s in segment.spans]
+        data = _to_json([self._key_prefix, segment.text, spans, attr_dicts])
+        return hashlib.sha256(data.encode()).hexdigest()
+
+    def _compute(
+        self, segments: List[Segment], keys: List[str]
+    ) -> List[List[TextAnnotation]]:
+        """
+        Run the wrapped operation on segments, cache the annotations created
+        for each segment and return them
+        """
+
+        # use a dedicated provenance tracer to find the source segment of
+        # each annotation
+        prev_prov_tracer = getattr(self.operation, "_prov_tracer", None)
+        prov_tracer = ProvTracer()
+        self.operation.set_prov_tracer(prov_tracer)
+        try:
+            anns = self.operation.run(segments)
+        finally:
+            self._restore_prov_tracer(prev_prov_tracer)
+
+        anns_by_segment_id: Dict[str, List[TextAnnotation]] = {
+            s.uid: [] for s in segments
+        }
+        for ann in anns:
+            source_ids = _get_source_ids(prov_tracer, ann)
+            segment_ids = [uid for uid in source_ids if uid in anns_by_segment_id]
+            if len(segment_ids) != 1:
+                raise ValueError(
+                    f"Annotation with uid {ann.uid} was not created from exactly one"
+                    " input segment, its results can't be cached"
+                )
+            anns_by_segment_id[segment_ids[0]].append(ann)
+
+        all_anns = []
+        for segment, key in zip(segments, keys):
+            segment_anns = anns_by_segment_id[segment.uid]
+            provs = _get_sorted_provs(prov_tracer, segment_anns)
+            entry = _build_entry(segment, segment_anns, provs)
+            if entry is not None:
+                self.cache.put(key, _to_json(entry).encode())
+            if self._prov_tracer is not None:
+                op_desc = self.operation.description
+                for data_item, sources in provs:
+                    self._prov_tracer.add_prov(data_item, op_desc, sources)
+            all_anns.append(segment_anns)
+        return all_anns
+
+    def _restore_prov_tracer(self, prov_tracer: Optional[ProvTracer]):
+        """Restore the provenance tracer of the wrapped operation"""
+
+        if prov_tracer is not None:
+            self.operation.set_prov_tracer(prov_tracer)
+        elif type(self.operation).set_prov_tracer is Operation.set_prov_tracer:
+            self.operation.set_prov_tracer(None)
+        # other operations (such as pipelines) can't have their tracer unset,
+        # they keep the dedicated tracer until the next computation replaces it
+
+    def _replay(self, entry: Dict[str, Any], segment: Segment) -> List[TextAnnotation]:
+        """Create new annotations (with new identifiers) from a cache entry"""
+
+        data_items_by_cached_id: Dict[str, IdentifiableDataItem] = {}
+        anns = []
+        for ann_dict in entry["anns"]:
+            cached_ann_id = ann_dict["uid"]
+            ann_dict["uid"] = generate_id()
+            cached_attr_ids = []
+            for attr_dict in ann_dict.get("attrs", []):
+                cached_attr_ids.append(attr_dict["uid"])
+                attr_dict["uid"] = generate_id()
+            ann = TextAnnotation.from_dict(ann_dict)
+            data_items_by_cached_id[cached_ann_id] = ann
+            for cached_attr_id, attr in zip(cached_attr_ids, ann.attrs):
+                data_items_by_cached_id[cached_attr_id] = attr
+            anns.append(ann)
+
+        if self._prov_tracer is not None:
+            segment_attrs = list(segment.attrs)
+            op_desc = self.operation.description
+            for cached_id, source_refs in entry["provs"]:
+                sources = []
+                for ref_type, ref in source_refs:
+                    if ref_type == _SEGMENT_REF:
+                        sources.append(segment)
+                    elif ref_type == _SEGMENT_ATTR_REF:
+                        sources.append(segment_attrs[ref])
+                    else:
+                        sources.append(data_items_by_cached_id[ref])
+                self._prov_tracer.add_prov(
+                    data_items_by_cached_id[cached_id], op_desc, sources
+                )
+
+        return anns
+
+
+def _to_json(data: Any) -> str:
+    # objects that are not JSON-serializable are represented by their repr
+    return json.dumps(data, sort_keys=True, ensure_ascii=False, default=repr)
+
+
+def _get_source_ids(prov_tracer: ProvTracer, data_item: IdentifiableDataItem):
+    if not prov_tracer.has_prov(data_item.uid):
+        return []
+    return [s.uid for s in prov_tracer.get_prov(data_item.uid).source_data_items]
+
+
+def _get_sorted_provs(
+    prov_tracer: ProvTracer, anns: List[TextAnnotation]
+) -> List[Tuple[IdentifiableDataItem, List[IdentifiableDataItem]]]:
+    """
+    Return the data items created for some annotations (the annotations and
+    their traced attributes) with their sources, each data item coming after
+    the created data items it was derived from
+    """
+
+    provs_by_id = {}
+    for data_item in [d for ann in anns for d in (ann, *ann.attrs)]:
+        if not prov_tracer.has_prov(data_item.uid):
+            continue
+        prov = prov_tracer.get_prov(data_item.uid)
+        if prov.op_desc is not None:
+            provs_by_id[data_item.uid] = (data_item, prov.source_data_items)
+
+    sorted_provs = []
+    added_ids = set()
+
+    def add(uid: str):
+        if uid in added_ids:
+            return
+        added_ids.add(uid)
+        data_item, sources = provs_by_id[uid]
+        for source in sources:
+            if source.uid in provs_by_id:
+                add(source.uid)
+        sorted_provs.append((data_item, sources))
+
+    for uid in provs_by_id:
+        add(uid)
+    return sorted_provs
+
+
+def _build_entry(
+    segment: Segment,
+    anns: List[TextAnnotation],
+    provs: List[Tuple[IdentifiableDataItem, List[IdentifiableDataItem]]],
+) -> Optional[Dict[str, Any]]:
+    """
+    Build the cache entry of the annotations created for a segment, or return
+    `None` if they were derived from other data items than the segment, its
+    attributes and the created data items themselves
+    """
+
+    segment_attr_indices = {a.uid: i for i, a in enumerate(segment.attrs)}
+    created_ids = {data_item.uid for data_item, _ in provs}
+
+    prov_entries = []
+    for data_item, sources in provs:
+        source_refs = []
+        for source in sources:
+            if source.uid == segment.uid:
+                source_refs.append((_SEGMENT_REF, None))
+            elif source.uid in segment_attr_indices:
+                source_refs.append(
+                    (_SEGMENT_ATTR_REF, segment_attr_indices[source.uid])
+                )
+            elif source.uid in created_ids:
+                source_refs.append((_CREATED_REF, source.uid))
+            else:
+                return None
+        prov_entries.append((data_item.uid, source_refs))
+
+    return {"anns": [a.to_dict() for a in anns], "provs": prov_entries}
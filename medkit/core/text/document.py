@@ -13,7 +13,6 @@ from medkit.core.id import generate_id, generate_deterministic_id
 from medkit.core.text.annotation import TextAnnotation, Segment
 from medkit.core.text.annotation_container import TextAnnotationContainer
 from medkit.core.text.span import Span
-from medkit.core.text import span_utils
 
 
 @dataclasses.dataclass(init=False)
@@ -218,7 +217,7 @@ class TextDocument(dict_conv.SubclassMapping):
         str:
             A portion of the text around the annotation
         """
-        spans_normalized = span_utils.normalize_spans(segment.spans)
+        spans_normalized = segment.normalized_spans
         start = min(s.start for s in spans_normalized)
         end = max(s.end for s in spans_normalized)
         start_extended = max(start - max_extend_length // 2, 0)
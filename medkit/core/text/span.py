@@ -15,6 +15,9 @@ from medkit.core import dict_conv
 
 
 class AnySpan(abc.ABC, dict_conv.SubclassMapping):
+    # no __dict__ for spans, there can be tens of millions of them
+    __slots__ = ()
+
     length: int
 
     def __init_subclass__(cls):
@@ -36,7 +39,7 @@ class AnySpan(abc.ABC, dict_conv.SubclassMapping):
         raise NotImplementedError()
 
 
-@dataclasses.dataclass(frozen=True)
+@dataclasses.dataclass(frozen=True, init=False)
 class Span(AnySpan):
     """
     Slice of text extracted from the original text
@@ -49,9 +52,20 @@ class Span(AnySpan):
         Index of the last character in the original text, plus one
     """
 
+    __slots__ = ("start", "end")
+
     start: int
     end: int
 
+    def __init__(self, start: int, end: int):
+        # faster than the object.__setattr__() calls of frozen dataclasses
+        _set_span_start(self, start)
+        _set_span_end(self, end)
+
+    def __reduce__(self):
+        # default pickling of slots goes through the frozen __setattr__()
+        return self.__class__, (self.start, self.end)
+
     @property
     def length(self):
         return self.end - self.start
@@ -78,6 +92,10 @@ class Span(AnySpan):
         return cls(start=span_dict["start"], end=span_dict["end"])
 
 
+_set_span_start = Span.start.__set__  # type: ignore[attr-defined]
+_set_span_end = Span.end.__set__  # type: ignore[attr-defined]
+
+
 @dataclasses.dataclass
 class ModifiedSpan(AnySpan):
     """
@@ -91,6 +109,8 @@ class ModifiedSpan(AnySpan):
         Slices of the original text that this span is replacing
     """
 
+    __slots__ = ("length", "replaced_spans")
+
     length: int
     replaced_spans: List[Span]
 
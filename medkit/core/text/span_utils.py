@@ -87,17 +87,17 @@ def replace(
     if len(ranges) == 0:
         return text, spans
 
-    offset = 0
-    replacement_lengths = []
+    # collect unchanged parts of text and replacements, and join them only once
+    text_parts = []
+    prev_range_end = 0
     for (range_start, range_end), rep_text in zip(ranges, replacement_texts):
-        range_start += offset
-        range_end += offset
-        text = text[:range_start] + rep_text + text[range_end:]
-
-        rep_length = len(rep_text)
-        offset += rep_length - (range_end - range_start)
-        replacement_lengths.append(rep_length)
+        text_parts.append(text[prev_range_end:range_start])
+        text_parts.append(rep_text)
+        prev_range_end = range_end
+    text_parts.append(text[prev_range_end:])
+    text = "".join(text_parts)
 
+    replacement_lengths = [len(rep_text) for rep_text in replacement_texts]
     spans = _replace_in_spans(spans, ranges, replacement_lengths)
     return text, spans
 
@@ -251,12 +251,15 @@ def remove(
     if len(ranges) == 0:
         return text, spans
 
-    offset = 0
+    # collect parts of text to keep and join them only once
+    text_parts = []
+    prev_range_end = 0
     for range_start, range_end in ranges:
-        range_start += offset
-        range_end += offset
-        text = text[:range_start] + text[range_end:]
-        offset -= range_end - range_start
+        text_parts.append(text[prev_range_end:range_start])
+        prev_range_end = range_end
+    text_parts.append(text[prev_range_end:])
+    text = "".join(text_parts)
+
     spans = _remove_in_spans(spans, ranges)
     return text, spans
 
@@ -371,16 +374,17 @@ def insert(
     if len(positions) == 0:
         return text, spans
 
-    offset = 0
-    insertion_lengths = []
+    # collect parts of text and inserted strings, and join them only once
+    text_parts = []
+    prev_position = 0
     for position, insertion_text in zip(positions, insertion_texts):
-        position += offset
-        text = text[:position] + insertion_text + text[position:]
-
-        insertion_length = len(insertion_text)
-        offset += insertion_length
-        insertion_lengths.append(insertion_length)
+        text_parts.append(text[prev_position:position])
+        text_parts.append(insertion_text)
+        prev_position = position
+    text_parts.append(text[prev_position:])
+    text = "".join(text_parts)
 
+    insertion_lengths = [len(insertion_text) for insertion_text in insertion_texts]
     spans = _insert_in_spans(spans, positions, insertion_lengths)
     return text, spans
 
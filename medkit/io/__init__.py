@@ -25,5 +25,8 @@ from . import medkit_json
 from .rttm import RTTMInputConverter, RTTMOutputConverter
 from .srt import SRTInputConverter, SRTOutputConverter
 
+if modules_are_available(["pyarrow"]):
+    __all__.append("parquet")
+
 if modules_are_available(["spacy"]):
     __all__.append("spacy")
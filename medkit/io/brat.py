@@ -32,7 +32,6 @@ from medkit.core.text import (
     ModifiedSpan,
     TextDocument,
     UMLSNormAttribute,
-    span_utils,
     utils,
 )
 
@@ -596,7 +595,7 @@ class BratOutputConverter(OutputConverter):
             A tuple with the text cleaned and its spans
         """
         pattern_to_clean = r"(\s*\n+\s*)"
-        segment_spans = span_utils.normalize_spans(segment.spans)
+        segment_spans = segment.normalized_spans
         texts_brat, spans_brat = [], []
 
         for fragment in segment_spans:
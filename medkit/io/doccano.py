@@ -17,7 +17,7 @@ from zipfile import ZipFile
 
 from medkit.core import Attribute, OperationDescription, ProvTracer
 from medkit.core.id import generate_id, generate_deterministic_id
-from medkit.core.text import Entity, Relation, Span, TextDocument, span_utils
+from medkit.core.text import Entity, Relation, Span, TextDocument
 
 from medkit.io._common import get_anns_by_type
 
@@ -638,7 +638,7 @@ class DoccanoOutputConverter:
             medkit_segments += anns_by_type["segments"]
 
         for medkit_segment in medkit_segments:
-            spans = span_utils.normalize_spans(medkit_segment.spans)
+            spans = medkit_segment.normalized_spans
             ann_id = generate_deterministic_id(medkit_segment.uid)
             entity = _DoccanoEntity(
                 id=ann_id.int,
@@ -700,7 +700,7 @@ class DoccanoOutputConverter:
             medkit_segments += anns_by_type["segments"]
         doccano_entities = []
         for medkit_segment in medkit_segments:
-            spans = span_utils.normalize_spans(medkit_segment.spans)
+            spans = medkit_segment.normalized_spans
             entity = _DoccanoEntityTuple(
                 start_offset=spans[0].start,
                 end_offset=spans[-1].end,
@@ -7,6 +7,8 @@ __all__ = [
     "save_audio_anns",
     "load_text_document",
     "load_text_documents",
+    "load_text_document_at",
+    "build_text_documents_index",
     "load_text_anns",
     "save_text_document",
     "save_text_documents",
@@ -25,6 +27,8 @@ from .audio import (
 from .text import (
     load_text_document,
     load_text_documents,
+    load_text_document_at,
+    build_text_documents_index,
     load_text_anns,
     save_text_document,
     save_text_documents,
@@ -0,0 +1,180 @@
+"""
+Fast encoding and decoding of medkit-json data
+
+JSON text is decoded with `orjson` or `msgspec` when one of them is installed,
+and with the `json` module otherwise (or when the fast backend rejects a
+document accepted by `json`, for instance because of NaN values). It is always
+encoded with the `json` module, so that generated files do not depend on the
+installed backend.
+
+Data dicts of core text classes are converted to objects through a dispatch
+table, pre-resolved by class name, instead of going through the chain of
+`from_dict()` methods that look up the subclass of each nested object. Data
+dicts of other classes (for instance user-defined subclasses) are converted
+with the `from_dict()` method of their class.
+"""
+
+__all__ = [
+    "JSON_BACKEND",
+    "dumps",
+    "loads",
+    "decode_text_document",
+    "decode_text_annotation",
+]
+
+import json
+from typing import Any, Callable, Dict, Type, Union
+
+from medkit.core import Attribute, dict_conv
+from medkit.core.text import (
+    AnySpan,
+    Entity,
+    ModifiedSpan,
+    Relation,
+    Segment,
+    Span,
+    TextAnnotation,
+    TextDocument,
+)
+
+try:
+    import orjson
+
+    JSON_BACKEND = "orjson"
+    _fast_loads = orjson.loads
+    _FastDecodeError = orjson.JSONDecodeError
+except ImportError:
+    try:
+        import msgspec
+
+        JSON_BACKEND = "msgspec"
+        _fast_loads = msgspec.json.Decoder().decode
+        _FastDecodeError = msgspec.DecodeError
+    except ImportError:
+        JSON_BACKEND = "json"
+        _fast_loads = None
+
+# shared encoder, identical to the one used by json.dumps(ensure_ascii=False)
+_ENCODER = json.JSONEncoder(ensure_ascii=False)
+
+
+def dumps(data: Any) -> str:
+    """Encode `data` to a compact JSON string, like `json.dumps(ensure_ascii=False)`"""
+    return _ENCODER.encode(data)
+
+
+def loads(data: Union[str, bytes]) -> Any:
+    """Decode a JSON string with the fastest available backend"""
+    if _fast_loads is not None:
+        try:
+            return _fast_loads(data)
+        except _FastDecodeError:
+            pass
+    return json.loads(data)
+
+
+_Decoder = Callable[[Dict[str, Any]], Any]
+
+
+def _decode(
+    data: Dict[str, Any], base_class: Type, decoders: Dict[str, _Decoder]
+) -> Any:
+    class_name = dict_conv.get_class_name_from_data_dict(data)
+    decoder = decoders.get(class_name)
+    if decoder is None:
+        # resolve the class only once, raising an error if it is not a
+        # subclass of `base_class`
+        subclass = base_class.get_subclass_for_data_dict(data)
+        decoder = subclass.from_dict if subclass is not None else base_class.from_dict
+        decoders[class_name] = decoder
+    return decoder(data)
+
+
+def _decode_span(data: Dict[str, Any]) -> AnySpan:
+    return _decode(data, AnySpan, _SPAN_DECODERS)
+
+
+def _decode_attr(data: Dict[str, Any]) -> Attribute:
+    return _decode(data, Attribute, _ATTR_DECODERS)
+
+
+def decode_text_annotation(data: Dict[str, Any]) -> TextAnnotation:
+    """Equivalent of `TextAnnotation.from_dict()`"""
+    return _decode(data, TextAnnotation, _TEXT_ANN_DECODERS)
+
+
+def decode_text_document(data: Dict[str, Any]) -> TextDocument:
+    """Equivalent of `TextDocument.from_dict()`"""
+    return _decode(data, TextDocument, _TEXT_DOC_DECODERS)
+
+
+def _decode_exact_span(data: Dict[str, Any]) -> Span:
+    return Span(data["start"], data["end"])
+
+
+def _decode_exact_modified_span(data: Dict[str, Any]) -> ModifiedSpan:
+    replaced_spans = [_decode_exact_span(s) for s in data["replaced_spans"]]
+    return ModifiedSpan(data["length"], replaced_spans)
+
+
+def _decode_exact_attr(data: Dict[str, Any]) -> Attribute:
+    return Attribute(
+        uid=data["uid"],
+        label=data["label"],
+        value=data["value"],
+        metadata=data["metadata"],
+    )
+
+
+def _make_segment_decoder(cls: Type[Segment]) -> _Decoder:
+    def decode_segment(data: Dict[str, Any]) -> Segment:
+        return cls(
+            uid=data["uid"],
+            label=data["label"],
+            text=data["text"],
+            spans=[_decode_span(s) for s in data["spans"]],
+            attrs=[_decode_attr(a) for a in data["attrs"]],
+            metadata=data["metadata"],
+        )
+
+    return decode_segment
+
+
+def _decode_exact_relation(data: Dict[str, Any]) -> Relation:
+    return Relation(
+        uid=data["uid"],
+        label=data["label"],
+        source_id=data["source_id"],
+        target_id=data["target_id"],
+        attrs=[_decode_attr(a) for a in data["attrs"]],
+        metadata=data["metadata"],
+    )
+
+
+def _decode_exact_text_document(data: Dict[str, Any]) -> TextDocument:
+    return TextDocument(
+        uid=data["uid"],
+        text=data["text"],
+        anns=[decode_text_annotation(a) for a in data.get("anns", [])],
+        attrs=[_decode_attr(a) for a in data.get("attrs", [])],
+        metadata=data["metadata"],
+    )
+
+
+# decoders by class name, for each base class (completed with the from_dict()
+# method of other classes when they are first encountered)
+_SPAN_DECODERS: Dict[str, _Decoder] = {
+    dict_conv.get_class_name(Span): _decode_exact_span,
+    dict_conv.get_class_name(ModifiedSpan): _decode_exact_modified_span,
+}
+_ATTR_DECODERS: Dict[str, _Decoder] = {
+    dict_conv.get_class_name(Attribute): _decode_exact_attr,
+}
+_TEXT_ANN_DECODERS: Dict[str, _Decoder] = {
+    dict_conv.get_class_name(Segment): _make_segment_decoder(Segment),
+    dict_conv.get_class_name(Entity): _make_segment_decoder(Entity),
+    dict_conv.get_class_name(Relation): _decode_exact_relation,
+}
+_TEXT_DOC_DECODERS: Dict[str, _Decoder] = {
+    dict_conv.get_class_name(TextDocument): _decode_exact_text_document,
+}
@@ -1,22 +1,50 @@
 __all__ = [
     "load_text_document",
     "load_text_documents",
+    "load_text_document_at",
+    "build_text_documents_index",
     "load_text_anns",
     "save_text_document",
     "save_text_documents",
     "save_text_anns",
 ]
 
+import array
+import io
 import json
+import locale
 from pathlib import Path
-from typing import Iterable, Iterator, Optional, Union
+import sys
+from typing import (
+    Any,
+    BinaryIO,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    TextIO,
+    Tuple,
+    Union,
+)
 import warnings
 
 from medkit.core.text import TextDocument, TextAnnotation
+from medkit.io.medkit_json._codec import (
+    decode_text_annotation,
+    decode_text_document,
+    dumps,
+    loads,
+)
 from medkit.io.medkit_json._common import ContentType, build_header, check_header
 
 
 _DOC_ANNS_SUFFIX = "_anns.jsonl"
+_INDEX_SUFFIX = ".idx"
+# size of each document offset in index files
+_INDEX_ITEM_SIZE = 8
+# number of lines written at once to jsonl files
+_WRITE_BATCH_SIZE = 64
 
 
 def load_text_document(
@@ -47,9 +75,9 @@ def load_text_document(
     input_file = Path(input_file)
 
     with open(input_file, encoding=encoding) as fp:
-        data = json.load(fp)
+        data = loads(fp.read())
     check_header(data, ContentType.TEXT_DOCUMENT)
-    doc = TextDocument.from_dict(data["content"])
+    doc = decode_text_document(data["content"])
 
     if anns_input_file is not None:
         for ann in load_text_anns(anns_input_file, encoding=encoding):
@@ -59,38 +87,212 @@ def load_text_document(
 
 
 def load_text_documents(
-    input_file: Union[str, Path], encoding: Optional[str] = "utf-8"
+    input_file: Union[str, Path],
+    encoding: Optional[str] = "utf-8",
+    n_shards: int = 1,
+    shard_index: int = 0,
 ) -> Iterator[TextDocument]:
     """
     Returns an iterator on text documents loaded from a medkit-json file generated with
     :func:`~medkit.io.medkit_json.save_text_documents`
 
+    The file may be split into several shards, to load documents in parallel
+    in different processes or on different machines:
+
+    >>> # in process/machine k out of n
+    >>> docs = load_text_documents("corpus.jsonl", n_shards=n, shard_index=k)
+
+    Shards are ranges of bytes of the file of roughly the same size, each
+    document belonging to the shard in which its line starts. They are found
+    without reading the file, so each document is only read by one shard.
+    Sharding is only supported for ASCII-compatible encodings (such as utf-8 or
+    latin-1), in which a line feed is always encoded as a single `\\n` byte.
+
     Parameters
     ----------
     input_file:
         Path to the medkit-json file containing the documents
     encoding:
         Optional encoding of `input_file`
+    n_shards:
+        Number of shards into which the file is split
+    shard_index:
+        Index of the shard to load (starting at 0)
 
     Returns
     -------
     Iterator[TextDocument]
-        An iterator to the text documents in the file
+        An iterator to the text documents in the file (or shard)
     """
 
-    input_file = Path(input_file)
+    if not 0 <= shard_index < n_shards:
+        raise ValueError(f"Invalid shard index {shard_index} for {n_shards} shards")
 
-    with open(input_file, encoding=encoding) as fp:
-        line = fp.readline()
-        data = json.loads(line)
-        check_header(data, ContentType.TEXT_DOCUMENT_LIST)
+    input_file = Path(input_file)
 
+    if not _is_ascii_compatible(encoding):
+        if n_shards > 1:
+            raise ValueError(
+                f"Can't split a file encoded with {encoding} into shards, sharding"
+                " is only supported for ASCII-compatible encodings"
+            )
+        # lines can't be split on bytes, read file in text mode
+        with open(input_file, encoding=encoding) as fp:
+            data = loads(fp.readline())
+            check_header(data, ContentType.TEXT_DOCUMENT_LIST)
+            for line in fp:
+                doc_data = loads(line)
+                doc = decode_text_document(doc_data)
+                yield doc
+        return
+
+    with open(input_file, mode="rb") as fp:
+        _check_docs_header(fp, encoding)
+        start, end = _get_shard_range(fp, n_shards, shard_index)
+        fp.seek(start)
+
+        encoding = _get_encoding(encoding)
+        offset = start
         for line in fp:
-            doc_data = json.loads(line)
-            doc = TextDocument.from_dict(doc_data)
+            if offset >= end:
+                break
+            offset += len(line)
+            doc_data = loads(line.decode(encoding))
+            doc = decode_text_document(doc_data)
             yield doc
 
 
+def build_text_documents_index(
+    input_file: Union[str, Path],
+    index_file: Optional[Union[str, Path]] = None,
+    encoding: Optional[str] = "utf-8",
+) -> int:
+    """
+    Build the index of a medkit-json file generated with
+    :func:`~medkit.io.medkit_json.save_text_documents`, used by
+    :func:`~medkit.io.medkit_json.load_text_document_at` to access documents
+    without reading the file.
+
+    The index is a side-car file containing the byte offset of each document in
+    the file, as 8-byte little-endian unsigned integers. It can only be built
+    for files with an ASCII-compatible encoding (such as utf-8 or latin-1).
+
+    Parameters
+    ----------
+    input_file:
+        Path to the medkit-json file containing the documents
+    index_file:
+        Path of the generated index file. If not provided, `input_file` will be
+        used with an extra ".idx" suffix.
+    encoding:
+        Optional encoding of `input_file`
+
+    Returns
+    -------
+    int
+        The number of documents in the file
+
+    Raises
+    ------
+    ValueError
+        If `encoding` is not ASCII-compatible
+    """
+
+    if not _is_ascii_compatible(encoding):
+        raise ValueError(
+            f"Can't index a file encoded with {encoding}, only ASCII-compatible"
+            " encodings are supported"
+        )
+
+    input_file = Path(input_file)
+    index_file = _get_index_file(input_file, index_file)
+
+    offsets = array.array("Q")
+    with open(input_file, mode="rb") as fp:
+        _check_docs_header(fp, encoding)
+        offset = fp.tell()
+        for line in fp:
+            offsets.append(offset)
+            offset += len(line)
+
+    if sys.byteorder != "little":
+        offsets.byteswap()
+    with open(index_file, mode="wb") as fp:
+        offsets.tofile(fp)
+    return len(offsets)
+
+
+def load_text_document_at(
+    input_file: Union[str, Path],
+    index: int,
+    index_file: Optional[Union[str, Path]] = None,
+    encoding: Optional[str] = "utf-8",
+) -> TextDocument:
+    """
+    Load the document at a given position in a medkit-json file generated with
+    :func:`~medkit.io.medkit_json.save_text_documents`, without reading the
+    documents before it.
+
+    The index of the file is built with
+    :func:`~medkit.io.medkit_json.build_text_documents_index` if it does not
+    exist or is older than the file.
+
+    Parameters
+    ----------
+    input_file:
+        Path to the medkit-json file containing the documents
+    index:
+        Position of the document in the file (starting at 0)
+    index_file:
+        Path of the index file. If not provided, `input_file` will be used with
+        an extra ".idx" suffix.
+    encoding:
+        Optional encoding of `input_file`
+
+    Returns
+    -------
+    TextDocument
+        The text document at `index`
+
+    Raises
+    ------
+    IndexError
+        If there is no document at `index`
+    ValueError
+        If `encoding` is not ASCII-compatible
+    """
+
+    if not _is_ascii_compatible(encoding):
+        raise ValueError(
+            f"Can't index a file encoded with {encoding}, only ASCII-compatible"
+            " encodings are supported"
+        )
+
+    input_file = Path(input_file)
+    index_file = _get_index_file(input_file, index_file)
+
+    if (
+        not index_file.exists()
+        or index_file.stat().st_mtime < input_file.stat().st_mtime
+    ):
+        build_text_documents_index(input_file, index_file, encoding=encoding)
+
+    nb_docs = index_file.stat().st_size // _INDEX_ITEM_SIZE
+    if not 0 <= index < nb_docs:
+        raise IndexError(
+            f"Document index {index} out of range, file has {nb_docs} documents"
+        )
+    with open(index_file, mode="rb") as fp:
+        fp.seek(index * _INDEX_ITEM_SIZE)
+        offset = int.from_bytes(fp.read(_INDEX_ITEM_SIZE), "little")
+
+    with open(input_file, mode="rb") as fp:
+        _check_docs_header(fp, encoding)
+        fp.seek(offset)
+        line = fp.readline()
+    return decode_text_document(loads(line.decode(_get_encoding(encoding))))
+
+
 def load_text_anns(
     input_file: Union[str, Path], encoding: Optional[str] = "utf-8"
 ) -> Iterator[TextAnnotation]:
@@ -115,12 +317,12 @@ def load_text_anns(
 
     with open(input_file, encoding=encoding) as fp:
         line = fp.readline()
-        data = json.loads(line)
+        data = loads(line)
         check_header(data, ContentType.TEXT_ANNOTATION_LIST)
 
         for line in fp:
-            ann_data = json.loads(line)
-            ann = TextAnnotation.from_dict(ann_data)
+            ann_data = loads(line)
+            ann = decode_text_annotation(ann_data)
             yield ann
 
 
@@ -191,11 +393,7 @@ def save_text_documents(
 
     header = build_header(content_type=ContentType.TEXT_DOCUMENT_LIST)
     with open(output_file, mode="w", encoding=encoding) as fp:
-        fp.write(json.dumps(header, ensure_ascii=False) + "\n")
-
-        for doc in docs:
-            doc_data = doc.to_dict()
-            fp.write(json.dumps(doc_data, ensure_ascii=False) + "\n")
+        _write_lines(fp, header, (doc.to_dict() for doc in docs))
 
 
 def save_text_anns(
@@ -220,8 +418,65 @@ def save_text_anns(
 
     header = build_header(content_type=ContentType.TEXT_ANNOTATION_LIST)
     with open(output_file, mode="w", encoding=encoding) as fp:
-        fp.write(json.dumps(header, ensure_ascii=False) + "\n")
+        _write_lines(fp, header, (ann.to_dict() for ann in anns))
+
+
+def _write_lines(fp: TextIO, header: Dict[str, Any], items: Iterable[Dict[str, Any]]):
+    """Write the header and data items of a jsonl file, by batches of lines"""
+
+    fp.write(dumps(header) + "\n")
 
-        for ann in anns:
-            ann_data = ann.to_dict()
-            fp.write(json.dumps(ann_data, ensure_ascii=False) + "\n")
+    lines: List[str] = []
+    for item in items:
+        lines.append(dumps(item) + "\n")
+        if len(lines) == _WRITE_BATCH_SIZE:
+            fp.write("".join(lines))
+            lines = []
+    fp.write("".join(lines))
+
+
+def _get_encoding(encoding: Optional[str]) -> str:
+    # encoding used by open() when None
+    return encoding if encoding is not None else locale.getpreferredencoding(False)
+
+
+def _is_ascii_compatible(encoding: Optional[str]) -> bool:
+    """
+    Return True if a line feed is encoded as a single `\\n` byte in `encoding`,
+    so that lines can be split on bytes
+    """
+    return "\n".encode(_get_encoding(encoding)) == b"\n"
+
+
+def _get_index_file(
+    input_file: Path, index_file: Optional[Union[str, Path]] = None
+) -> Path:
+    if index_file is None:
+        return input_file.with_name(input_file.name + _INDEX_SUFFIX)
+    return Path(index_file)
+
+
+def _check_docs_header(fp: BinaryIO, encoding: Optional[str]):
+    """Check the header of a documents file opened in binary mode"""
+    data = loads(fp.readline().decode(_get_encoding(encoding)))
+    check_header(data, ContentType.TEXT_DOCUMENT_LIST)
+
+
+def _get_shard_range(fp: BinaryIO, n_shards: int, shard_index: int) -> Tuple[int, int]:
+    """
+    Return the byte range of the lines of a shard of a documents file, positioned
+    after its header
+    """
+    header_end = fp.tell()
+    size = fp.seek(0, io.SEEK_END) - header_end
+    start = _get_next_line_start(fp, header_end + size * shard_index // n_shards)
+    end = _get_next_line_start(fp, header_end + size * (shard_index + 1) // n_shards)
+    return start, end
+
+
+def _get_next_line_start(fp: BinaryIO, offset: int) -> int:
+    """Return the offset of the first line starting at or after `offset`"""
+    # move to the end of the line containing the byte before `offset`
+    fp.seek(offset - 1)
+    fp.readline()
+    return fp.tell()
@@ -0,0 +1,541 @@
+"""
+This module needs extra-dependencies not installed as core dependencies of medkit.
+To install them, use `pip install medkit-lib[parquet]`.
+"""
+
+__all__ = [
+    "PARQUET_TABLES",
+    "save_text_documents",
+    "load_text_documents",
+    "load_text_anns",
+    "read_table",
+]
+
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from medkit.core import dict_conv
+from medkit.core.text import (
+    Entity,
+    ModifiedSpan,
+    Relation,
+    Span,
+    TextAnnotation,
+    TextDocument,
+)
+from medkit.io.medkit_json._codec import (
+    decode_text_annotation,
+    decode_text_document,
+    dumps,
+    loads,
+)
+
+# columns shared by all tables
+_DOC_ID = pa.field("doc_id", pa.string())
+_UID = pa.field("uid", pa.string())
+_CLASS_NAME = pa.field("class_name", pa.string())
+_LABEL = pa.field("label", pa.string())
+# JSON-encoded metadata
+_METADATA = pa.field("metadata", pa.string())
+# JSON-encoded dict of the entries of the data dict of the object that do not
+# have a column (for instance fields of subclasses)
+_EXTRA = pa.field("extra", pa.string())
+# position of an annotation in its document
+_ANN_INDEX = pa.field("ann_index", pa.int32())
+
+_SIMPLE_SPAN_TYPE = pa.struct([("start", pa.int64()), ("end", pa.int64())])
+# spans and modified spans are stored in the same struct, with null start and
+# end for modified spans and null length and replaced spans for spans
+_SPAN_TYPE = pa.struct(
+    [
+        ("start", pa.int64()),
+        ("end", pa.int64()),
+        ("length", pa.int64()),
+        ("replaced_spans", pa.list_(_SIMPLE_SPAN_TYPE)),
+    ]
+)
+_SEGMENT_SCHEMA = pa.schema(
+    [
+        _DOC_ID,
+        _ANN_INDEX,
+        _UID,
+        _CLASS_NAME,
+        _LABEL,
+        pa.field("text", pa.string()),
+        pa.field("spans", pa.list_(_SPAN_TYPE)),
+        # range of the original text covered by the segment
+        pa.field("start", pa.int64()),
+        pa.field("end", pa.int64()),
+        _METADATA,
+        _EXTRA,
+    ]
+)
+
+_SCHEMAS: Dict[str, pa.Schema] = {
+    "documents": pa.schema(
+        [_UID, _CLASS_NAME, pa.field("text", pa.string()), _METADATA, _EXTRA]
+    ),
+    "segments": _SEGMENT_SCHEMA,
+    "entities": _SEGMENT_SCHEMA,
+    "relations": pa.schema(
+        [
+            _DOC_ID,
+            _ANN_INDEX,
+            _UID,
+            _CLASS_NAME,
+            _LABEL,
+            pa.field("source_id", pa.string()),
+            pa.field("target_id", pa.string()),
+            _METADATA,
+            _EXTRA,
+        ]
+    ),
+    "attributes": pa.schema(
+        [
+            _DOC_ID,
+            # uid of the annotation or document to which the attribute belongs
+            pa.field("owner_id", pa.string()),
+            _UID,
+            _CLASS_NAME,
+            _LABEL,
+            # JSON-encoded value (null if the attribute has no value entry)
+            pa.field("value", pa.string()),
+            _METADATA,
+            _EXTRA,
+        ]
+    ),
+}
+
+#: Names of the tables of a parquet dataset (one file per table)
+PARQUET_TABLES: Tuple[str, ...] = tuple(_SCHEMAS)
+
+# tables of annotations, in the order in which their rows are merged
+_ANN_TABLES = ("segments", "entities", "relations")
+# keys of data dicts corresponding to a column
+_DOC_KEYS = {"uid", "text", "metadata", "anns", "attrs"}
+_SEGMENT_KEYS = {"uid", "label", "text", "spans", "attrs", "metadata"}
+_RELATION_KEYS = {"uid", "label", "source_id", "target_id", "attrs", "metadata"}
+_ATTR_KEYS = {"uid", "label", "value", "metadata"}
+
+_SPAN_CLASS_NAME = dict_conv.get_class_name(Span)
+_MODIFIED_SPAN_CLASS_NAME = dict_conv.get_class_name(ModifiedSpan)
+
+
+def save_text_documents(
+    docs: Iterable[TextDocument],
+    output_dir: Union[str, Path],
+    batch_size: int = 1000,
+):
+    """
+    Save text documents into a parquet dataset, i.e. a directory containing a
+    parquet file for each table of :data:`PARQUET_TABLES`:
+
+    - `documents`: uid, text and metadata of each document
+    - `segments` and `entities`: uid, label, text, spans, original text range
+      (`start` and `end`) and metadata of segments and entities, with the uid
+      of their document (`doc_id`)
+    - `relations`: uid, label, source and target ids and metadata of relations,
+      with the uid of their document
+    - `attributes`: uid, label, value and metadata of the attributes of
+      documents and annotations, with the uid of their document and of the
+      document or annotation they belong to (`owner_id`)
+
+    Metadata and attribute values are stored as JSON strings. Entries of the
+    data dicts of subclasses that do not have a column are stored in an `extra`
+    JSON column, so that documents can be loaded back without any loss.
+
+    Parameters
+    ----------
+    docs:
+        The text documents to save
+    output_dir:
+        Path of the directory of the dataset (created if necessary)
+    batch_size:
+        Number of documents written at a time (in a parquet row group)
+    """
+
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    writers = {
+        name: pq.ParquetWriter(_get_table_file(output_dir, name), schema)
+        for name, schema in _SCHEMAS.items()
+    }
+    try:
+        rows_by_table: Dict[str, List[Dict[str, Any]]] = {n: [] for n in _SCHEMAS}
+        nb_docs = 0
+        for doc in docs:
+            _add_doc_rows(doc.to_dict(), rows_by_table)
+            nb_docs += 1
+            if nb_docs == batch_size:
+                _write_rows(writers, rows_by_table)
+                nb_docs = 0
+        _write_rows(writers, rows_by_table)
+    finally:
+        for writer in writers.values():
+            writer.close()
+
+
+def load_text_documents(
+    input_dir: Union[str, Path],
+    memory_map: bool = True,
+    batch_size: int = 1000,
+) -> Iterator[TextDocument]:
+    """
+    Returns an iterator on text documents loaded from a parquet dataset
+    generated with :func:`~medkit.io.parquet.save_text_documents`
+
+    The tables are read by batches of rows, so that the whole dataset is never
+    loaded in memory.
+
+    Parameters
+    ----------
+    input_dir:
+        Path of the directory of the dataset
+    memory_map:
+        Whether to memory-map the parquet files rather than reading them
+    batch_size:
+        Number of rows read at a time in each table
+
+    Returns
+    -------
+    Iterator[TextDocument]
+        An iterator to the text documents in the dataset
+    """
+
+    input_dir = Path(input_dir)
+
+    # rows of other tables are grouped by document, in the same order as
+    # documents
+    row_groups_iters = {
+        name: _iter_rows_by_doc(input_dir, name, memory_map, batch_size)
+        for name in _SCHEMAS
+        if name != "documents"
+    }
+    next_row_groups = {name: next(it, None) for name, it in row_groups_iters.items()}
+
+    def pop_doc_rows(name: str, doc_id: str) -> List[Dict[str, Any]]:
+        row_group = next_row_groups[name]
+        if row_group is None or row_group[0] != doc_id:
+            return []
+        next_row_groups[name] = next(row_groups_iters[name], None)
+        return row_group[1]
+
+    doc_file = pq.ParquetFile(
+        _get_table_file(input_dir, "documents"), memory_map=memory_map
+    )
+    for batch in doc_file.iter_batches(batch_size=batch_size):
+        for doc_row in batch.to_pylist():
+            doc_id = doc_row["uid"]
+            attr_dicts_by_owner_id = _get_attr_dicts_by_owner_id(
+                pop_doc_rows("attributes", doc_id)
+            )
+            ann_rows = [
+                (row["ann_index"], name, row)
+                for name in _ANN_TABLES
+                for row in pop_doc_rows(name, doc_id)
+            ]
+            ann_rows.sort(key=lambda r: r[0])
+            doc_dict = _get_data_dict(doc_row, ["uid", "text"])
+            doc_dict["anns"] = [
+                _get_ann_dict(name, row, attr_dicts_by_owner_id)
+                for _, name, row in ann_rows
+            ]
+            doc_dict["attrs"] = attr_dicts_by_owner_id.get(doc_id, [])
+            yield decode_text_document(doc_dict)
+
+
+def load_text_anns(
+    input_dir: Union[str, Path],
+    table: str = "entities",
+    filters: Optional[Any] = None,
+    memory_map: bool = True,
+) -> Iterator[TextAnnotation]:
+    """
+    Returns an iterator on text annotations of one of the annotation tables of a
+    parquet dataset generated with :func:`~medkit.io.parquet.save_text_documents`,
+    along with their attributes, without loading their documents.
+
+    >>> # load all entities with the "disorder" label
+    >>> entities = load_text_anns(input_dir, filters=[("label", "=", "disorder")])
+
+    Parameters
+    ----------
+    input_dir:
+        Path of the directory of the dataset
+    table:
+        Name of the table containing the annotations ("segments", "entities" or
+        "relations")
+    filters:
+        Optional filters on the rows of the table, in the format of
+        :func:`pyarrow.parquet.read_table`. They are pushed down to the parquet
+        reader so that row groups not matching them are skipped.
+    memory_map:
+        Whether to memory-map the parquet files rather than reading them
+
+    Returns
+    -------
+    Iterator[TextAnnotation]
+        An iterator to the annotations matching `filters`
+    """
+
+    if table not in _ANN_TABLES:
+        raise ValueError(
+            f"Unknown annotation table '{table}', expected one of {_ANN_TABLES}"
+        )
+
+    input_dir = Path(input_dir)
+
+    ann_table = read_table(input_dir, table, filters=filters, memory_map=memory_map)
+    ann_ids = ann_table.column("uid").to_pylist()
+    if not ann_ids:
+        return
+    attr_table = read_table(
+        input_dir,
+        "attributes",
+        filters=[("owner_id", "in", ann_ids)],
+        memory_map=memory_map,
+    )
+    attr_dicts_by_owner_id = _get_attr_dicts_by_owner_id(attr_table.to_pylist())
+
+    for row in ann_table.to_pylist():
+        ann_dict = _get_ann_dict(table, row, attr_dicts_by_owner_id)
+        yield decode_text_annotation(ann_dict)
+
+
+def read_table(
+    input_dir: Union[str, Path],
+    table: str,
+    columns: Optional[List[str]] = None,
+    filters: Optional[Any] = None,
+    memory_map: bool = True,
+) -> pa.Table:
+    """
+    Read one of the tables of a parquet dataset generated with
+    :func:`~medkit.io.parquet.save_text_documents`, for instance to compute
+    statistics on annotations without creating medkit objects.
+
+    >>> # number of entities by label
+    >>> table = read_table(input_dir, "entities", columns=["label"])
+    >>> counts = table.group_by("label").aggregate([("label", "count")])
+
+    Parameters
+    ----------
+    input_dir:
+        Path of the directory of the dataset
+    table:
+        Name of the table (one of :data:`PARQUET_TABLES`)
+    columns:
+        Optional columns to read (all columns if not provided)
+    filters:
+        Optional filters on the rows of the table, in the format of
+        :func:`pyarrow.parquet.read_table`. They are pushed down to the parquet
+        reader so that row groups not matching them are skipped.
+    memory_map:
+        Whether to memory-map the parquet file rather than reading it
+
+    Returns
+    -------
+    pyarrow.Table
+        The (filtered) table
+    """
+
+    if table not in _SCHEMAS:
+        raise ValueError(f"Unknown table '{table}', expected one of {PARQUET_TABLES}")
+
+    return pq.read_table(
+        _get_table_file(Path(input_dir), table),
+        columns=columns,
+        filters=filters,
+        memory_map=memory_map,
+    )
+
+
+def _get_table_file(dir: Path, table: str) -> Path:
+    return dir / f"{table}.parquet"
+
+
+def _write_rows(
+    writers: Dict[str, pq.ParquetWriter],
+    rows_by_table: Dict[str, List[Dict[str, Any]]],
+):
+    for name, rows in rows_by_table.items():
+        if rows:
+            writers[name].write_table(pa.Table.from_pylist(rows, _SCHEMAS[name]))
+            rows.clear()
+
+
+def _add_doc_rows(doc_dict: Dict[str, Any], rows_by_table: Dict[str, List]):
+    doc_id = doc_dict["uid"]
+    rows_by_table["documents"].append(
+        {
+            "uid": doc_id,
+            "text": doc_dict["text"],
+            **_get_common_values(doc_dict, _DOC_KEYS),
+        }
+    )
+    _add_attr_rows(doc_id, doc_id, doc_dict.get("attrs", []), rows_by_table)
+
+    for ann_index, ann_dict in enumerate(doc_dict.get("anns", [])):
+        class_ = TextAnnotation.get_subclass(
+            dict_conv.get_class_name_from_data_dict(ann_dict)
+        )
+        row = {"doc_id": doc_id, "ann_index": ann_index, "uid": ann_dict["uid"]}
+        if class_ is not None and issubclass(class_, Relation):
+            row.update(
+                label=ann_dict["label"],
+                source_id=ann_dict["source_id"],
+                target_id=ann_dict["target_id"],
+                **_get_common_values(ann_dict, _RELATION_KEYS),
+            )
+            rows_by_table["relations"].append(row)
+        else:
+            spans = [_get_span_value(s) for s in ann_dict["spans"]]
+            original_spans = [
+                o
+                for s in spans
+                for o in ([s] if s["length"] is None else s["replaced_spans"])
+            ]
+            row.update(
+                label=ann_dict["label"],
+                text=ann_dict["text"],
+                spans=spans,
+                start=min((s["start"] for s in original_spans), default=None),
+                end=max((s["end"] for s in original_spans), default=None),
+                **_get_common_values(ann_dict, _SEGMENT_KEYS),
+            )
+            is_entity = class_ is not None and issubclass(class_, Entity)
+            rows_by_table["entities" if is_entity else "segments"].append(row)
+        _add_attr_rows(doc_id, ann_dict["uid"], ann_dict["attrs"], rows_by_table)
+
+
+def _add_attr_rows(
+    doc_id: str,
+    owner_id: str,
+    attr_dicts: List[Dict[str, Any]],
+    rows_by_table: Dict[str, List],
+):
+    for attr_dict in attr_dicts:
+        value = dumps(attr_dict["value"]) if "value" in attr_dict else None
+        rows_by_table["attributes"].append(
+            {
+                "doc_id": doc_id,
+                "owner_id": owner_id,
+                "uid": attr_dict["uid"],
+                "label": attr_dict["label"],
+                "value": value,
+                **_get_common_values(attr_dict, _ATTR_KEYS),
+            }
+        )
+
+
+def _get_common_values(data_dict: Dict[str, Any], keys: set) -> Dict[str, Any]:
+    """Return the class name, metadata and extra values of a data dict"""
+    extra = {
+        k: v
+        for k, v in data_dict.items()
+        if k not in keys and k != dict_conv._CLASS_NAME_KEY
+    }
+    return {
+        "class_name": dict_conv.get_class_name_from_data_dict(data_dict),
+        "metadata": dumps(data_dict.get("metadata", {})),
+        "extra": dumps(extra) if extra else None,
+    }
+
+
+def _get_span_value(span_dict: Dict[str, Any]) -> Dict[str, Any]:
+    class_name = dict_conv.get_class_name_from_data_dict(span_dict)
+    if class_name == _SPAN_CLASS_NAME:
+        return {
+            "start": span_dict["start"],
+            "end": span_dict["end"],
+            "length": None,
+            "replaced_spans": None,
+        }
+    if class_name == _MODIFIED_SPAN_CLASS_NAME:
+        return {
+            "start": None,
+            "end": None,
+            "length": span_dict["length"],
+            "replaced_spans": [
+                {"start": s["start"], "end": s["end"]}
+                for s in span_dict["replaced_spans"]
+            ],
+        }
+    raise ValueError(f"Unsupported span class {class_name}")
+
+
+def _get_span_dict(span_value: Dict[str, Any]) -> Dict[str, Any]:
+    if span_value["length"] is None:
+        span_dict = {"start": span_value["start"], "end": span_value["end"]}
+        span_dict[dict_conv._CLASS_NAME_KEY] = _SPAN_CLASS_NAME
+    else:
+        replaced_spans = [
+            {
+                "start": s["start"],
+                "end": s["end"],
+                dict_conv._CLASS_NAME_KEY: _SPAN_CLASS_NAME,
+            }
+            for s in span_value["replaced_spans"]
+        ]
+        span_dict = {"length": span_value["length"], "replaced_spans": replaced_spans}
+        span_dict[dict_conv._CLASS_NAME_KEY] = _MODIFIED_SPAN_CLASS_NAME
+    return span_dict
+
+
+def _get_data_dict(row: Dict[str, Any], keys: List[str]) -> Dict[str, Any]:
+    """Rebuild the data dict of an object from the common columns of its row"""
+    data_dict = {k: row[k] for k in keys}
+    data_dict["metadata"] = loads(row["metadata"])
+    if row["extra"] is not None:
+        data_dict.update(loads(row["extra"]))
+    data_dict[dict_conv._CLASS_NAME_KEY] = row["class_name"]
+    return data_dict
+
+
+def _get_ann_dict(
+    table: str,
+    row: Dict[str, Any],
+    attr_dicts_by_owner_id: Dict[str, List[Dict[str, Any]]],
+) -> Dict[str, Any]:
+    if table == "relations":
+        ann_dict = _get_data_dict(row, ["uid", "label", "source_id", "target_id"])
+    else:
+        ann_dict = _get_data_dict(row, ["uid", "label", "text"])
+        ann_dict["spans"] = [_get_span_dict(s) for s in row["spans"]]
+    ann_dict["attrs"] = attr_dicts_by_owner_id.get(row["uid"], [])
+    return ann_dict
+
+
+def _get_attr_dicts_by_owner_id(
+    attr_rows: List[Dict[str, Any]],
+) -> Dict[str, List[Dict[str, Any]]]:
+    attr_dicts_by_owner_id: Dict[str, List[Dict[str, Any]]] = {}
+    for row in attr_rows:
+        attr_dict = _get_data_dict(row, ["uid", "label"])
+        if row["value"] is not None:
+            attr_dict["value"] = loads(row["value"])
+        attr_dicts_by_owner_id.setdefault(row["owner_id"], []).append(attr_dict)
+    return attr_dicts_by_owner_id
+
+
+def _iter_rows_by_doc(
+    input_dir: Path, table: str, memory_map: bool, batch_size: int
+) -> Iterator[Tuple[str, List[Dict[str, Any]]]]:
+    """Iterate over the rows of a table, grouped by consecutive document uid"""
+    file = pq.ParquetFile(_get_table_file(input_dir, table), memory_map=memory_map)
+    doc_id = None
+    rows: List[Dict[str, Any]] = []
+    for batch in file.iter_batches(batch_size=batch_size):
+        for row in batch.to_pylist():
+            if row["doc_id"] != doc_id:
+                if rows:
+                    yield doc_id, rows
+                doc_id = row["doc_id"]
+                rows = []
+            rows.append(row)
+    if rows:
+        yield doc_id, rows
@@ -7,11 +7,12 @@ __all__ = [
     "HypothesisVerbMetadata",
 ]
 
+import collections
 import dataclasses
 import logging
 from pathlib import Path
 import re
-from typing import Dict, List, Optional, Tuple, Union
+from typing import Dict, List, Optional, Set, Tuple, Union
 from typing_extensions import Literal, TypedDict
 
 import yaml
@@ -19,12 +20,15 @@ import yaml
 from medkit.core import Attribute
 from medkit.core.text import ContextOperation, Segment
 from medkit.text.utils.decoding import get_ascii_from_unicode
+from medkit.text.utils._regexp_literals import RulePrefilter, fold_case
 
 logger = logging.getLogger(__name__)
 
 _PATH_TO_DEFAULT_RULES = Path(__file__).parent / "hypothesis_detector_default_rules.yml"
 _PATH_TO_DEFAULT_VERBS = Path(__file__).parent / "hypothesis_detector_default_verbs.yml"
 
+_WORD_PATTERN = re.compile(r"\w+")
+
 
 @dataclasses.dataclass
 class HypothesisDetectorRule:
@@ -179,12 +183,23 @@ class HypothesisDetector(ContextOperation):
 
         # build and pre-compile exclusion pattern for each verb
         self._patterns_by_verb = {}
+        # verbs having a conjugated form starting with a given (case-folded) word,
+        # used to only try verbs that may match a text
+        self._verbs_by_first_word: Dict[str, Set[str]] = collections.defaultdict(set)
+        # verbs having conjugated forms not starting with a word, always tried
+        self._verbs_without_first_word: Set[str] = set()
         for verb_root, verb_forms_by_mode_and_tense in verbs.items():
             verb_regexps = set()
             for mode, tense in modes_and_tenses:
                 for verb_form in verb_forms_by_mode_and_tense[mode][tense]:
                     verb_regexp = r"\b" + verb_form.replace(" ", r"\s+") + r"\b"
                     verb_regexps.add(verb_regexp)
+
+                    first_word = verb_form.split(" ", 1)[0]
+                    if _WORD_PATTERN.fullmatch(first_word):
+                        self._verbs_by_first_word[fold_case(first_word)].add(verb_root)
+                    else:
+                        self._verbs_without_first_word.add(verb_root)
             verb_pattern = re.compile("|".join(verb_regexps), flags=re.IGNORECASE)
             self._patterns_by_verb[verb_root] = verb_pattern
 
@@ -205,6 +220,12 @@ class HypothesisDetector(ContextOperation):
             else None
             for rule in self.rules
         ]
+        # index of literals required by rules, used to skip rules that cannot match
+        self._prefilter = RulePrefilter(
+            [rule.regexp for rule in self.rules],
+            [rule.case_sensitive for rule in self.rules],
+            [rule.unicode_sensitive for rule in self.rules],
+        )
         self._has_non_unicode_sensitive_rule = any(
             not r.unicode_sensitive for r in rules
         )
@@ -266,8 +287,17 @@ class HypothesisDetector(ContextOperation):
         return hyp_attr
 
     def _find_matching_verb(self, text: str) -> Optional[str]:
+        # only try verbs with a conjugated form starting with a word of the text
+        candidate_verbs = set(self._verbs_without_first_word)
+        for word in _WORD_PATTERN.findall(text):
+            verbs = self._verbs_by_first_word.get(fold_case(word))
+            if verbs is not None:
+                candidate_verbs.update(verbs)
+        if not candidate_verbs:
+            return None
+
         for verb, verb_pattern in self._patterns_by_verb.items():
-            if verb_pattern.search(text):
+            if verb in candidate_verbs and verb_pattern.search(text):
                 return verb
         return None
 
@@ -282,8 +312,9 @@ class HypothesisDetector(ContextOperation):
         if self._has_non_unicode_sensitive_rule:
             text_ascii = get_ascii_from_unicode(text, logger=logger)
 
-        # try all rules until we have a match
-        for rule_index, rule in enumerate(self.rules):
+        # try all rules that may match until we have a match
+        for rule_index in self._prefilter.get_candidate_rules(text_unicode, text_ascii):
+            rule = self.rules[rule_index]
             pattern = self._patterns[rule_index]
             exclusion_pattern = self._exclusion_patterns[rule_index]
             text = text_unicode if rule.unicode_sensitive else text_ascii
@@ -14,6 +14,7 @@ import yaml
 from medkit.core import Attribute
 from medkit.core.text import ContextOperation, Segment
 from medkit.text.utils.decoding import get_ascii_from_unicode
+from medkit.text.utils._regexp_literals import RulePrefilter
 
 logger = logging.getLogger(__name__)
 
@@ -137,6 +138,12 @@ class NegationDetector(ContextOperation):
             else None
             for rule in self.rules
         ]
+        # index of literals required by rules, used to skip rules that cannot match
+        self._prefilter = RulePrefilter(
+            [rule.regexp for rule in self.rules],
+            [rule.case_sensitive for rule in self.rules],
+            [rule.unicode_sensitive for rule in self.rules],
+        )
         self._has_non_unicode_sensitive_rule = any(
             not r.unicode_sensitive for r in rules
         )
@@ -188,8 +195,9 @@ class NegationDetector(ContextOperation):
         if self._has_non_unicode_sensitive_rule:
             text_ascii = get_ascii_from_unicode(text, logger=logger)
 
-        # try all rules until we have a match
-        for rule_index, rule in enumerate(self.rules):
+        # try all rules that may match until we have a match
+        for rule_index in self._prefilter.get_candidate_rules(text_unicode, text_ascii):
+            rule = self.rules[rule_index]
             pattern = self._patterns[rule_index]
             exclusion_pattern = self._exclusion_patterns[rule_index]
             text = text_unicode if rule.unicode_sensitive else text_ascii
@@ -6,7 +6,7 @@ from typing_extensions import Literal
 from seqeval.metrics import accuracy_score, classification_report
 from seqeval.scheme import BILOU, IOB2
 
-from medkit.core.text import TextDocument, Entity, span_utils
+from medkit.core.text import TextDocument, Entity
 from medkit.text.ner import hf_tokenization_utils
 from medkit.training.utils import BatchData
 
@@ -155,7 +155,7 @@ class SeqEvalEvaluator:
         tags = ["O"] * len(text)
         for ent in entities:
             label = ent.label
-            ent_spans = span_utils.normalize_spans(ent.spans)
+            ent_spans = ent.normalized_spans
             # skip if all spans were ModifiedSpans and we are
             # not able to refer back to text
             if not ent_spans:
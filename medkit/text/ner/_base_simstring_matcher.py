@@ -5,15 +5,22 @@ __all__ = [
     "BaseSimstringMatcherRule",
     "BaseSimstringMatcherNormalization",
     "build_simstring_matcher_databases",
+    "write_simstring_matcher_databases",
+    "get_simstring_term",
 ]
 
 import dataclasses
+import functools
 import math
+import multiprocessing
+import multiprocessing.pool
 from pathlib import Path
+import pickle
 import re
-from typing import Any, Iterable, Iterator, List, Optional, Tuple, Union
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
 from typing_extensions import Literal
 import shelve
+import weakref
 
 from pysimstring import simstring
 from unidecode import unidecode
@@ -32,6 +39,7 @@ from medkit.core.text import (
     UMLSNormAttribute,
     span_utils,
 )
+from medkit.core.utils import batch_list
 
 _SIMILARITY_MAP = {
     "cosine": simstring.cosine,
@@ -40,6 +48,20 @@ _SIMILARITY_MAP = {
     "overlap": simstring.overlap,
 }
 
+# attributes of BaseSimstringMatcher that are not pickled
+_UNPICKLED_ATTRS = (
+    "_simstring_db_reader",
+    "_rules_db",
+    "_match_candidate",
+    "_spacy_lang",
+    "_pool",
+    "_pool_finalizer",
+    "_prov_tracer",
+)
+
+# matcher used by a worker process, set when initializing the worker
+_worker_matcher: Optional[BaseSimstringMatcher] = None
+
 
 @dataclasses.dataclass
 class BaseSimstringMatcherRule:
@@ -162,6 +184,9 @@ class BaseSimstringMatcher(NEROperation):
         blacklist: Optional[List[str]] = None,
         same_beginning: bool = False,
         attrs_to_copy: Optional[List[str]] = None,
+        candidate_cache_size: Optional[int] = 100_000,
+        rules_in_memory: bool = False,
+        n_workers: int = 1,
         name: Optional[str] = None,
         uid: Optional[str] = None,
     ):
@@ -201,6 +226,22 @@ class BaseSimstringMatcher(NEROperation):
             Labels of the attributes that should be copied from the source
             segment to the created entity. Useful for propagating context
             attributes (negation, antecedent, etc).
+        candidate_cache_size:
+            Maximum number of candidate texts for which the matched rules and
+            similarity scores are kept in memory, so that candidates occurring
+            several times are looked up only once (cf :meth:`~.cache_info`).
+            If `None`, the cache is unbounded, if 0, nothing is cached.
+        rules_in_memory:
+            Whether to load the whole rules database in memory rather than
+            reading rules from the database file when they are needed.
+        n_workers:
+            Number of worker processes to use. If greater than 1, the texts of
+            the segments are split into chunks that are matched in parallel by
+            a pool of processes, each opening its own readers of the databases.
+            Entities are then built (and their provenance traced) in the main
+            process, in the same way as when `n_workers` is 1. The pool is
+            created on the first call to :meth:`~.run` and kept until
+            :meth:`~.close` is called.
         name:
             Name describing the matcher (defaults to the class name).
         uid:
@@ -229,12 +270,12 @@ class BaseSimstringMatcher(NEROperation):
         self.blacklist = set(blacklist)
         self.same_beginning = same_beginning
         self.attrs_to_copy = attrs_to_copy
+        self.n_workers = n_workers
 
-        self._simstring_db_reader = simstring.reader(str(simstring_db_file))
-        self._simstring_db_reader.measure = _SIMILARITY_MAP[similarity]
-        self._simstring_db_reader.threshold = threshold
-
-        self._rules_db = shelve.open(str(rules_db_file), flag="r")
+        self._simstring_db_file = simstring_db_file
+        self._rules_db_file = rules_db_file
+        self._rules_in_memory = rules_in_memory
+        self._candidate_cache_size = candidate_cache_size
 
         if spacy_tokenization_language is not None:
             if spacy is None:
@@ -243,17 +284,63 @@ class BaseSimstringMatcher(NEROperation):
                     " init parameter"
                 )
             if spacy_tokenization_language == "en":
-                spacy_model = "en_core_web_sm"
+                self._spacy_model = "en_core_web_sm"
             else:
-                spacy_model = f"{spacy_tokenization_language}_core_news_sm"
+                self._spacy_model = f"{spacy_tokenization_language}_core_news_sm"
+        else:
+            self._spacy_model = None
+
+        self._pool: Optional[multiprocessing.pool.Pool] = None
+        self._pool_finalizer: Optional[weakref.finalize] = None
+        self._open_resources()
+
+    def _open_resources(self):
+        """Open the databases and load the spacy model"""
+
+        self._simstring_db_reader = simstring.reader(str(self._simstring_db_file))
+        self._simstring_db_reader.measure = _SIMILARITY_MAP[self.similarity]
+        self._simstring_db_reader.threshold = self.threshold
+
+        if self._rules_in_memory:
+            with shelve.open(str(self._rules_db_file), flag="r") as rules_db:
+                self._rules_db = dict(rules_db)
+        else:
+            self._rules_db = shelve.open(str(self._rules_db_file), flag="r")
+
+        # rules matched by each candidate text, with similarity scores
+        self._match_candidate = functools.lru_cache(maxsize=self._candidate_cache_size)(
+            self._compute_candidate_matches
+        )
+
+        if self._spacy_model is not None:
             self._spacy_lang = spacy.load(
-                spacy_model,
+                self._spacy_model,
                 # only keep tok2vec and morphologizer to get POS tags
                 disable=["tagger", "parser", "attribute_ruler", "lemmatizer", "ner"],
             )
         else:
             self._spacy_lang = None
 
+    def __getstate__(self) -> Dict[str, Any]:
+        # databases and spacy model are reopened when unpickling,
+        # provenance is only traced by the main process
+        state = self.__dict__.copy()
+        for key in _UNPICKLED_ATTRS:
+            state.pop(key, None)
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]):
+        self.__dict__.update(state)
+        self._pool = None
+        self._pool_finalizer = None
+        self._open_resources()
+
+    def close(self):
+        """Terminate the pool of worker processes, if any"""
+        if self._pool is not None:
+            self._pool_finalizer()
+            self._pool = None
+
     def run(self, segments: List[Segment]) -> List[Entity]:
         """
         Return entities (with optional normalization attributes) matched in `segments`
@@ -269,24 +356,59 @@ class BaseSimstringMatcher(NEROperation):
             Entities found in `segments` (with optional normalization
             attributes)
         """
-        # pre-tokenize all segments with pipe() so spacy can parallelize it
+        texts = [s.text for s in segments]
+        if self.n_workers > 1 and len(texts) > 1:
+            all_matches = self._find_matches_with_workers(texts)
+        else:
+            all_matches = self._find_matches_in_texts(texts)
+
+        return [
+            self._build_entity(segment, match)
+            for segment, matches in zip(segments, all_matches)
+            for match in matches
+        ]
+
+    def _find_matches_with_workers(self, texts: List[str]) -> List[List[_Match]]:
+        """Find matches in texts with the pool of worker processes"""
+
+        if self._pool is None:
+            # workers get a pickled copy of the matcher: the pool must not
+            # reference the matcher, otherwise the matcher would be kept alive
+            # by the finalizer terminating the pool and would never be collected
+            self._pool = multiprocessing.Pool(
+                processes=self.n_workers,
+                initializer=_init_worker,
+                initargs=(pickle.dumps(self, protocol=pickle.HIGHEST_PROTOCOL),),
+            )
+            # don't leave worker processes behind if close() is not called
+            self._pool_finalizer = weakref.finalize(self, self._pool.terminate)
+
+        # use several chunks per worker to balance the load between workers
+        chunk_size = math.ceil(len(texts) / (self.n_workers * 4))
+        chunks = batch_list(texts, chunk_size)
+        return [
+            matches
+            for chunk_matches in self._pool.map(_find_matches_in_worker, chunks)
+            for matches in chunk_matches
+        ]
+
+    def _find_matches_in_texts(self, texts: List[str]) -> List[List[_Match]]:
+        """Return the matches found in each text"""
+
+        # pre-tokenize all texts with pipe() so spacy can parallelize it
         if self._spacy_lang is not None:
-            spacy_docs = self._spacy_lang.pipe(s.text for s in segments)
+            spacy_docs = self._spacy_lang.pipe(texts)
         else:
-            spacy_docs = [None] * len(segments)
+            spacy_docs = [None] * len(texts)
 
         return [
-            entity
-            for segment, spacy_doc in zip(segments, spacy_docs)
-            for entity in self._find_matches_in_segment(segment, spacy_doc)
+            self._find_matches(text, spacy_doc)
+            for text, spacy_doc in zip(texts, spacy_docs)
         ]
 
-    def _find_matches_in_segment(
-        self, segment: Segment, spacy_doc: Optional[Any]
-    ) -> Iterator[Entity]:
-        """Return an iterator to the entities matched in a segment"""
+    def _find_matches(self, text: str, spacy_doc: Optional[Any]) -> List[_Match]:
+        """Return the matches found in a text"""
 
-        text = segment.text
         matches = []
         if spacy_doc is not None:
             ranges = _build_candidate_ranges_with_spacy(
@@ -298,56 +420,71 @@ class BaseSimstringMatcher(NEROperation):
             )
 
         for start, end in ranges:
-            candidate_text = text[start:end]
-            # simstring matching is always performed on lowercased ASCII-only text,
-            # then for potential matches we will recompute the similarity
-            # taking into account the actual rule parameters
-            candidate_text_processed = unidecode(candidate_text.lower())
-            matched_terms = self._simstring_db_reader.retrieve(candidate_text_processed)
-
-            for matched_term in matched_terms:
-                # if requested, ignore matches that start differently
-                if (
-                    self.same_beginning
-                    and matched_term[0] != candidate_text_processed[0]
-                ):
-                    continue
-
-                # retrieve rules corresponding to matched term
-                rules = self._rules_db[matched_term]
-                # for each rule, recompute similarity
-                # taking into account case_sensitivity and unicode_sensitivity
-                for rule in rules:
-                    rule_term = rule.term
-
-                    # apply required text transforms on term and candidate texts
-                    if not rule.case_sensitive and not rule.unicode_sensitive:
-                        candidate_text = candidate_text_processed
-                        rule_term = matched_term
-                    elif not rule.case_sensitive:
-                        candidate_text = candidate_text.lower()
-                        rule_term = rule_term.lower()
-                    elif not rule.unicode_sensitive:
-                        candidate_text = unidecode(candidate_text)
-                        rule_term = unidecode(rule_term)
-
-                    # ignore blacklisted terms
-                    if rule_term in self.blacklist:
-                        continue
-
-                    # recompute similarity and keep match if above threshold
-                    score = _get_similarity_score(
-                        rule_term, candidate_text, self.similarity
-                    )
-                    if score >= self.threshold:
-                        match = _Match(start, end, rule, score)
-                        matches.append(match)
+            for rule, score in self._match_candidate(text[start:end]):
+                matches.append(_Match(start, end, rule, score))
 
         # keep only best matches among overlaps
-        matches = self._filter_overlapping_matches(matches)
+        return self._filter_overlapping_matches(matches)
 
-        for match in matches:
-            yield self._build_entity(segment, match)
+    def cache_info(self) -> functools._CacheInfo:
+        """
+        Return statistics about the cache of matched candidate texts, as a named
+        tuple with `hits`, `misses`, `maxsize` and `currsize` fields (like
+        :func:`functools.lru_cache`)
+        """
+        return self._match_candidate.cache_info()
+
+    def cache_clear(self):
+        """Clear the cache of matched candidate texts and its statistics"""
+        self._match_candidate.cache_clear()
+
+    def _compute_candidate_matches(
+        self, candidate_text: str
+    ) -> Tuple[Tuple[BaseSimstringMatcherRule, float], ...]:
+        """Return the rules matched by a candidate text, with similarity scores"""
+
+        rules_and_scores = []
+        # simstring matching is always performed on lowercased ASCII-only text,
+        # then for potential matches we will recompute the similarity
+        # taking into account the actual rule parameters
+        candidate_text_processed = get_simstring_term(candidate_text)
+        matched_terms = self._simstring_db_reader.retrieve(candidate_text_processed)
+
+        for matched_term in matched_terms:
+            # if requested, ignore matches that start differently
+            if self.same_beginning and matched_term[0] != candidate_text_processed[0]:
+                continue
+
+            # retrieve rules corresponding to matched term
+            rules = self._rules_db[matched_term]
+            # for each rule, recompute similarity
+            # taking into account case_sensitivity and unicode_sensitivity
+            for rule in rules:
+                rule_term = rule.term
+
+                # apply required text transforms on term and candidate texts
+                if not rule.case_sensitive and not rule.unicode_sensitive:
+                    candidate_text = candidate_text_processed
+                    rule_term = matched_term
+                elif not rule.case_sensitive:
+                    candidate_text = candidate_text.lower()
+                    rule_term = rule_term.lower()
+                elif not rule.unicode_sensitive:
+                    candidate_text = unidecode(candidate_text)
+                    rule_term = unidecode(rule_term)
+
+                # ignore blacklisted terms
+                if rule_term in self.blacklist:
+                    continue
+
+                # recompute similarity and keep match if above threshold
+                score = _get_similarity_score(
+                    rule_term, candidate_text, self.similarity
+                )
+                if score >= self.threshold:
+                    rules_and_scores.append((rule, score))
+
+        return tuple(rules_and_scores)
 
     @staticmethod
     def _filter_overlapping_matches(matches: List[_Match]) -> List[_Match]:
@@ -405,6 +542,19 @@ class BaseSimstringMatcher(NEROperation):
         return entity
 
 
+def _init_worker(matcher_data: bytes):
+    global _worker_matcher
+
+    # databases are reopened by the worker when unpickling the matcher
+    _worker_matcher = pickle.loads(matcher_data)
+
+
+def _find_matches_in_worker(texts: List[str]) -> List[List[_Match]]:
+    matcher = _worker_matcher
+    assert matcher is not None
+    return matcher._find_matches_in_texts(texts)
+
+
 def build_simstring_matcher_databases(
     simstring_db_file: Path,
     rules_db_file: Path,
@@ -425,6 +575,33 @@ def build_simstring_matcher_databases(
         Rules to add to databases
     """
 
+    rules_by_term: Dict[str, List[BaseSimstringMatcherRule]] = {}
+    for rule in rules:
+        rules_by_term.setdefault(get_simstring_term(rule.term), []).append(rule)
+    write_simstring_matcher_databases(simstring_db_file, rules_db_file, rules_by_term)
+
+
+def write_simstring_matcher_databases(
+    simstring_db_file: Path,
+    rules_db_file: Path,
+    rules_by_term: Dict[str, List[BaseSimstringMatcherRule]],
+):
+    """
+    Generate the databases needed by :class:`BaseSimstringMatcher` from rules
+    already grouped by term to match.
+
+    Parameters
+    ----------
+    simstring_db_file:
+        Database used by the fuzzy matching `simstring` library.
+    rules_db_file:
+        `shelve` database storing the mapping between terms to match and
+        corresponding BaseSimstringMatcherRule` objects
+    rules_by_term:
+        Rules to add to databases, by term to match (as returned by
+        :func:`~.get_simstring_term` for the term of each rule)
+    """
+
     # the params passed to simstring.writer are copy/pasted from QuickUMLS
     # cf https://github.com/Georgetown-IR-Lab/QuickUMLS/blob/a3ba0b3559da2574a907f4d41aa0f2c1c0d5ce0a/quickumls/toolbox.py#L173
     simstring_db_writer = simstring.writer(
@@ -433,29 +610,24 @@ def build_simstring_matcher_databases(
         False,  # represent begin and end of strings in n-grams
         True,  # use unicode mode
     )
+    rules_db = shelve.open(str(rules_db_file), flag="n")
 
-    # writeback=True needed because we are updating the values in the mapping,
-    # not just writing
-    rules_db = shelve.open(str(rules_db_file), flag="n", writeback=True)
-
-    # add rules to databases
-    for rule in rules:
-        term_to_match = rule.term
-
-        # apply preprocessing
-        term_to_match = unidecode(term_to_match.lower())
-
-        # add to simstring db
+    # each term is written only once, with all its rules
+    for term_to_match, rules in rules_by_term.items():
         simstring_db_writer.insert(term_to_match)
-        # add to rules db
-        if term_to_match not in rules_db:
-            rules_db[term_to_match] = []
-        rules_db[term_to_match].append(rule)
+        rules_db[term_to_match] = rules
     simstring_db_writer.close()
-    rules_db.sync()
     rules_db.close()
 
 
+def get_simstring_term(term: str) -> str:
+    """
+    Return the version of a term stored in the simstring database (simstring
+    matching is always performed on lowercased ASCII-only text)
+    """
+    return unidecode(term.lower())
+
+
 _TOKENIZATION_PATTERN = re.compile(r"[\w]+|[^\w ]")
 
 
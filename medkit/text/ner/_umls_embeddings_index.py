@@ -0,0 +1,208 @@
+__all__ = ["IVFIndex"]
+
+from pathlib import Path
+from typing import List, Tuple, Union
+
+import numpy as np
+
+# number of embeddings used to train the coarse quantizer, per list
+_NB_TRAINING_EMBEDDINGS_PER_LIST = 64
+# number of embeddings processed at a time when assigning them to lists
+_BLOCK_SIZE = 65536
+
+
+class IVFIndex:
+    """
+    Inverted file index for approximate nearest neighbour search of embeddings
+    by inner product, used by
+    :class:`~medkit.text.ner.umls_coder_normalizer.UMLSCoderNormalizer`.
+
+    Embeddings are partitioned into lists by a coarse quantizer trained with
+    spherical k-means (each list corresponding to a centroid). At search time,
+    only the embeddings of the `nb_probes` lists whose centroids are the most
+    similar to the query are compared to it, so recall (and cost) increase with
+    `nb_probes`. Searching all lists is equivalent to an exhaustive search.
+
+    The index only stores the centroids and the list of each embedding, the
+    embeddings themselves (typically a memory-mapped array) are passed to
+    :meth:`~.search`.
+    """
+
+    def __init__(self, centroids: np.ndarray, ids: np.ndarray, offsets: np.ndarray):
+        """
+        Parameters
+        ----------
+        centroids:
+            Centroids of the lists, of shape `(nb_lists, dim)`
+        ids:
+            Indices of the embeddings, sorted by list
+        offsets:
+            Start of each list in `ids`, followed by the total number of
+            embeddings
+        """
+        self.centroids = centroids
+        self.ids = ids
+        self.offsets = offsets
+
+    @property
+    def nb_lists(self) -> int:
+        return len(self.centroids)
+
+    @classmethod
+    def build(
+        cls,
+        embeddings: np.ndarray,
+        nb_lists: int,
+        nb_iterations: int = 10,
+        seed: int = 0,
+    ) -> "IVFIndex":
+        """
+        Build an index for `embeddings`
+
+        Parameters
+        ----------
+        embeddings:
+            Embeddings to index, of shape `(nb_embeddings, dim)`. Can be a
+            memory-mapped array, it is read by blocks.
+        nb_lists:
+            Number of lists into which the embeddings are partitioned (at most
+            the number of embeddings). A few thousands is typical for millions
+            of embeddings.
+        nb_iterations:
+            Number of k-means iterations
+        seed:
+            Seed of the random sampling of training embeddings and initial
+            centroids
+        """
+
+        nb_embeddings = len(embeddings)
+        nb_lists = min(nb_lists, nb_embeddings)
+        rng = np.random.default_rng(seed)
+
+        # train coarse quantizer on a sample of the embeddings
+        nb_training_embeddings = min(
+            nb_embeddings, nb_lists * _NB_TRAINING_EMBEDDINGS_PER_LIST
+        )
+        training_ids = np.sort(
+            rng.choice(nb_embeddings, size=nb_training_embeddings, replace=False)
+        )
+        training_embeddings = np.asarray(embeddings[training_ids], dtype=np.float32)
+        centroids = training_embeddings[
+            rng.choice(nb_training_embeddings, size=nb_lists, replace=False)
+        ]
+        centroids = _normalize(centroids)
+
+        for _ in range(nb_iterations):
+            assignments = _assign(training_embeddings, centroids)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assignments, training_embeddings)
+            # keep previous centroid for empty lists
+            counts = np.bincount(assignments, minlength=nb_lists)
+            sums[counts == 0] = centroids[counts == 0]
+            centroids = _normalize(sums)
+
+        # assign all embeddings to lists
+        assignments = np.concatenate(
+            [
+                _assign(np.asarray(embeddings[start : start + _BLOCK_SIZE]), centroids)
+                for start in range(0, nb_embeddings, _BLOCK_SIZE)
+            ]
+        )
+        ids = np.argsort(assignments, kind="stable")
+        offsets = np.searchsorted(assignments[ids], np.arange(nb_lists + 1))
+        return cls(centroids, ids, offsets)
+
+    @classmethod
+    def load(cls, file: Union[str, Path]) -> "IVFIndex":
+        """Load an index saved with :meth:`~.save`"""
+        with np.load(file) as data:
+            return cls(data["centroids"], data["ids"], data["offsets"])
+
+    def save(self, file: Union[str, Path]):
+        """Save the index into a `.npz` file"""
+        with open(file, mode="wb") as fp:
+            np.savez(fp, centroids=self.centroids, ids=self.ids, offsets=self.offsets)
+
+    def search(
+        self, queries: np.ndarray, embeddings: np.ndarray, k: int, nb_probes: int
+    ) -> Tuple[List[List[int]], List[List[float]]]:
+        """
+        Find the `k` embeddings with the highest inner product with each query,
+        among the embeddings of the `nb_probes` closest lists
+
+        Parameters
+        ----------
+        queries:
+            Query embeddings, of shape `(nb_queries, dim)`
+        embeddings:
+            Indexed embeddings, as passed to :meth:`~.build`
+        k:
+            Number of embeddings to return for each query
+        nb_probes:
+            Number of lists to search for each query
+
+        Returns
+        -------
+        Tuple[List[List[int]], List[List[float]]]
+            Indices of the embeddings found for each query and corresponding
+            inner products, by decreasing inner product. There may be less than
+            `k` embeddings for a query if the lists searched contain less.
+        """
+
+        queries = np.asarray(queries, dtype=np.float32)
+        nb_queries = len(queries)
+        nb_probes = min(nb_probes, self.nb_lists)
+
+        # lists to search for each query
+        centroid_scores = queries @ self.centroids.T
+        probes = np.argpartition(-centroid_scores, nb_probes - 1, axis=1)[:, :nb_probes]
+        is_probed = np.zeros((nb_queries, self.nb_lists), dtype=bool)
+        np.put_along_axis(is_probed, probes, True, axis=1)
+
+        # best matches found so far for each query
+        best_scores = np.full((nb_queries, k), -np.inf, dtype=np.float32)
+        best_ids = np.full((nb_queries, k), -1, dtype=np.int64)
+
+        # each list is read once, and compared with the queries probing it
+        for list_index in np.flatnonzero(is_probed.any(axis=0)):
+            list_ids = self.ids[self.offsets[list_index] : self.offsets[list_index + 1]]
+            if len(list_ids) == 0:
+                continue
+            query_indices = np.flatnonzero(is_probed[:, list_index])
+            list_embeddings = np.asarray(embeddings[list_ids], dtype=np.float32)
+            scores = queries[query_indices] @ list_embeddings.T
+
+            # merge with previous best matches
+            scores = np.concatenate([best_scores[query_indices], scores], axis=1)
+            ids = np.concatenate(
+                [
+                    best_ids[query_indices],
+                    np.broadcast_to(list_ids, (len(query_indices), len(list_ids))),
+                ],
+                axis=1,
+            )
+            top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+            best_scores[query_indices] = np.take_along_axis(scores, top, axis=1)
+            best_ids[query_indices] = np.take_along_axis(ids, top, axis=1)
+
+        order = np.argsort(-best_scores, axis=1, kind="stable")
+        best_scores = np.take_along_axis(best_scores, order, axis=1)
+        best_ids = np.take_along_axis(best_ids, order, axis=1)
+
+        all_indices = []
+        all_scores = []
+        for query_ids, query_scores in zip(best_ids, best_scores):
+            found = query_ids >= 0
+            all_indices.append(query_ids[found].tolist())
+            all_scores.append(query_scores[found].tolist())
+        return all_indices, all_scores
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-12)
+
+
+def _assign(embeddings: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+    """Return the index of the most similar centroid of each embedding"""
+    return np.argmax(np.asarray(embeddings, dtype=np.float32) @ centroids.T, axis=1)
@@ -9,7 +9,7 @@ from typing_extensions import Literal
 
 from transformers.tokenization_utils_fast import EncodingFast
 
-from medkit.core.text import Entity, span_utils
+from medkit.core.text import Entity
 
 SPECIAL_TAG_ID_HF: int = -100
 
@@ -142,7 +142,7 @@ def transform_entities_to_tags(
 
     for ent in entities:
         label = ent.label
-        ent_spans = span_utils.normalize_spans(ent.spans)
+        ent_spans = ent.normalized_spans
         start_char = ent_spans[0].start
         end_char = ent_spans[-1].end
         tokens_entity = set()
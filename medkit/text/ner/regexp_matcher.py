@@ -11,7 +11,7 @@ import dataclasses
 import logging
 from pathlib import Path
 import re
-from typing import Any, Iterator, List, Optional, Union
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
 from typing_extensions import TypedDict
 
 import yaml
@@ -25,6 +25,7 @@ from medkit.core.text import (
     span_utils,
 )
 from medkit.text.utils.decoding import get_ascii_from_unicode
+from medkit.text.utils._regexp_literals import RulePrefilter
 
 logger = logging.getLogger(__name__)
 
@@ -186,14 +187,24 @@ class RegexpMatcher(NEROperation):
             re.compile(rule.regexp, flags=0 if rule.case_sensitive else re.IGNORECASE)
             for rule in self.rules
         ]
-        self._exclusion_patterns = [
-            re.compile(
-                rule.exclusion_regexp, flags=0 if rule.case_sensitive else re.IGNORECASE
-            )
-            if rule.exclusion_regexp is not None
-            else None
-            for rule in self.rules
-        ]
+        # rules with the same exclusion regexp share the same pattern object,
+        # so that it is evaluated only once per segment
+        exclusion_patterns_by_key: Dict[Tuple[str, int], re.Pattern] = {}
+        self._exclusion_patterns = []
+        for rule in self.rules:
+            if rule.exclusion_regexp is None:
+                self._exclusion_patterns.append(None)
+                continue
+            key = (rule.exclusion_regexp, 0 if rule.case_sensitive else re.IGNORECASE)
+            if key not in exclusion_patterns_by_key:
+                exclusion_patterns_by_key[key] = re.compile(*key)
+            self._exclusion_patterns.append(exclusion_patterns_by_key[key])
+        # index of literals required by rules, used to skip rules that cannot match
+        self._prefilter = RulePrefilter(
+            [rule.regexp for rule in self.rules],
+            [rule.case_sensitive for rule in self.rules],
+            [rule.unicode_sensitive for rule in self.rules],
+        )
         self._has_non_unicode_sensitive_rule = any(
             not r.unicode_sensitive for r in rules
         )
@@ -225,31 +236,42 @@ class RegexpMatcher(NEROperation):
         if self._has_non_unicode_sensitive_rule:
             text_ascii = get_ascii_from_unicode(segment.text, logger=logger)
 
-        for rule_index in range(len(self.rules)):
+        # results of exclusion patterns already evaluated on this segment
+        is_excluded_by_pattern: Dict[Tuple[re.Pattern, str], bool] = {}
+
+        for rule_index in self._prefilter.get_candidate_rules(segment.text, text_ascii):
+            rule = self.rules[rule_index]
+            text_to_match = segment.text if rule.unicode_sensitive else text_ascii
             yield from self._find_matches_in_segment_for_rule(
-                rule_index, segment, text_ascii
+                rule_index, segment, text_to_match, is_excluded_by_pattern
             )
 
     def _find_matches_in_segment_for_rule(
-        self, rule_index: int, segment: Segment, text_ascii: Optional[str]
+        self,
+        rule_index: int,
+        segment: Segment,
+        text_to_match: str,
+        is_excluded_by_pattern: Dict[Tuple[re.Pattern, str], bool],
     ) -> Iterator[Entity]:
         rule = self.rules[rule_index]
         pattern = self._patterns[rule_index]
         exclusion_pattern = self._exclusion_patterns[rule_index]
 
-        text_to_match = segment.text if rule.unicode_sensitive else text_ascii
-
         for match in pattern.finditer(text_to_match):
             # note that we apply exclusion_pattern to the whole segment,
             # so we might have a match in a part of the text unrelated to the current
             # match
             # we could check if we have any exclude match overlapping with
             # the current match but that wouldn't work for all cases
-            if (
-                exclusion_pattern is not None
-                and exclusion_pattern.search(text_to_match) is not None
-            ):
-                continue
+            if exclusion_pattern is not None:
+                key = (exclusion_pattern, text_to_match)
+                is_excluded = is_excluded_by_pattern.get(key)
+                if is_excluded is None:
+                    is_excluded = exclusion_pattern.search(text_to_match) is not None
+                    is_excluded_by_pattern[key] = is_excluded
+                if is_excluded:
+                    # no other match of this rule can be kept
+                    return
 
             # extract raw span list from regex match range
             text, spans = span_utils.extract(
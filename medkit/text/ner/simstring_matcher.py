@@ -111,6 +111,9 @@ class SimstringMatcher(BaseSimstringMatcher):
         blacklist: Optional[List[str]] = None,
         same_beginning: bool = False,
         attrs_to_copy: Optional[List[str]] = None,
+        candidate_cache_size: Optional[int] = 100_000,
+        rules_in_memory: bool = False,
+        n_workers: int = 1,
         name: Optional[str] = None,
         uid: Optional[str] = None,
     ):
@@ -147,6 +150,18 @@ class SimstringMatcher(BaseSimstringMatcher):
             Labels of the attributes that should be copied from the source
             segment to the created entity. Useful for propagating context
             attributes (negation, antecedent, etc.).
+        candidate_cache_size:
+            Maximum number of candidate texts for which the matched rules and
+            similarity scores are kept in memory, so that candidates occurring
+            several times are looked up only once. If `None`, the cache is
+            unbounded, if 0, nothing is cached.
+        rules_in_memory:
+            Whether to load the whole rules database in memory rather than
+            reading rules from the database file when they are needed.
+        n_workers:
+            Number of worker processes used to match segments in parallel (cf
+            :class:`~medkit.text.ner._base_simstring_matcher.BaseSimstringMatcher`).
+            The pool of processes is kept until :meth:`~.close` is called.
         name:
             Name describing the matcher (defaults to the class name).
         uid:
@@ -174,10 +189,20 @@ class SimstringMatcher(BaseSimstringMatcher):
             blacklist=blacklist,
             same_beginning=same_beginning,
             attrs_to_copy=attrs_to_copy,
+            candidate_cache_size=candidate_cache_size,
+            rules_in_memory=rules_in_memory,
+            n_workers=n_workers,
             name=name,
             uid=uid,
         )
 
+    def __getstate__(self) -> Dict[str, Any]:
+        # the temporary directory containing the databases is owned by the
+        # original matcher (copies used by worker processes must not remove it)
+        state = super().__getstate__()
+        state.pop("_temp_dir")
+        return state
+
     @staticmethod
     def load_rules(
         path_to_rules: Path, encoding: Optional[str] = None
@@ -5,19 +5,25 @@ To install them, use `pip install medkit-lib[umls-coder-normalizer]`.
 
 __all__ = ["UMLSCoderNormalizer"]
 
+from collections import OrderedDict
+import functools
+import hashlib
+import json
 from typing import Any, Dict, List, NamedTuple, Optional, Tuple, Union
 from typing_extensions import Literal
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
 import torch
 import transformers
 from transformers import PreTrainedModel, PreTrainedTokenizer, FeatureExtractionPipeline
 import yaml
 
-from medkit.core import Operation
+from medkit.core import Operation, ResultCache
 from medkit.core.text import Entity, UMLSNormAttribute
 import medkit.core.utils
+from medkit.text.ner._umls_embeddings_index import IVFIndex
 from medkit.text.ner.umls_utils import (
     load_umls_entries,
     preprocess_term_to_match,
@@ -29,6 +35,9 @@ _PARAMS_FILENAME = "params.yml"
 _TERMS_FILENAME = "terms.feather"
 _UMLS_EMBEDDINGS_CHUNK_SIZE = 65536
 _UMLS_EMBEDDINGS_FILE_EXT = ".pt"
+_EMBEDDINGS_STORE_FILENAME = "embeddings_{dtype}.npy"
+_IVF_INDEX_FILENAME = "ivf_index_{nb_lists}.npz"
+_RESULTS_CACHE_FILENAME = "results_cache.db"
 
 
 class _UMLSEmbeddingsParams(NamedTuple):
@@ -70,6 +79,14 @@ class UMLSCoderNormalizer(Operation):
     must be used, or `embeddings_cache_dir` must be deleted so it can be created properly.
 
     If the umls embeddings are too big to be held in memory, use `nb_umls_embeddings_chunks`.
+
+    To avoid comparing each entity with all umls embeddings, use `ann_nb_lists` to
+    search them with an approximate nearest neighbour index (built once and stored
+    in `embeddings_cache_dir`).
+
+    Entities with the same text are only embedded and matched once per call to
+    `run()`, and the matches found for each entity text are kept in a cache
+    (cf `cache_size` and `persist_cache`).
     """
 
     def __init__(
@@ -88,6 +105,11 @@ class UMLSCoderNormalizer(Operation):
         batch_size: int = 128,
         hf_auth_token: Optional[str] = None,
         nb_umls_embeddings_chunks: Optional[int] = None,
+        umls_embeddings_dtype: Literal["float32", "float16"] = "float32",
+        ann_nb_lists: Optional[int] = None,
+        ann_nb_probes: int = 16,
+        cache_size: Optional[int] = 100_000,
+        persist_cache: bool = False,
         hf_cache_dir: Optional[Union[str, Path]] = None,
         name: Optional[str] = None,
         uid: Optional[str] = None,
@@ -143,6 +165,37 @@ class UMLSCoderNormalizer(Operation):
             for each group.
             Use this when umls embeddings are too big to be fully loaded in memory.
             The higher this value, the more memory needed.
+            Embeddings are then read from a memory-mapped copy of all pre-computed
+            umls embeddings (created in `embeddings_cache_dir` the first time it
+            is needed), rather than deserialized from the chunk files at each call.
+        umls_embeddings_dtype:
+            Type of the memory-mapped copy of the umls embeddings used when
+            `nb_umls_embeddings_chunks` or `ann_nb_lists` are set. `"float16"`
+            halves its size, at the cost of small approximations of similarity
+            scores (exact matches may not have a score of exactly 1.0).
+        ann_nb_lists:
+            If set, umls embeddings are searched with an approximate nearest
+            neighbour index instead of being all compared with each entity: they
+            are partitioned into `ann_nb_lists` lists of similar embeddings, and
+            only the lists most similar to each entity are searched (cf
+            `ann_nb_probes`). The index is built on the cpu the first time it is
+            needed and stored in `embeddings_cache_dir`. A value around the square
+            root of the number of umls terms is typical (ex: 4096 for millions of
+            terms).
+        ann_nb_probes:
+            Number of lists searched for each entity when `ann_nb_lists` is set.
+            Higher values give better recall but slower searches. Searching all
+            lists is equivalent to an exhaustive search.
+        cache_size:
+            Maximum number of entity texts for which the best matches and scores
+            are kept in memory, so that they are not embedded and matched again
+            on further calls to `run()`. If `None`, the cache is unbounded, if 0,
+            nothing is kept between calls.
+        persist_cache:
+            Whether to also store the matches of entity texts in a database in
+            `embeddings_cache_dir`, so that they can be reused by other instances
+            of the normalizer (with the same `max_nb_matches` and search
+            params) and by other processes.
         name:
             Name describing the normalizer (defaults to the class name).
         uid:
@@ -166,6 +219,11 @@ class UMLSCoderNormalizer(Operation):
         self.max_nb_matches = max_nb_matches
         self.device = device
         self.nb_umls_embeddings_chunks = nb_umls_embeddings_chunks
+        self.umls_embeddings_dtype = umls_embeddings_dtype
+        self.ann_nb_lists = ann_nb_lists
+        self.ann_nb_probes = ann_nb_probes
+        self.cache_size = cache_size
+        self.persist_cache = persist_cache
 
         self._pipeline: _EmbeddingsPipeline = transformers.pipeline(
             "feature-extraction",
@@ -185,19 +243,45 @@ class UMLSCoderNormalizer(Operation):
         # pre-compute embeddings of UMLS terms if necessary
         self._build_umls_embeddings()
 
-        # preload all pre-computed UMLS embeddings if nb_umls_embeddings_chunks not set
-        if self.nb_umls_embeddings_chunks is None:
+        # preload all pre-computed UMLS embeddings if nb_umls_embeddings_chunks
+        # and ann_nb_lists are not set, otherwise use memory-mapped embeddings
+        if self.nb_umls_embeddings_chunks is None and self.ann_nb_lists is None:
             umls_embeddings_files = sorted(
                 self.embeddings_cache_dir.glob(f"*{_UMLS_EMBEDDINGS_FILE_EXT}")
             )
             self._umls_embeddings = self._load_umls_embeddings(umls_embeddings_files)
+            self._umls_embeddings_store = None
         else:
             self._umls_embeddings = None
+            self._umls_embeddings_store = self._load_umls_embeddings_store()
+
+        if self.ann_nb_lists is not None:
+            self._ivf_index = self._load_ivf_index()
+        else:
+            self._ivf_index = None
 
         # load corresponding UMLS terms and associated CUIs
         umls_terms_file = self.embeddings_cache_dir / _TERMS_FILENAME
         self._umls_entries = pd.read_feather(umls_terms_file)
 
+        # best matches and scores of entity texts, by entity text
+        self._matches_cache: Dict[str, Tuple[List[int], List[float]]] = OrderedDict()
+        self._cache_hits = 0
+        self._cache_misses = 0
+        if self.persist_cache:
+            self._results_cache = ResultCache(
+                self.embeddings_cache_dir / _RESULTS_CACHE_FILENAME
+            )
+            # matches depend on the number of matches and on the search method
+            search_params = [self.max_nb_matches, self.ann_nb_lists]
+            if self.ann_nb_lists is not None:
+                search_params += [self.ann_nb_probes, self.umls_embeddings_dtype]
+            elif self.nb_umls_embeddings_chunks is not None:
+                search_params.append(self.umls_embeddings_dtype)
+            self._results_cache_key_prefix = json.dumps(search_params)
+        else:
+            self._results_cache = None
+
     def run(self, entities: List[Entity]):
         """Add normalization attributes to each entity in `entities`.
 
@@ -223,40 +307,178 @@ class UMLSCoderNormalizer(Operation):
         ):
             self._normalize_entity(entity, match_indices, match_scores)
 
+    def cache_info(self) -> functools._CacheInfo:
+        """
+        Return statistics about the cache of matches of entity texts, as a named
+        tuple with `hits`, `misses`, `maxsize` and `currsize` fields (like
+        :func:`functools.lru_cache`). Hits include entities with the same text
+        as another entity of the same call to `run()` and matches retrieved
+        from the persisted cache, `currsize` is the number of entity texts in
+        memory.
+        """
+        return functools._CacheInfo(
+            self._cache_hits,
+            self._cache_misses,
+            self.cache_size,
+            len(self._matches_cache),
+        )
+
+    def cache_clear(self):
+        """
+        Clear the cache of matches of entity texts (including the persisted
+        cache if any) and its statistics
+        """
+        self._matches_cache.clear()
+        if self._results_cache is not None:
+            self._results_cache.clear()
+        self._cache_hits = 0
+        self._cache_misses = 0
+
     def _find_best_matches(
         self, entities: List[Entity]
     ) -> Tuple[List[List[int]], List[List[float]]]:
         entity_terms = [entity.text for entity in entities]
+        # each distinct text is only looked up and matched once
+        unique_terms = list(dict.fromkeys(entity_terms))
+
+        matches_by_term = {}
+        missed_terms = []
+        for term in unique_terms:
+            matches = self._get_cached_matches(term)
+            if matches is not None:
+                matches_by_term[term] = matches
+            else:
+                missed_terms.append(term)
+
+        if missed_terms:
+            all_match_indices, all_match_scores = self._compute_best_matches(
+                missed_terms
+            )
+            for term, match_indices, match_scores in zip(
+                missed_terms, all_match_indices, all_match_scores
+            ):
+                matches_by_term[term] = (match_indices, match_scores)
+                self._cache_matches(term, match_indices, match_scores)
+        # cache lookups also write to the persisted cache (usage of entries),
+        # commit them so that other normalizers sharing it are not blocked
+        if self._results_cache is not None:
+            self._results_cache.flush()
+
+        self._cache_misses += len(missed_terms)
+        self._cache_hits += len(entity_terms) - len(missed_terms)
+
+        return (
+            [matches_by_term[term][0] for term in entity_terms],
+            [matches_by_term[term][1] for term in entity_terms],
+        )
+
+    def _get_cached_matches(self, term: str) -> Optional[Tuple[List[int], List[float]]]:
+        matches = self._matches_cache.get(term)
+        if matches is not None:
+            self._matches_cache.move_to_end(term)
+            return matches
+
+        if self._results_cache is not None:
+            data = self._results_cache.get(self._get_results_cache_key(term))
+            if data is not None:
+                match_indices, match_scores = json.loads(data)
+                self._add_to_matches_cache(term, (match_indices, match_scores))
+                return match_indices, match_scores
+        return None
+
+    def _cache_matches(
+        self, term: str, match_indices: List[int], match_scores: List[float]
+    ):
+        self._add_to_matches_cache(term, (match_indices, match_scores))
+        if self._results_cache is not None:
+            data = json.dumps([match_indices, match_scores]).encode()
+            self._results_cache.put(self._get_results_cache_key(term), data)
+
+    def _add_to_matches_cache(self, term: str, matches: Tuple[List[int], List[float]]):
+        if self.cache_size == 0:
+            return
+        self._matches_cache[term] = matches
+        if self.cache_size is not None and len(self._matches_cache) > self.cache_size:
+            # remove least recently used entity text
+            self._matches_cache.popitem(last=False)
+
+    def _get_results_cache_key(self, term: str) -> str:
+        data = json.dumps([self._results_cache_key_prefix, term])
+        return hashlib.sha256(data.encode()).hexdigest()
+
+    def _compute_best_matches(
+        self, entity_terms: List[str]
+    ) -> Tuple[List[List[int]], List[List[float]]]:
         entity_embeddings = self._pipeline(entity_terms)
         entity_embeddings = torch.cat(entity_embeddings, dim=0)
 
+        if self._ivf_index is not None:
+            # search closest umls embeddings with approximate nearest neighbour index
+            all_matches_indices, all_matches_scores = self._ivf_index.search(
+                entity_embeddings.cpu().numpy(),
+                self._umls_embeddings_store,
+                k=self.max_nb_matches,
+                nb_probes=self.ann_nb_probes,
+            )
+            # round float32 scores in the same way as with exhaustive search
+            # so that a match gets the same score whatever the search method
+            all_matches_scores = [
+                torch.round(torch.tensor(scores), decimals=4).tolist()
+                for scores in all_matches_scores
+            ]
+            return all_matches_indices, all_matches_scores
+
         if self.nb_umls_embeddings_chunks is not None:
-            # compute similarities for each batch of pre-computed umls embeddings
-            all_similarities = []
-            umls_embeddings_files = sorted(
-                self.embeddings_cache_dir.glob(f"*{_UMLS_EMBEDDINGS_FILE_EXT}")
+            # compute similarities for each block of memory-mapped umls embeddings,
+            # keeping the best matches found so far
+            all_matches_scores, all_matches_indices = self._find_best_matches_by_block(
+                entity_embeddings
             )
-            for files in medkit.core.utils.batch_list(
-                umls_embeddings_files, self.nb_umls_embeddings_chunks
-            ):
-                umls_embeddings = self._load_umls_embeddings(files)
-                all_similarities.append(
-                    torch.matmul(entity_embeddings, umls_embeddings.T)
-                )
-            similarities = torch.cat(all_similarities, dim=1)
         else:
             # compute similarity on all pre-loaded pre-computed umls embeddings
             assert self._umls_embeddings is not None
             similarities = torch.matmul(entity_embeddings, self._umls_embeddings.T)
+            all_matches_scores, all_matches_indices = torch.topk(
+                similarities, k=self.max_nb_matches
+            )
 
-        all_matches_scores, all_matches_indices = torch.topk(
-            similarities, k=self.max_nb_matches
-        )
         # round scores to avoid floating point precision errors and get
         # 1.0 for exact matches instead of values slightly above or below
         all_matches_scores = torch.round(all_matches_scores, decimals=4)
         return all_matches_indices.tolist(), all_matches_scores.tolist()
 
+    def _find_best_matches_by_block(
+        self, entity_embeddings: torch.Tensor
+    ) -> Tuple[torch.Tensor, torch.Tensor]:
+        assert self._umls_embeddings_store is not None
+        torch_device = "cpu" if self.device < 0 else f"cuda:{self.device}"
+        block_size = self.nb_umls_embeddings_chunks * _UMLS_EMBEDDINGS_CHUNK_SIZE
+
+        best_scores = None
+        best_indices = None
+        for start in range(0, len(self._umls_embeddings_store), block_size):
+            umls_embeddings = torch.from_numpy(
+                np.array(
+                    self._umls_embeddings_store[start : start + block_size],
+                    dtype=np.float32,
+                )
+            ).to(torch_device)
+            similarities = torch.matmul(entity_embeddings, umls_embeddings.T)
+            scores, indices = torch.topk(
+                similarities, k=min(self.max_nb_matches, len(umls_embeddings))
+            )
+            indices += start
+            if best_scores is not None:
+                scores = torch.cat([best_scores, scores], dim=1)
+                indices = torch.cat([best_indices, indices], dim=1)
+                scores, positions = torch.topk(
+                    scores, k=min(self.max_nb_matches, scores.shape[1])
+                )
+                indices = torch.gather(indices, 1, positions)
+            best_scores = scores
+            best_indices = indices
+        return best_scores, best_indices
+
     def _load_umls_embeddings(self, files: List[Path]) -> torch.Tensor:
         torch_device = "cpu" if self.device < 0 else f"cuda:{self.device}"
         umls_embeddings = torch.cat(
@@ -264,6 +486,63 @@ class UMLSCoderNormalizer(Operation):
         )
         return umls_embeddings
 
+    def _load_umls_embeddings_store(self) -> np.ndarray:
+        """
+        Return a memory-mapped array of all pre-computed umls embeddings,
+        creating it from the embeddings chunk files if it doesn't exist yet
+        """
+
+        store_file = self.embeddings_cache_dir / _EMBEDDINGS_STORE_FILENAME.format(
+            dtype=self.umls_embeddings_dtype
+        )
+        if not store_file.exists():
+            umls_embeddings_files = sorted(
+                self.embeddings_cache_dir.glob(f"*{_UMLS_EMBEDDINGS_FILE_EXT}")
+            )
+            # 1st pass to get the shape of the array, 2d pass to fill it, so
+            # that all chunks don't have to be held in memory at once
+            nb_embeddings = 0
+            for file in umls_embeddings_files:
+                chunk_embeddings = torch.load(file, map_location="cpu")
+                nb_embeddings += chunk_embeddings.shape[0]
+            dim = chunk_embeddings.shape[1]
+
+            tmp_store_file = store_file.with_suffix(".tmp")
+            store = np.lib.format.open_memmap(
+                tmp_store_file,
+                mode="w+",
+                dtype=self.umls_embeddings_dtype,
+                shape=(nb_embeddings, dim),
+            )
+            start = 0
+            for file in umls_embeddings_files:
+                chunk_embeddings = torch.load(file, map_location="cpu").numpy()
+                store[start : start + len(chunk_embeddings)] = chunk_embeddings
+                start += len(chunk_embeddings)
+            store.flush()
+            del store
+            tmp_store_file.rename(store_file)
+
+        return np.load(store_file, mmap_mode="r")
+
+    def _load_ivf_index(self) -> IVFIndex:
+        """
+        Load the approximate nearest neighbour index of the umls embeddings,
+        building it if it doesn't exist yet
+        """
+
+        index_file = self.embeddings_cache_dir / _IVF_INDEX_FILENAME.format(
+            nb_lists=self.ann_nb_lists
+        )
+        if index_file.exists():
+            return IVFIndex.load(index_file)
+
+        index = IVFIndex.build(self._umls_embeddings_store, nb_lists=self.ann_nb_lists)
+        tmp_index_file = index_file.with_suffix(".tmp")
+        index.save(tmp_index_file)
+        tmp_index_file.rename(index_file)
+        return index
+
     def _normalize_entity(
         self, entity: Entity, match_indices: List[int], match_scores: List[float]
     ):
@@ -321,11 +600,17 @@ class UMLSCoderNormalizer(Operation):
 
         self.embeddings_cache_dir.mkdir(exist_ok=True)
 
-        # remove all previous embedding files for safety
-        [
-            f.unlink()
-            for f in self.embeddings_cache_dir.glob(f"*{_UMLS_EMBEDDINGS_FILE_EXT}")
-        ]
+        # remove all previous embedding files for safety (including memory-mapped
+        # embeddings, indices and cached matches derived from them)
+        patterns = (
+            f"*{_UMLS_EMBEDDINGS_FILE_EXT}",
+            "*.npy",
+            "*.npz",
+            f"{_RESULTS_CACHE_FILENAME}*",
+        )
+        for pattern in patterns:
+            for f in self.embeddings_cache_dir.glob(pattern):
+                f.unlink()
 
         # get iterator to all UMLS entries
         entries_iter = load_umls_entries(
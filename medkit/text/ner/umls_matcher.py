@@ -4,10 +4,14 @@ __all__ = ["UMLSMatcher"]
 
 import dataclasses
 import logging
+import math
+import multiprocessing
 from pathlib import Path
-from typing import Dict, Iterator, List, Optional, Sequence, Set, Union
+import time
+from typing import Dict, List, Optional, Sequence, Tuple, Union
 from typing_extensions import Literal
 
+from tqdm import tqdm
 import yaml
 
 from medkit.text.ner import umls_utils
@@ -15,13 +19,19 @@ from medkit.text.ner._base_simstring_matcher import (
     BaseSimstringMatcher,
     BaseSimstringMatcherRule,
     BaseSimstringMatcherNormalization,
-    build_simstring_matcher_databases,
+    get_simstring_term,
+    write_simstring_matcher_databases,
 )
 
 _CACHE_PARAMS_FILENAME = "params.yml"
 _RULES_DB_FILENAME = "rules"
 _SIMSTRING_DB_FILENAME = "simstring"
 
+_DEFAULT_SEMGROUPS = ("ANAT", "CHEM", "DEVI", "DISO", "PHYS", "PROC")
+# approximate size of the chunks of the MRCONSO.RRF file processed at a time
+# when building the database
+_BUILD_CHUNK_SIZE = 16 * 2**20
+
 _SPACY_LANGUAGE_MAP = {
     "ENG": "en",
     "GER": "de",
@@ -45,6 +55,10 @@ class _UMLSMatcherCacheParams:
     normalize_unicode: bool
 
 
+# state of worker processes building the database (cf UMLSMatcher.build_database)
+_worker_build_args: Optional[Tuple[Path, _UMLSMatcherCacheParams, Dict]] = None
+
+
 class UMLSMatcher(BaseSimstringMatcher):
     """
     Entity annotator identifying UMLS concepts using the `simstring` fuzzy
@@ -67,7 +81,7 @@ class UMLSMatcher(BaseSimstringMatcher):
 
     def __init__(
         self,
-        umls_dir: Union[str, Path],
+        umls_dir: Optional[Union[str, Path]],
         cache_dir: Union[str, Path],
         language: str,
         threshold: float = 0.9,
@@ -77,18 +91,14 @@ class UMLSMatcher(BaseSimstringMatcher):
         lowercase: bool = True,
         normalize_unicode: bool = False,
         spacy_tokenization: bool = False,
-        semgroups: Optional[Sequence[str]] = (
-            "ANAT",
-            "CHEM",
-            "DEVI",
-            "DISO",
-            "PHYS",
-            "PROC",
-        ),
+        semgroups: Optional[Sequence[str]] = _DEFAULT_SEMGROUPS,
         blacklist: Optional[List[str]] = None,
         same_beginning: bool = False,
         output_labels_by_semgroup: Optional[Union[str, Dict[str, str]]] = None,
         attrs_to_copy: Optional[List[str]] = None,
+        candidate_cache_size: Optional[int] = 100_000,
+        rules_in_memory: bool = False,
+        n_workers: int = 1,
         name: Optional[str] = None,
         uid: Optional[str] = None,
     ):
@@ -97,7 +107,8 @@ class UMLSMatcher(BaseSimstringMatcher):
         ----------
         umls_dir:
             Path to the UMLS directory containing the MRCONSO.RRF and
-            MRSTY.RRF files.
+            MRSTY.RRF files. Can be `None` if the database has already been
+            built in `cache_dir` (for instance with :meth:`~.build_database`).
         cache_dir:
             Path to the directory into which the umls database will be cached.
             If it doesn't exist yet, the database will be automatically
@@ -106,7 +117,8 @@ class UMLSMatcher(BaseSimstringMatcher):
             be done to make sure the params used when the database was generated
             are consistent with the params of the current instance. If you want
             to rebuild the database with new params using the same cache dir,
-            you will have to manually delete it first.
+            you will have to manually delete it first. The cache dir does not
+            reference `umls_dir` and can be moved or copied elsewhere.
         language:
             Language to consider as found in the MRCONSO.RRF file. Example:
             `"FRE"`. Will trigger a regeneration of the database if changed.
@@ -158,44 +170,44 @@ class UMLSMatcher(BaseSimstringMatcher):
             Labels of the attributes that should be copied from the source
             segment to the created entity. Useful for propagating context
             attributes (negation, antecedent, etc)
+        candidate_cache_size:
+            Maximum number of candidate texts for which the matched rules and
+            similarity scores are kept in memory, so that candidates occurring
+            several times are looked up only once. If `None`, the cache is
+            unbounded, if 0, nothing is cached.
+        rules_in_memory:
+            Whether to load the whole rules database in memory rather than
+            reading rules from the database file when they are needed.
+        n_workers:
+            Number of worker processes used to match segments in parallel (cf
+            :class:`~medkit.text.ner._base_simstring_matcher.BaseSimstringMatcher`).
+            The pool of processes is kept until :meth:`~.close` is called. Also
+            used to build the database if it doesn't exist yet.
         name:
             Name describing the matcher (defaults to the class name).
         uid:
             Identifier of the matcher.
         """
 
-        umls_dir = Path(umls_dir)
         cache_dir = Path(cache_dir)
-
-        # check that values of semgroups are valid semgroup ids
-        if semgroups is not None:
-            for semgroup in semgroups:
-                if semgroup not in umls_utils.SEMGROUPS:
-                    raise ValueError(
-                        f"Unknown semgroup: {semgroup}. Should be one of"
-                        f" {umls_utils.SEMGROUPS}"
-                    )
-
-        cache_dir.mkdir(parents=True, exist_ok=True)
-
-        labels_by_semgroup = self._get_labels_by_semgroup(output_labels_by_semgroup)
-
-        cache_params = _UMLSMatcherCacheParams(
-            umls_version=umls_utils.guess_umls_version(umls_dir),
-            language=language,
-            semgroups=list(semgroups),
-            labels_by_semgroup=labels_by_semgroup,
-            lowercase=lowercase,
-            normalize_unicode=normalize_unicode,
-        )
-
         cache_params_file = cache_dir / _CACHE_PARAMS_FILENAME
         simstring_db_file = cache_dir / _SIMSTRING_DB_FILENAME
         rules_db_file = cache_dir / _RULES_DB_FILENAME
 
         if cache_params_file.exists():
-            with open(cache_params_file) as fp:
-                existing_cache_params = _UMLSMatcherCacheParams(**yaml.safe_load(fp))
+            existing_cache_params = _load_cache_params(cache_params_file)
+            if umls_dir is not None:
+                umls_version = umls_utils.guess_umls_version(umls_dir)
+            else:
+                umls_version = existing_cache_params.umls_version
+            cache_params = self._get_cache_params(
+                umls_version,
+                language,
+                lowercase,
+                normalize_unicode,
+                semgroups,
+                output_labels_by_semgroup,
+            )
             if cache_params != existing_cache_params:
                 raise Exception(
                     f"Cache directory {cache_dir} contains database pre-computed"
@@ -203,23 +215,22 @@ class UMLSMatcher(BaseSimstringMatcher):
                     f" {cache_params}"
                 )
         else:
-            logger.info(
-                "Building simstring database from UMLS terms, this may take a while"
-            )
-            rules = self._build_rules(
+            if umls_dir is None:
+                raise ValueError(
+                    f"No database found in cache directory {cache_dir}, umls_dir"
+                    " must be provided to build it"
+                )
+            self.build_database(
                 umls_dir,
+                cache_dir,
                 language,
-                lowercase,
-                normalize_unicode,
-                set(semgroups),
-                labels_by_semgroup,
+                lowercase=lowercase,
+                normalize_unicode=normalize_unicode,
+                semgroups=semgroups,
+                output_labels_by_semgroup=output_labels_by_semgroup,
+                n_workers=n_workers,
             )
 
-            build_simstring_matcher_databases(simstring_db_file, rules_db_file, rules)
-
-            with open(cache_params_file, mode="w") as fp:
-                yaml.safe_dump(dataclasses.asdict(cache_params), fp)
-
         if spacy_tokenization:
             spacy_tokenization_language = _SPACY_LANGUAGE_MAP.get(language)
             if spacy_tokenization_language is None:
@@ -241,10 +252,184 @@ class UMLSMatcher(BaseSimstringMatcher):
             blacklist=blacklist,
             same_beginning=same_beginning,
             attrs_to_copy=attrs_to_copy,
+            candidate_cache_size=candidate_cache_size,
+            rules_in_memory=rules_in_memory,
+            n_workers=n_workers,
             name=name,
             uid=uid,
         )
 
+    @classmethod
+    def build_database(
+        cls,
+        umls_dir: Union[str, Path],
+        cache_dir: Union[str, Path],
+        language: str,
+        lowercase: bool = True,
+        normalize_unicode: bool = False,
+        semgroups: Optional[Sequence[str]] = _DEFAULT_SEMGROUPS,
+        output_labels_by_semgroup: Optional[Union[str, Dict[str, str]]] = None,
+        n_workers: int = 1,
+        show_progress: bool = True,
+    ) -> Dict[str, float]:
+        """
+        Build the database used by the matcher from UMLS files and store it in
+        `cache_dir`, replacing any database already there.
+
+        This is what is done when instantiating a matcher with a cache dir that
+        doesn't exist yet, but it can be done ahead of time (for instance
+        before deploying an application) with several processes. The cache dir
+        can then be moved or copied, and a matcher can be instantiated from it
+        with the same params and `umls_dir=None`.
+
+        Parameters
+        ----------
+        umls_dir:
+            Path to the UMLS directory containing the MRCONSO.RRF and
+            MRSTY.RRF files.
+        cache_dir:
+            Path to the directory into which the database will be stored.
+        language:
+            Language to consider as found in the MRCONSO.RRF file.
+        lowercase:
+            Whether to use lowercased versions of UMLS terms (cf
+            :class:`~.UMLSMatcher`).
+        normalize_unicode:
+            Whether to use ASCII-only versions of UMLS terms (cf
+            :class:`~.UMLSMatcher`).
+        semgroups:
+            Ids of UMLS semantic groups that matched concepts should belong to
+            (cf :class:`~.UMLSMatcher`).
+        output_labels_by_semgroup:
+            Labels to use for each semantic group (cf :class:`~.UMLSMatcher`).
+        n_workers:
+            Number of worker processes used to parse the MRCONSO.RRF file and
+            build the rules. The file is split into chunks of lines processed
+            in parallel, the resulting database is the same as when using a
+            single process.
+        show_progress:
+            Whether to show a progress bar
+
+        Returns
+        -------
+        Dict[str, float]
+            Time spent in each phase of the build, in seconds: `"load_semtypes"`
+            (loading MRSTY.RRF), `"build_rules"` (parsing MRCONSO.RRF and
+            preprocessing terms) and `"write_databases"`
+        """
+
+        umls_dir = Path(umls_dir)
+        cache_dir = Path(cache_dir)
+        cache_params = cls._get_cache_params(
+            umls_utils.guess_umls_version(umls_dir),
+            language,
+            lowercase,
+            normalize_unicode,
+            semgroups,
+            output_labels_by_semgroup,
+        )
+
+        logger.info(
+            "Building simstring database from UMLS terms, this may take a while"
+        )
+        timings = {}
+
+        start_time = time.perf_counter()
+        semtypes_by_cui = umls_utils.load_semtypes_by_cui(umls_dir / "MRSTY.RRF")
+        timings["load_semtypes"] = time.perf_counter() - start_time
+
+        start_time = time.perf_counter()
+        mrconso_file = umls_dir / "MRCONSO.RRF"
+        file_size = mrconso_file.stat().st_size
+        nb_ranges = max(math.ceil(file_size / _BUILD_CHUNK_SIZE), n_workers * 4)
+        byte_ranges = umls_utils._get_line_ranges(mrconso_file, nb_ranges)
+        build_args = (mrconso_file, cache_params, semtypes_by_cui)
+
+        if n_workers > 1:
+            pool = multiprocessing.Pool(
+                n_workers, initializer=_init_build_worker, initargs=build_args
+            )
+            rules_by_range = pool.imap(_build_rules_in_worker, byte_ranges)
+        else:
+            pool = None
+            rules_by_range = (
+                _build_rules_in_range(*build_args, byte_range)
+                for byte_range in byte_ranges
+            )
+
+        if show_progress:
+            progress_bar = tqdm(
+                total=file_size, unit="B", unit_scale=True, unit_divisor=1024
+            )
+
+        # ranges are processed in order, so keeping the 1st rule of each LUI
+        # gives the same rules as when reading the file sequentially
+        luis_seen = set()
+        rules_by_term: Dict[str, List[BaseSimstringMatcherRule]] = {}
+        try:
+            for (start, end), range_rules in zip(byte_ranges, rules_by_range):
+                for lui, simstring_term, rule in range_rules:
+                    if lui not in luis_seen:
+                        luis_seen.add(lui)
+                        if rule is not None:
+                            rules_by_term.setdefault(simstring_term, []).append(rule)
+                if show_progress:
+                    progress_bar.update(end - start)
+        finally:
+            if pool is not None:
+                pool.terminate()
+            if show_progress:
+                progress_bar.close()
+        timings["build_rules"] = time.perf_counter() - start_time
+
+        start_time = time.perf_counter()
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        cache_params_file = cache_dir / _CACHE_PARAMS_FILENAME
+        # remove params first so that an interrupted build isn't considered done
+        cache_params_file.unlink(missing_ok=True)
+        write_simstring_matcher_databases(
+            cache_dir / _SIMSTRING_DB_FILENAME,
+            cache_dir / _RULES_DB_FILENAME,
+            rules_by_term,
+        )
+        with open(cache_params_file, mode="w") as fp:
+            yaml.safe_dump(dataclasses.asdict(cache_params), fp)
+        timings["write_databases"] = time.perf_counter() - start_time
+
+        for phase, duration in timings.items():
+            logger.info(f"UMLS database build phase '{phase}' took {duration:.1f}s")
+        return timings
+
+    @classmethod
+    def _get_cache_params(
+        cls,
+        umls_version: str,
+        language: str,
+        lowercase: bool,
+        normalize_unicode: bool,
+        semgroups: Optional[Sequence[str]],
+        output_labels_by_semgroup: Union[None, str, Dict[str, str]],
+    ) -> _UMLSMatcherCacheParams:
+        """Check and gather the params used to build the database"""
+
+        # check that values of semgroups are valid semgroup ids
+        if semgroups is not None:
+            for semgroup in semgroups:
+                if semgroup not in umls_utils.SEMGROUPS:
+                    raise ValueError(
+                        f"Unknown semgroup: {semgroup}. Should be one of"
+                        f" {umls_utils.SEMGROUPS}"
+                    )
+
+        return _UMLSMatcherCacheParams(
+            umls_version=umls_version,
+            language=language,
+            semgroups=list(semgroups) if semgroups is not None else None,
+            labels_by_semgroup=cls._get_labels_by_semgroup(output_labels_by_semgroup),
+            lowercase=lowercase,
+            normalize_unicode=normalize_unicode,
+        )
+
     @classmethod
     def _get_labels_by_semgroup(
         cls, output_labels: Union[None, str, Dict[str, str]]
@@ -281,69 +466,95 @@ class UMLSMatcher(BaseSimstringMatcher):
         label_mapping.update(output_labels)
         return label_mapping
 
-    @classmethod
-    def _build_rules(
-        cls,
-        umls_dir: Path,
-        language: str,
-        lowercase: bool,
-        normalize_unicode: bool,
-        semgroups: Optional[Set[str]],
-        labels_by_semgroup: Dict[str, str],
-    ) -> Iterator[BaseSimstringMatcherRule]:
-        """
-        Create rules for all UMLS entries (filtered by `language` and
-        `semgroups`) with appropriate labels (based on `labels_by_semgroup`)
-        """
 
-        # get iterator to all UMLS entries
-        entries_iter = umls_utils.load_umls_entries(
-            mrconso_file=umls_dir / "MRCONSO.RRF",
-            mrsty_file=umls_dir / "MRSTY.RRF",
-            languages=[language],
-            show_progress=True,
-        )
+def _load_cache_params(cache_params_file: Path) -> _UMLSMatcherCacheParams:
+    with open(cache_params_file) as fp:
+        return _UMLSMatcherCacheParams(**yaml.safe_load(fp))
 
-        version = umls_utils.guess_umls_version(umls_dir)
 
-        for entry in entries_iter:
-            # filter out entries not belonging to allowed semgroups
-            entry_semgroups = entry.semgroups
-            if semgroups is not None:
-                entry_semgroups = [s for s in entry_semgroups if s in semgroups]
-                if len(entry_semgroups) == 0:
-                    continue
+def _init_build_worker(
+    mrconso_file: Path,
+    cache_params: _UMLSMatcherCacheParams,
+    semtypes_by_cui: Dict[str, List[str]],
+):
+    global _worker_build_args
+    _worker_build_args = (mrconso_file, cache_params, semtypes_by_cui)
 
-            # take label corresponding to semgroup (1st semgroup if multiple)
-            semgroup = entry_semgroups[0]
-            label = labels_by_semgroup[semgroup]
 
-            norm = BaseSimstringMatcherNormalization(
-                kb_name="umls", kb_version=version, kb_id=entry.cui, term=entry.term
-            )
+def _build_rules_in_worker(
+    byte_range: Tuple[int, int],
+) -> List[Tuple[str, Optional[str], Optional[BaseSimstringMatcherRule]]]:
+    assert _worker_build_args is not None
+    return _build_rules_in_range(*_worker_build_args, byte_range)
 
-            # acronym detection
-            acronym = umls_utils.preprocess_acronym(entry.term)
-            if acronym is not None:
-                term = acronym
-            else:
-                # perform UMLS-specific cleaning (lowercase and normalize unicode
-                # will be handled by BaseSimstringMatcher)
-                term = umls_utils.preprocess_term_to_match(
-                    entry.term,
-                    lowercase=False,
-                    normalize_unicode=False,
-                )
 
-            # keep case sensitivity for terms that are all uppercase to avoid
-            # too many false positives
-            case_sensitive = True if term.isupper() else not lowercase
+def _build_rules_in_range(
+    mrconso_file: Path,
+    cache_params: _UMLSMatcherCacheParams,
+    semtypes_by_cui: Dict[str, List[str]],
+    byte_range: Tuple[int, int],
+) -> List[Tuple[str, Optional[str], Optional[BaseSimstringMatcherRule]]]:
+    """
+    Create rules for the UMLS entries in a byte range of the MRCONSO.RRF file
+    (filtered by language and semgroups) with appropriate labels.
+
+    Returns the LUI of each entry with the term to insert in the simstring
+    database and the rule, or with `None` values if the entry was filtered out
+    because of its semgroups (the LUI must still be marked as seen).
+    """
+
+    start, end = byte_range
+    rows = umls_utils._load_umls_rows(
+        mrconso_file, start, end, languages=[cache_params.language]
+    )
+    semgroups_by_semtype = umls_utils.load_semgroups_by_semtype()
+    allowed_semgroups = (
+        set(cache_params.semgroups) if cache_params.semgroups is not None else None
+    )
+
+    rules = []
+    for lui, cui, term in rows:
+        # filter out entries not belonging to allowed semgroups
+        entry_semgroups = [
+            semgroups_by_semtype[semtype] for semtype in semtypes_by_cui.get(cui, [])
+        ]
+        if allowed_semgroups is not None:
+            entry_semgroups = [s for s in entry_semgroups if s in allowed_semgroups]
+        if len(entry_semgroups) == 0:
+            rules.append((lui, None, None))
+            continue
+
+        # take label corresponding to semgroup (1st semgroup if multiple)
+        semgroup = entry_semgroups[0]
+        label = cache_params.labels_by_semgroup[semgroup]
+
+        norm = BaseSimstringMatcherNormalization(
+            kb_name="umls", kb_version=cache_params.umls_version, kb_id=cui, term=term
+        )
 
-            rule = BaseSimstringMatcherRule(
-                term=term,
-                label=label,
-                case_sensitive=case_sensitive,
-                unicode_sensitive=not normalize_unicode,
-                normalizations=[norm],
+        # acronym detection
+        acronym = umls_utils.preprocess_acronym(term)
+        if acronym is not None:
+            term_to_match = acronym
+        else:
+            # perform UMLS-specific cleaning (lowercase and normalize unicode
+            # will be handled by BaseSimstringMatcher)
+            term_to_match = umls_utils.preprocess_term_to_match(
+                term,
+                lowercase=False,
+                normalize_unicode=False,
             )
-            yield rule
+
+        # keep case sensitivity for terms that are all uppercase to avoid
+        # too many false positives
+        case_sensitive = True if term_to_match.isupper() else not cache_params.lowercase
+
+        rule = BaseSimstringMatcherRule(
+            term=term_to_match,
+            label=label,
+            case_sensitive=case_sensitive,
+            unicode_sensitive=not cache_params.normalize_unicode,
+            normalizations=[norm],
+        )
+        rules.append((lui, get_simstring_term(term_to_match), rule))
+    return rules
@@ -12,7 +12,7 @@ __all__ = [
 from collections import defaultdict
 import dataclasses
 from pathlib import Path
-from typing import Dict, Iterator, List, Optional, Union
+from typing import Dict, Iterator, List, Optional, Tuple, Union
 from tqdm import tqdm
 import re
 
@@ -168,6 +168,69 @@ def load_umls_entries(
         progress_bar.close()
 
 
+def _get_line_ranges(file: Path, nb_ranges: int) -> List[Tuple[int, int]]:
+    """
+    Split a file into at most `nb_ranges` byte ranges of similar sizes, each
+    range starting at the beginning of a line
+    """
+
+    file_size = file.stat().st_size
+    starts = [0]
+    with open(file, mode="rb") as fp:
+        for i in range(1, nb_ranges):
+            # move to the beginning of the 1st line after the approximate offset
+            fp.seek(max(file_size * i // nb_ranges - 1, starts[-1]))
+            fp.readline()
+            start = fp.tell()
+            if start >= file_size:
+                break
+            if start > starts[-1]:
+                starts.append(start)
+    ends = starts[1:] + [file_size]
+    return list(zip(starts, ends))
+
+
+def _load_umls_rows(
+    mrconso_file: Path,
+    start: int,
+    end: int,
+    sources: Optional[List[str]] = None,
+    languages: Optional[List[str]] = None,
+) -> List[Tuple[str, str, str]]:
+    """
+    Return the LUI, CUI and term of the lines of a MRCONSO.RRF file in the
+    byte range `start`-`end`, filtered like in :func:`~.load_umls_entries`
+    (only the 1st line of each LUI in the range is kept)
+    """
+
+    with open(mrconso_file, mode="rb") as fp:
+        fp.seek(start)
+        data = fp.read(end - start).decode("utf-8")
+
+    rows = []
+    luis_seen = set()
+    for line in data.split("\n"):
+        if not line:
+            continue
+        row = line.strip().split("|")
+        cui = row[0]
+        language = row[1]
+        lui = row[3]
+        source = row[11]
+        term = row[14]
+
+        if sources is not None and source not in sources:
+            continue
+        if languages is not None and language not in languages:
+            continue
+        if lui in luis_seen:
+            continue
+
+        luis_seen.add(lui)
+        rows.append((lui, cui, term))
+    return rows
+
+
 def load_semtypes_by_cui(mrsty_file: Union[str, Path]) -> Dict[str, List[str]]:
     """
     Load the list of semtypes associated to each CUI found in a MRSTY.RRF file
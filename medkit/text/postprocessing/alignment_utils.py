@@ -1,14 +1,14 @@
 __all__ = ["compute_nested_segments"]
 from typing import Tuple, List
-from intervaltree import IntervalTree
 
-from medkit.core.text import Segment, span_utils
+from medkit.core.text import Segment
+from medkit.core.text._span_index import SpanIndex
 
 
-def _create_segments_tree(
+def _create_segments_index(
     target_segments: List[Segment],
-) -> IntervalTree:
-    """Use the normalized spans of the segments to create an interval tree
+) -> SpanIndex[Segment]:
+    """Use the normalized spans of the segments to create an interval index
 
     Parameters
     ----------
@@ -17,21 +17,15 @@ def _create_segments_tree(
 
     Returns
     -------
-    IntervalTree
-        Interval tree from the target segments"""
-    tree = IntervalTree()
+    SpanIndex
+        Interval index of the target segments"""
+    index = SpanIndex()
     for segment in target_segments:
-        normalized_spans = span_utils.normalize_spans(segment.spans)
-
-        if not normalized_spans:
-            continue
-
-        tree.addi(
-            normalized_spans[0].start,
-            normalized_spans[-1].end,
-            data=segment,
-        )
-    return tree
+        original_range = segment.original_range
+        if original_range is not None:
+            start, end = original_range
+            index.add_range(start, end, segment)
+    return index
 
 
 def compute_nested_segments(
@@ -39,6 +33,8 @@ def compute_nested_segments(
 ) -> List[Tuple[Segment, List[Segment]]]:
     """Return source segments aligned with its nested segments.
 
+    Nested segments are returned in order of position in the original text.
+
     Parameters
     ----------
     source_segments:
@@ -51,15 +47,15 @@ def compute_nested_segments(
     List[Tuple[~medkit.core.text.Segment,List[~medkit.core.text.Segment]]]:
         List of aligned segments
     """
-    tree = _create_segments_tree(target_segments)
+    index = _create_segments_index(target_segments)
     nested = []
     for parent in source_segments:
-        normalized_spans = span_utils.normalize_spans(parent.spans)
+        original_range = parent.original_range
 
-        if not normalized_spans:
+        if original_range is None:
             continue
 
-        start, end = normalized_spans[0].start, normalized_spans[-1].end
-        children = [child.data for child in tree.overlap(start, end)]
+        start, end = original_range
+        children = index.get_overlapping(start, end)
         nested.append((parent, children))
     return nested
@@ -1,7 +1,8 @@
 __all__ = ["filter_overlapping_entities"]
 
+import bisect
 from typing import List
-from medkit.core.text import Entity, span_utils
+from medkit.core.text import Entity
 
 
 def filter_overlapping_entities(entities: List[Entity]) -> List[Entity]:
@@ -9,6 +10,9 @@ def filter_overlapping_entities(entities: List[Entity]) -> List[Entity]:
     useful for the creation of data for named entity recognition, where
     a part of text can only contain one entity per 'word'.
     When an overlap is detected, the longest entity is preferred.
+    Entities whose spans don't cover any part of the original text can't
+    overlap with other entities, they are always kept (after the other
+    entities).
 
     Parameters
     ----------
@@ -20,25 +24,36 @@ def filter_overlapping_entities(entities: List[Entity]) -> List[Entity]:
     List[Entity]
         Filtered entities
     """
-    # concat normalize spans and entities to keep the relation after sorting
-    spans_data = [(span_utils.normalize_spans(ent.spans), ent) for ent in entities]
+    # concat ranges of normalized spans and entities to keep the relation
+    # after sorting
+    ranges_data = [(ent.original_range, ent) for ent in entities]
+    entities_without_range = [ent for r, ent in ranges_data if r is None]
+    ranges_data = [(r, ent) for r, ent in ranges_data if r is not None]
     # sort by length and start of normalized spans, descending order
     # the longest is preferred
-    sorted_spans = sorted(
-        spans_data,
-        key=lambda span: (
-            span[0][-1].end - span[0][0].start,
-            span[0][0].start,
+    sorted_ranges = sorted(
+        ranges_data,
+        key=lambda range_data: (
+            range_data[0][1] - range_data[0][0],
+            range_data[0][0],
         ),
         reverse=True,
     )
-    seen_chars = set()
+    # ranges of the entities kept so far, which never overlap, sorted by start
+    seen_starts: List[int] = []
+    seen_ends: List[int] = []
+
+    def is_seen(position: int) -> bool:
+        i = bisect.bisect_right(seen_starts, position) - 1
+        return i >= 0 and position < seen_ends[i]
+
     filtered_entities = []
-    for span, ent in sorted_spans:
-        span_start = span[0].start
-        span_end = span[-1].end
-        if span_start not in seen_chars and span_end not in seen_chars:
-            seen_chars.update(range(span_start, span_end))
+    for (range_start, range_end), ent in sorted_ranges:
+        if not is_seen(range_start) and not is_seen(range_end):
             filtered_entities.append(ent)
-    filtered_entities = sorted(filtered_entities, key=lambda ent: ent.spans[0].start)
-    return filtered_entities
+            if range_start < range_end:
+                i = bisect.bisect_right(seen_starts, range_start)
+                seen_starts.insert(i, range_start)
+                seen_ends.insert(i, range_end)
+    filtered_entities = sorted(filtered_entities, key=lambda ent: ent.original_range[0])
+    return filtered_entities + entities_without_range
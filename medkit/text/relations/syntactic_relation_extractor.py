@@ -45,6 +45,8 @@ class SyntacticRelationExtractor(DocOperation):
         relation_label: str = _DEFAULT_LABEL,
         entities_source: Optional[List[str]] = None,
         entities_target: Optional[List[str]] = None,
+        batch_size: int = 128,
+        n_process: int = 1,
         name: Optional[str] = None,
         uid: Optional[str] = None,
     ):
@@ -65,6 +67,12 @@ class SyntacticRelationExtractor(DocOperation):
         entities_target: List[str]
             Labels of medkit entities to use as target of the relation.
             If `None`, any entity can be used as target.
+        batch_size:
+            Number of documents parsed at once by the spacy pipeline
+            (passed to `nlp.pipe()`)
+        n_process:
+            Number of processes used by the spacy pipeline (passed to
+            `nlp.pipe()`)
         name:
             Name describing the relation extractor (defaults to the class name)
         uid:
@@ -93,6 +101,8 @@ class SyntacticRelationExtractor(DocOperation):
         self.entities_source = entities_source
         self.entities_target = entities_target
         self.relation_label = relation_label
+        self.batch_size = batch_size
+        self.n_process = n_process
         # entities transferred to the equivalent spacy doc
         if self.entities_source and self.entities_target:
             self._entities_labels = self.entities_source + self.entities_target
@@ -108,17 +118,28 @@ class SyntacticRelationExtractor(DocOperation):
             List of text documents in which relations are to be found
 
         """
-        for medkit_doc in documents:
-            # build spacy doc using selected entities
-            spacy_doc = spacy_utils.build_spacy_doc_from_medkit_doc(
+        # build spacy docs using selected entities
+        spacy_docs = (
+            spacy_utils.build_spacy_doc_from_medkit_doc(
                 nlp=self._nlp,
                 medkit_doc=medkit_doc,
                 labels_anns=self._entities_labels,
                 attrs=[],
                 include_medkit_info=True,
             )
-            # apply nlp spacy to include dependency tag
-            spacy_doc = self._nlp(spacy_doc)
+            for medkit_doc in documents
+        )
+        # apply nlp spacy by batches to include dependency tag
+        # (docs are returned in the same order)
+        if self.n_process > 1:
+            # convert all docs before starting the processes, so that the spacy
+            # extensions defined during conversion also exist in the processes
+            spacy_docs = list(spacy_docs)
+        spacy_docs = self._nlp.pipe(
+            spacy_docs, batch_size=self.batch_size, n_process=self.n_process
+        )
+
+        for medkit_doc, spacy_doc in zip(documents, spacy_docs):
             relations = self._find_syntactic_relations(spacy_doc)
             self._add_relations_to_document(medkit_doc, relations)
 
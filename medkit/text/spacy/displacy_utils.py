@@ -87,7 +87,7 @@ def entities_to_displacy(
     ents_data = []
 
     for entity in entities:
-        normalized_spans = span_utils.normalize_spans(entity.spans)
+        normalized_spans = entity.normalized_spans
         # normalized spans can be empty if spans contained ModifiedSpan with no replaced_spans
         if not normalized_spans:
             continue
@@ -24,6 +24,8 @@ class SpacyDocPipeline(DocOperation):
         medkit_attribute_factories: Optional[
             Dict[str, Callable[[SpacySpan, str], Attribute]]
         ] = None,
+        batch_size: int = 128,
+        n_process: int = 1,
         name: Optional[str] = None,
         uid: Optional[str] = None,
     ):
@@ -57,6 +59,13 @@ class SpacyDocPipeline(DocOperation):
             medkit attributes. Factories will receive a spacy span and an an
             attribute label when called. The key in the mapping is the attribute
             label.
+        batch_size:
+            Number of documents processed at once by the spacy pipeline
+            (passed to `nlp.pipe()`)
+        n_process:
+            Number of processes used by the spacy pipeline (passed to
+            `nlp.pipe()`). The spacy extensions used by the pipeline must be
+            available in each process.
         name:
             Name describing the pipeline (defaults to the class name).
         uid:
@@ -75,6 +84,8 @@ class SpacyDocPipeline(DocOperation):
         self.spacy_span_groups = spacy_span_groups
         self.spacy_attrs = spacy_attrs
         self.medkit_attribute_factories = medkit_attribute_factories
+        self.batch_size = batch_size
+        self.n_process = n_process
 
     def run(self, medkit_docs: List[TextDocument]) -> None:
         """Run a spacy pipeline on a list of medkit documents.
@@ -89,18 +100,27 @@ class SpacyDocPipeline(DocOperation):
             List of TextDocuments on which to run the pipeline
         """
 
-        for medkit_doc in medkit_docs:
-            # build spacy doc
-            spacy_doc = spacy_utils.build_spacy_doc_from_medkit_doc(
+        # build spacy docs
+        spacy_docs = (
+            spacy_utils.build_spacy_doc_from_medkit_doc(
                 nlp=self.nlp,
                 medkit_doc=medkit_doc,
                 labels_anns=self.medkit_labels_anns,
                 attrs=self.medkit_attrs,
                 include_medkit_info=True,
             )
-            # apply nlp spacy
-            spacy_doc = self.nlp(spacy_doc)
+            for medkit_doc in medkit_docs
+        )
+        # apply nlp spacy by batches (docs are returned in the same order)
+        if self.n_process > 1:
+            # convert all docs before starting the processes, so that the spacy
+            # extensions defined during conversion also exist in the processes
+            spacy_docs = list(spacy_docs)
+        spacy_docs = self.nlp.pipe(
+            spacy_docs, batch_size=self.batch_size, n_process=self.n_process
+        )
 
+        for medkit_doc, spacy_doc in zip(medkit_docs, spacy_docs):
             # get new annotations and attributes
             raw_segment = medkit_doc.raw_segment
 
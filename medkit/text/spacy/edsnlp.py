@@ -321,6 +321,8 @@ class EDSNLPPipeline(SpacyPipeline):
         medkit_attribute_factories: Optional[
             Dict[str, Callable[[SpacySpan, str], Attribute]]
         ] = None,
+        batch_size: int = 128,
+        n_process: int = 1,
         name: Optional[str] = None,
         uid: Optional[str] = None,
     ):
@@ -346,6 +348,12 @@ class EDSNLPPipeline(SpacyPipeline):
             label.
             Pre-defined default factories are listed in
             :const:`~DEFAULT_ATTRIBUTE_FACTORIES`
+        batch_size:
+            Number of segments processed at once by the spacy pipeline
+            (passed to `nlp.pipe()`)
+        n_process:
+            Number of processes used by the spacy pipeline (passed to
+            `nlp.pipe()`)
         name:
             Name describing the pipeline (defaults to the class name).
         uid:
@@ -374,6 +382,8 @@ class EDSNLPPipeline(SpacyPipeline):
             spacy_span_groups=spacy_span_groups,
             spacy_attrs=spacy_attrs,
             medkit_attribute_factories=medkit_attribute_factories,
+            batch_size=batch_size,
+            n_process=n_process,
             name=name,
             uid=uid,
         )
@@ -395,6 +405,8 @@ class EDSNLPDocPipeline(SpacyDocPipeline):
         medkit_attribute_factories: Optional[
             Dict[str, Callable[[SpacySpan, str], Attribute]]
         ] = None,
+        batch_size: int = 128,
+        n_process: int = 1,
         name: Optional[str] = None,
         uid: Optional[str] = None,
     ):
@@ -429,6 +441,12 @@ class EDSNLPDocPipeline(SpacyDocPipeline):
             label.
             Pre-defined default factories are listed in
             :const:`~DEFAULT_ATTRIBUTE_FACTORIES`
+        batch_size:
+            Number of documents processed at once by the spacy pipeline
+            (passed to `nlp.pipe()`)
+        n_process:
+            Number of processes used by the spacy pipeline (passed to
+            `nlp.pipe()`)
         name:
             Name describing the pipeline (defaults to the class name).
         uid:
@@ -460,6 +478,8 @@ class EDSNLPDocPipeline(SpacyDocPipeline):
             spacy_span_groups=spacy_span_groups,
             spacy_attrs=spacy_attrs,
             medkit_attribute_factories=medkit_attribute_factories,
+            batch_size=batch_size,
+            n_process=n_process,
             name=name,
             uid=uid,
         )
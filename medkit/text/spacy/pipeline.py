@@ -22,6 +22,8 @@ class SpacyPipeline(Operation):
         medkit_attribute_factories: Optional[
             Dict[str, Callable[[SpacySpan, str], Attribute]]
         ] = None,
+        batch_size: int = 128,
+        n_process: int = 1,
         name: Optional[str] = None,
         uid: Optional[str] = None,
     ):
@@ -46,6 +48,13 @@ class SpacyPipeline(Operation):
             medkit attributes. Factories will receive a spacy span and an an
             attribute label when called. The key in the mapping is the attribute
             label.
+        batch_size:
+            Number of segments processed at once by the spacy pipeline
+            (passed to `nlp.pipe()`)
+        n_process:
+            Number of processes used by the spacy pipeline (passed to
+            `nlp.pipe()`). The spacy extensions used by the pipeline must be
+            available in each process.
         name:
             Name describing the pipeline (defaults to the class name).
         uid:
@@ -61,6 +70,8 @@ class SpacyPipeline(Operation):
         self.spacy_span_groups = spacy_span_groups
         self.spacy_attrs = spacy_attrs
         self.medkit_attribute_factories = medkit_attribute_factories
+        self.batch_size = batch_size
+        self.n_process = n_process
 
     def run(self, segments: List[Segment]) -> List[Segment]:
         """Run a spacy pipeline on a list of segments provided as input
@@ -79,21 +90,30 @@ class SpacyPipeline(Operation):
         List[Segments]:
             List of new annotations
         """
-        output_segments = []
-        for segment in segments:
-            # build spacy doc
-            # TODO: transfer of annotations and attributes attached to
-            # a segment are not currently supported, no anns are included
-            spacy_doc = spacy_utils.build_spacy_doc_from_medkit_segment(
+        # build spacy docs
+        # TODO: transfer of annotations and attributes attached to
+        # a segment are not currently supported, no anns are included
+        spacy_docs = (
+            spacy_utils.build_spacy_doc_from_medkit_segment(
                 nlp=self.nlp,
                 segment=segment,
                 annotations=[],
                 attrs=[],
                 include_medkit_info=True,
             )
-            # apply nlp spacy
-            spacy_doc = self.nlp(spacy_doc)
+            for segment in segments
+        )
+        # apply nlp spacy by batches (docs are returned in the same order)
+        if self.n_process > 1:
+            # convert all docs before starting the processes, so that the spacy
+            # extensions defined during conversion also exist in the processes
+            spacy_docs = list(spacy_docs)
+        spacy_docs = self.nlp.pipe(
+            spacy_docs, batch_size=self.batch_size, n_process=self.n_process
+        )
 
+        output_segments = []
+        for segment, spacy_doc in zip(segments, spacy_docs):
             new_segments = self._find_segments_in_spacy_doc(
                 spacy_doc=spacy_doc, medkit_source_ann=segment
             )
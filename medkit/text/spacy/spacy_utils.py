@@ -419,9 +419,9 @@ def _define_attrs_extensions(attrs_to_transfer: List[str]):
         _define_spacy_span_extension(attr)
 
 
-def _get_span_boundaries(spans: List[AnySpan]) -> Tuple[int, int]:
-    """Return boundaries (start,end) from a list of spans"""
-    spans_norm: List[Span] = span_utils.normalize_spans(spans)
+def _get_span_boundaries(segment: Segment) -> Tuple[int, int]:
+    """Return boundaries (start,end) of a segment"""
+    spans_norm: List[Span] = segment.normalized_spans
     start = spans_norm[0].start
     end = spans_norm[-1].end
 
@@ -429,7 +429,7 @@ def _get_span_boundaries(spans: List[AnySpan]) -> Tuple[int, int]:
         # Spacy does not allow discontinuous spans
         # for compatibility, get a continuous span from the list
         warnings.warn(
-            f"These spans {spans} are discontinuous, they were converted"
+            f"These spans {segment.spans} are discontinuous, they were converted"
             f" into its expanded version, from {start} to {end}."
         )
 
@@ -444,7 +444,7 @@ def _segment_to_spacy_span(
 ) -> Span:
     """Create a spacy span given a medkit segment."""
     # create a spacy span from characters in the text instead of tokens
-    start, end = _get_span_boundaries(medkit_segment.spans)
+    start, end = _get_span_boundaries(medkit_segment)
     label = medkit_segment.metadata.get("name", medkit_segment.label)
     span = spacy_doc_target.char_span(start, end, alignment_mode="expand", label=label)
 
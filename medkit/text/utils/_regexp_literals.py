@@ -0,0 +1,220 @@
+"""
+Helpers to quickly skip regexp rules that cannot match a text, by looking for
+literals that must be present in the text for a regexp to match
+"""
+
+__all__ = ["RulePrefilter", "get_required_literals", "fold_case"]
+
+import re
+from typing import Dict, List, Optional, Tuple
+
+# quantifier with braces (ex: "{2}", "{0,5}", "{,5}")
+_BRACES_QUANTIFIER_PATTERN = re.compile(r"\{(?:\d+,?\d*|,\d*)\}")
+# escaped letters corresponding to character classes or zero-width assertions
+_CLASS_OR_ASSERTION_ESCAPES = "dDwWsSbBAZ"
+
+# chars matched by other chars when ignoring case, but that are not converted
+# to the same lowercase char by str.lower()
+_CASE_FIXES = str.maketrans(
+    {
+        "İ": "i",
+        "ı": "i",
+        "ſ": "s",
+        "µ": "μ",
+        "ͅ": "ι",
+        "\u1fbe": "ι",
+        "ς": "σ",
+        "ϐ": "β",
+        "ϑ": "θ",
+        "ϕ": "φ",
+        "ϖ": "π",
+        "ϰ": "κ",
+        "ϱ": "ρ",
+        "ϵ": "ε",
+        "ᲀ": "в",
+        "ᲁ": "д",
+        "ᲂ": "о",
+        "ᲃ": "с",
+        "ᲄ": "т",
+        "ᲅ": "т",
+        "ᲆ": "ъ",
+        "ᲇ": "ѣ",
+        "ᲈ": "ꙋ",
+        "ẛ": "ṡ",
+    }
+)
+
+
+class RulePrefilter:
+    """
+    Index of the literals required by a list of regexp rules, used to find the
+    rules that may match a text without running their regexps.
+
+    The rules that may match a text are found with one scan of the text by a
+    pattern combining all literals (per case and unicode sensitivity), followed
+    by substring checks only if one of the literals was found.
+    """
+
+    def __init__(
+        self,
+        regexps: List[str],
+        case_sensitive: List[bool],
+        unicode_sensitive: List[bool],
+    ):
+        """
+        Parameters
+        ----------
+        regexps:
+            Regexps of the rules
+        case_sensitive:
+            Case sensitivity of each rule
+        unicode_sensitive:
+            Unicode sensitivity of each rule (rules that are not unicode-sensitive
+            are matched on the ASCII version of texts)
+        """
+        # rules for which no literal could be found, always returned
+        self._rule_indices_without_literals: List[int] = []
+        # rule indices by literal, for each case and unicode sensitivity
+        self._rule_indices_by_literal: Dict[
+            Tuple[bool, bool], Dict[str, List[int]]
+        ] = {}
+
+        for rule_index, regexp in enumerate(regexps):
+            literals = get_required_literals(regexp, case_sensitive[rule_index])
+            if literals is None:
+                self._rule_indices_without_literals.append(rule_index)
+                continue
+            key = (case_sensitive[rule_index], unicode_sensitive[rule_index])
+            rule_indices_by_literal = self._rule_indices_by_literal.setdefault(key, {})
+            for literal in literals:
+                rule_indices_by_literal.setdefault(literal, []).append(rule_index)
+
+        # pattern matching any of the literals, for each case and unicode sensitivity
+        self._literals_patterns = {
+            key: re.compile("|".join(re.escape(lit) for lit in rule_indices_by_literal))
+            for key, rule_indices_by_literal in self._rule_indices_by_literal.items()
+        }
+
+    def get_candidate_rules(self, text: str, text_ascii: Optional[str]) -> List[int]:
+        """
+        Return the indices (in increasing order) of the rules that may match
+        `text`, or `text_ascii` for rules that are not unicode-sensitive
+        """
+        if not self._literals_patterns:
+            return self._rule_indices_without_literals
+
+        rule_indices = set(self._rule_indices_without_literals)
+        for key, literals_pattern in self._literals_patterns.items():
+            case_sensitive, unicode_sensitive = key
+            text_to_check = text if unicode_sensitive else text_ascii
+            if not case_sensitive:
+                text_to_check = fold_case(text_to_check)
+            if literals_pattern.search(text_to_check) is None:
+                continue
+            for literal, literal_rule_indices in self._rule_indices_by_literal[
+                key
+            ].items():
+                if literal in text_to_check:
+                    rule_indices.update(literal_rule_indices)
+        return sorted(rule_indices)
+
+
+def get_required_literals(regexp: str, case_sensitive: bool) -> Optional[List[str]]:
+    """
+    Return literals of which at least one is contained in any match of `regexp`
+    (one literal per top-level alternative), or None if they can't be determined.
+
+    The analysis is conservative: when encountering constructs that are not
+    supported (inline flags, unknown escapes, etc), None is returned. For
+    case-insensitive regexps, literals are case-folded and must be looked for
+    in texts folded with :func:`fold_case`.
+    """
+    literals = []
+    runs = []
+    run: List[str] = []
+    last_is_literal = False
+    depth = 0
+    i = 0
+
+    while i < len(regexp):
+        char = regexp[i]
+        literal = None
+        if char == "\\":
+            if i + 1 >= len(regexp):
+                return None
+            next_char = regexp[i + 1]
+            if not next_char.isalnum():
+                literal = next_char
+            elif next_char not in _CLASS_OR_ASSERTION_ESCAPES:
+                # backreferences, special chars, codepoints, etc
+                return None
+            i += 2
+        elif char == "[":
+            # skip character set
+            i += 1
+            if regexp.startswith("^", i):
+                i += 1
+            if regexp.startswith("]", i):
+                i += 1
+            while i < len(regexp) and regexp[i] != "]":
+                i += 2 if regexp[i] == "\\" else 1
+            i += 1
+        elif char == "(":
+            if regexp.startswith("(?", i) and (
+                regexp[i + 2 : i + 3] in ("", "#") or regexp[i + 2] in "aiLmsux-"
+            ):
+                # comments and inline flags
+                return None
+            depth += 1
+            i += 1
+        elif char == ")":
+            depth -= 1
+            i += 1
+        elif char == "|" and depth == 0:
+            runs.append(run)
+            literals.append(max(("".join(r) for r in runs), key=len))
+            runs = []
+            run = []
+            i += 1
+        elif char in "*+?" or (
+            char == "{" and _BRACES_QUANTIFIER_PATTERN.match(regexp, i)
+        ):
+            # previous literal char may not be present
+            if last_is_literal:
+                run.pop()
+            if char == "{":
+                i = _BRACES_QUANTIFIER_PATTERN.match(regexp, i).end()
+            else:
+                i += 1
+        elif char in ".^$|":
+            i += 1
+        else:
+            literal = char
+            i += 1
+
+        if literal is not None and depth == 0:
+            run.append(literal)
+            last_is_literal = True
+        else:
+            # end of current literal run
+            if run:
+                runs.append(run)
+            run = []
+            last_is_literal = False
+
+    runs.append(run)
+    literals.append(max(("".join(r) for r in runs), key=len))
+
+    if not all(literals):
+        return None
+    if not case_sensitive:
+        literals = [fold_case(lit) for lit in literals]
+    return literals
+
+
+def fold_case(text: str) -> str:
+    """
+    Fold case of `text`, so that texts (or chars) matching each other when
+    ignoring case with the `re` module have the same folded version
+    """
+    return text.translate(_CASE_FIXES).lower()
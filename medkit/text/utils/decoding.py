@@ -4,6 +4,19 @@ import logging
 import unidecode
 
 
+class _AsciiTranslationTable(dict):
+    """Closest ascii string of each char (by codepoint), computed when first needed,
+    to be used with `str.translate()`"""
+
+    def __missing__(self, codepoint: int) -> str:
+        ascii_str = unidecode.unidecode(chr(codepoint))
+        self[codepoint] = ascii_str
+        return ascii_str
+
+
+_ASCII_TRANSLATION_TABLE = _AsciiTranslationTable()
+
+
 def get_ascii_from_unicode(text: str, keep_length: bool = True, logger=None) -> str:
     """
     Function returning the (closest) ascii text when possible
@@ -24,7 +37,9 @@ def get_ascii_from_unicode(text: str, keep_length: bool = True, logger=None) ->
     """
     if logger is None:
         logger = logging.getLogger(__name__)
-    output = unidecode.unidecode(text)
+    if text.isascii():
+        return text
+    output = text.translate(_ASCII_TRANSLATION_TABLE)
 
     # Verify that text length is conserved
     if keep_length and len(output) != len(text):
@@ -32,7 +47,7 @@ def get_ascii_from_unicode(text: str, keep_length: bool = True, logger=None) ->
         output = ""
         special_chars = set()
         for c in text:
-            cprim = unidecode.unidecode(c)
+            cprim = _ASCII_TRANSLATION_TABLE[ord(c)]
             if len(cprim) == 1:
                 output += cprim
             else:
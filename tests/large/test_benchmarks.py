@@ -0,0 +1,11 @@
+from benchmarks._runner import find_benchmarks, run_benchmarks
+
+
+def test_benchmarks():
+    """All benchmarks must run"""
+    names = [name for name, _, _, _ in find_benchmarks()]
+    assert "bench_text.RegexpMatcherSuite.time_run" in names
+
+    results = run_benchmarks(quick=True)
+    assert [b["name"] for b in results["benchmarks"]] == names
+    assert all(b["median"] > 0 for b in results["benchmarks"])
@@ -0,0 +1,74 @@
+"""
+Micro-benchmark of the rule prefiltering of context detectors, checking that
+the attributes created are the same with and without prefiltering
+"""
+
+from pathlib import Path
+import timeit
+
+import pytest
+
+from medkit.core.text import TextDocument
+from medkit.text.context import HypothesisDetector, NegationDetector
+from medkit.text.segmentation import SentenceTokenizer, SyntagmaTokenizer
+from medkit.text.utils._regexp_literals import RulePrefilter
+
+_PATH_TO_TEXTS = Path(__file__).parent.parent / "data" / "text"
+_NB_RUNS = 5
+
+
+def _get_syntagmas():
+    sentence_tokenizer = SentenceTokenizer()
+    syntagma_tokenizer = SyntagmaTokenizer()
+    syntagmas = []
+    for path in sorted(_PATH_TO_TEXTS.glob("**/*.txt")):
+        doc = TextDocument(text=path.read_text(encoding="utf-8"))
+        sentences = sentence_tokenizer.run([doc.raw_segment])
+        syntagmas += syntagma_tokenizer.run(sentences)
+    return syntagmas
+
+
+def _disable_prefilter(detector):
+    # rules without literals are always tried
+    nb_rules = len(detector.rules)
+    detector._prefilter = RulePrefilter(
+        ["."] * nb_rules, [True] * nb_rules, [True] * nb_rules
+    )
+    if isinstance(detector, HypothesisDetector):
+        detector._verbs_without_first_word = set(detector.verbs)
+
+
+def _get_attr_values(detector, syntagmas):
+    detector.run(syntagmas)
+    values = []
+    for syntagma in syntagmas:
+        attr = syntagma.attrs.get(label=detector.output_label)[-1]
+        values.append((attr.value, attr.metadata))
+    return values
+
+
+@pytest.mark.parametrize(
+    "detector_class,output_label",
+    [(NegationDetector, "negation"), (HypothesisDetector, "hypothesis")],
+)
+def test_prefilter(detector_class, output_label):
+    syntagmas = _get_syntagmas()
+    assert len(syntagmas) > 100
+
+    detector = detector_class(output_label=output_label)
+    ref_detector = detector_class(output_label=output_label)
+    _disable_prefilter(ref_detector)
+
+    # same attributes with and without prefilter
+    values = _get_attr_values(detector, syntagmas)
+    ref_values = _get_attr_values(ref_detector, syntagmas)
+    assert values == ref_values
+    assert any(value for value, _ in values)
+
+    time = timeit.timeit(lambda: detector.run(syntagmas), number=_NB_RUNS)
+    ref_time = timeit.timeit(lambda: ref_detector.run(syntagmas), number=_NB_RUNS)
+    print(
+        f"{detector_class.__name__}: {len(syntagmas) * _NB_RUNS / time:.0f}"
+        f" syntagmas/s with prefilter, {len(syntagmas) * _NB_RUNS / ref_time:.0f}"
+        " syntagmas/s without prefilter"
+    )
@@ -0,0 +1,52 @@
+import resource
+
+from medkit.core.store import GlobalStore
+from medkit.core.text import TextDocument
+from medkit.text.ner import RegexpMatcher, RegexpMatcherRule
+from medkit.text.segmentation import SentenceTokenizer
+
+_TEXT = (
+    "Le patient présente un diabète de type 2. Pas d'hypertension artérielle."
+    " Antécédents de diabète gestationnel chez la mère. Traitement par metformine."
+)
+
+
+def _get_max_rss_mb():
+    # ru_maxrss is in kilobytes on linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _process_docs(nb_docs, sentence_tokenizer, matcher):
+    for i in range(nb_docs):
+        doc = TextDocument(text=f"Document {i}. " + _TEXT)
+        sentences = sentence_tokenizer.run([doc.raw_segment])
+        entities = matcher.run(sentences)
+        for ann in sentences + entities:
+            doc.anns.add(ann)
+        # doc is discarded at next iteration
+
+
+def test_store_memory_is_released():
+    """Memory used by the global store must not grow when processing many
+    documents that are discarded after being processed"""
+    sentence_tokenizer = SentenceTokenizer()
+    matcher = RegexpMatcher(
+        rules=[
+            RegexpMatcherRule(regexp="diab[eè]te", label="problem"),
+            RegexpMatcherRule(regexp="hypertension", label="problem"),
+            RegexpMatcherRule(regexp="metformine", label="treatment"),
+        ]
+    )
+    store = GlobalStore.get_store()
+
+    # warm up, to reach a stable memory usage
+    _process_docs(10_000, sentence_tokenizer, matcher)
+    assert len(store) == 0
+    max_rss_before = _get_max_rss_mb()
+
+    _process_docs(100_000, sentence_tokenizer, matcher)
+    assert len(store) == 0
+    max_rss_after = _get_max_rss_mb()
+
+    # without releasing items, the store would grow by several hundreds of MB
+    assert max_rss_after - max_rss_before < 20
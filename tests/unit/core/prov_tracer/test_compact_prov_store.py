@@ -0,0 +1,108 @@
+import pytest
+
+from medkit.core import generate_id, OperationDescription
+from medkit.core.prov_store import create_prov_store
+from medkit.core.prov_tracer import ProvTracer
+from medkit.core._prov_graph import CompactProvGraph
+from tests.unit.core.prov_tracer._common import Generator, Prefixer, Splitter
+
+
+class _SplitterWrapper:
+    """Composite operation splitting then prefixing items"""
+
+    def __init__(self, prov_tracer):
+        self.uid = generate_id()
+        self.sub_prov_tracer = ProvTracer(prov_tracer.store)
+        self.splitter = Splitter(self.sub_prov_tracer)
+        self.prefixer = Prefixer(self.sub_prov_tracer)
+        self.prov_tracer = prov_tracer
+        self.description = OperationDescription(uid=self.uid, name="SplitterWrapper")
+
+    def run(self, input_items):
+        output_items = self.prefixer.prefix(self.splitter.split(input_items))
+        self.prov_tracer.add_prov_from_sub_tracer(
+            output_items, self.description, self.sub_prov_tracer
+        )
+        return output_items
+
+
+def _trace(tracer):
+    generator = Generator(tracer)
+    wrapper = _SplitterWrapper(tracer)
+    items = generator.generate(3)
+    # call composite operation several times
+    output_items = wrapper.run(items[:2]) + wrapper.run(items[2:])
+    return items, output_items
+
+
+@pytest.fixture(params=["memory", "disk"])
+def compact_store(request, tmp_path):
+    if request.param == "memory":
+        return create_prov_store("compact")
+    return create_prov_store("compact", path=tmp_path / "prov.db", write_batch_size=2)
+
+
+def test_compact_store(compact_store):
+    tracer = ProvTracer(compact_store)
+    assert isinstance(tracer._graph, CompactProvGraph)
+    items, output_items = _trace(tracer)
+    tracer._graph.check_sanity()
+
+    # sub tracers share the compact store and graph type
+    sub_tracer = tracer.get_sub_prov_tracers()[0]
+    assert sub_tracer.store is compact_store
+    assert isinstance(sub_tracer._graph, CompactProvGraph)
+
+    # same provenance as with default store
+    ref_tracer = ProvTracer()
+    ref_items, ref_output_items = _trace(ref_tracer)
+    assert len(tracer.get_provs()) == len(ref_tracer.get_provs())
+    for item, ref_item in zip(items + output_items, ref_items + ref_output_items):
+        prov = tracer.get_prov(item.uid)
+        ref_prov = ref_tracer.get_prov(ref_item.uid)
+        assert prov.data_item is item
+        assert prov.op_desc.name == ref_prov.op_desc.name
+        assert [d.text for d in prov.source_data_items] == [
+            d.text for d in ref_prov.source_data_items
+        ]
+        assert [d.text for d in prov.derived_data_items] == [
+            d.text for d in ref_prov.derived_data_items
+        ]
+    assert len(sub_tracer.get_provs()) == len(
+        ref_tracer.get_sub_prov_tracers()[0].get_provs()
+    )
+
+
+def test_compact_store_on_disk(tmp_path):
+    store = create_prov_store("compact", path=tmp_path / "prov.db")
+    tracer = ProvTracer(store)
+    items, output_items = _trace(tracer)
+    store.flush()
+    uids = [item.uid for item in items + output_items]
+    texts = [item.text for item in items + output_items]
+    del items, output_items
+
+    # data items no longer in memory are read from disk
+    assert [tracer.get_prov(uid).data_item.text for uid in uids] == texts
+    with pytest.raises(KeyError):
+        store.get_data_item(generate_id())
+
+
+def test_compact_store_on_disk_modified_items(tmp_path):
+    store = create_prov_store("compact", path=tmp_path / "prov.db")
+    tracer = ProvTracer(store)
+    generator = Generator(tracer)
+    prefixer = Prefixer(tracer)
+    items = generator.generate(2)
+    store.flush()
+
+    # item modified in place after being written, then used as source
+    items[0].text = "Modified text"
+    prefixer.prefix(items[:1])
+    store.flush()
+    uids = [item.uid for item in items]
+    del items
+
+    # last stored version is read from disk
+    assert tracer.get_prov(uids[0]).data_item.text == "Modified text"
+    assert tracer.get_prov(uids[1]).data_item.text.startswith("This is")
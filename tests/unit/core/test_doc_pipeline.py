@@ -1,14 +1,21 @@
 from __future__ import annotations
 
+import pytest
+
 from medkit.core import (
     generate_id,
+    set_id_generator,
     AnnotationContainer,
     Attribute,
     AttributeContainer,
     Pipeline,
     PipelineStep,
+    ProvTracer,
 )
-from medkit.core.doc_pipeline import DocPipeline
+from medkit.core.doc_pipeline import DocPipeline, _copy_without_prov_tracer
+from medkit.core.text import TextDocument
+from medkit.text.ner import RegexpMatcher, RegexpMatcherRule
+from medkit.text.segmentation import SentenceTokenizer
 
 _FULL_TEXT = (
     "This is a sentence. This is another sentence. This is the last sentence.\nThis is"
@@ -430,3 +437,193 @@ def test_key_group():
     uppercased_anns = doc.anns.get(label="uppercased_sentence")
     for ann in uppercased_anns:
         assert ann.keys == {"UPPERCASE"}
+
+
+def test_multiple_workers():
+    """Doc pipeline processing documents in parallel in worker processes"""
+    uppercaser = _Uppercaser(output_label="uppercased_sentence")
+    step_1 = PipelineStep(
+        operation=uppercaser,
+        input_keys=["SENTENCE"],
+        output_keys=["UPPERCASE"],
+    )
+    attribute_adder = _AttributeAdder(output_label="validated")
+    step_2 = PipelineStep(
+        operation=attribute_adder,
+        input_keys=["SENTENCE"],
+        output_keys=[],
+    )
+    pipeline = Pipeline(
+        steps=[step_1, step_2],
+        input_keys=step_1.input_keys,
+        output_keys=step_1.output_keys,
+    )
+    doc_pipeline = DocPipeline(
+        pipeline=pipeline,
+        labels_by_input_key={"SENTENCE": ["sentence"]},
+        n_workers=2,
+    )
+
+    docs = [_get_doc() for _ in range(10)]
+    doc_pipeline.run(docs)
+
+    for doc in docs:
+        # new annotations were added to the original documents, in order
+        sentence_anns = doc.anns.get(label="sentence")
+        uppercased_anns = doc.anns.get(label="uppercased_sentence")
+        expected_texts = [a.text.upper() for a in sentence_anns]
+        assert [a.text for a in uppercased_anns] == expected_texts
+        assert all(a.keys == {"UPPERCASE"} for a in uppercased_anns)
+
+        # attributes were added to pre-existing annotations
+        for ann in sentence_anns:
+            attrs = ann.attrs.get(label="validated")
+            assert len(attrs) == 1 and attrs[0].value is True
+
+
+def test_multiple_workers_id_generator():
+    """Worker processes use the id generator of the main process"""
+    doc_pipeline = _get_uppercaser_doc_pipeline(n_workers=2)
+    set_id_generator("base32")
+    try:
+        docs = [_get_doc() for _ in range(10)]
+        doc_pipeline.run(docs)
+    finally:
+        set_id_generator("uuid")
+
+    uids = [ann.uid for doc in docs for ann in doc.anns]
+    assert len(set(uids)) == len(uids)
+    assert all(len(uid) == 26 for uid in uids)
+
+
+def test_multiple_workers_with_prov():
+    """Provenance of doc pipeline with worker processes is the same as without"""
+    sentence_tokenizer = SentenceTokenizer()
+    matcher = RegexpMatcher(
+        rules=[
+            RegexpMatcherRule(
+                regexp="diab[eè]te", label="problem", case_sensitive=False
+            )
+        ]
+    )
+    steps = [
+        PipelineStep(sentence_tokenizer, input_keys=["FULL_TEXT"], output_keys=["S"]),
+        PipelineStep(matcher, input_keys=["S"], output_keys=["ENTITIES"]),
+    ]
+    pipeline = Pipeline(steps=steps, input_keys=["FULL_TEXT"], output_keys=["ENTITIES"])
+    doc_pipeline = DocPipeline(pipeline=pipeline, n_workers=2)
+    prov_tracer = ProvTracer()
+    doc_pipeline.set_prov_tracer(prov_tracer)
+
+    texts = [f"Patient {i}. Pas de diabète. Diabete connu." for i in range(6)]
+    docs = [TextDocument(text=text) for text in texts]
+    doc_pipeline.run(docs)
+
+    for doc in docs:
+        entities = doc.anns.get_entities()
+        assert [e.text for e in entities] == ["diabète", "Diabete"]
+        for entity in entities:
+            # entity was created by the pipeline from the raw segment
+            prov = prov_tracer.get_prov(entity.uid)
+            assert prov.data_item is entity
+            assert prov.op_desc == pipeline.description
+            assert [d.uid for d in prov.source_data_items] == [doc.raw_segment.uid]
+
+            # sub-provenance of the pipeline was merged
+            sub_prov_tracer = prov_tracer.get_sub_prov_tracer(pipeline.uid)
+            sub_prov = sub_prov_tracer.get_prov(entity.uid)
+            assert sub_prov.op_desc == matcher.description
+            assert sub_prov.source_data_items[0].label == "sentence"
+
+    prov_tracer._graph.check_sanity()
+
+
+def test_copy_without_prov_tracer():
+    """Doc pipeline is sent to worker processes without provenance tracers"""
+    matcher = RegexpMatcher(rules=[RegexpMatcherRule(regexp="diabète", label="pb")])
+    sub_pipeline = Pipeline(
+        steps=[PipelineStep(matcher, input_keys=["S"], output_keys=["E"])],
+        input_keys=["S"],
+        output_keys=["E"],
+    )
+    step = PipelineStep(sub_pipeline, input_keys=["FULL_TEXT"], output_keys=["E"])
+    pipeline = Pipeline(steps=[step], input_keys=["FULL_TEXT"], output_keys=["E"])
+    doc_pipeline = DocPipeline(pipeline=pipeline, n_workers=2)
+    prov_tracer = ProvTracer()
+    doc_pipeline.set_prov_tracer(prov_tracer)
+
+    copied_doc_pipeline = _copy_without_prov_tracer(doc_pipeline)
+    assert copied_doc_pipeline._prov_tracer is None
+    copied_pipeline = copied_doc_pipeline.pipeline
+    assert copied_pipeline._prov_tracer is None
+    assert copied_pipeline._sub_prov_tracer is None
+    copied_sub_pipeline = copied_pipeline.steps[0].operation
+    assert copied_sub_pipeline._prov_tracer is None
+    copied_matcher = copied_sub_pipeline.steps[0].operation
+    assert copied_matcher._prov_tracer is None
+    # operations are copied, not rebuilt
+    assert copied_matcher.rules is matcher.rules
+
+    # original doc pipeline is left unchanged
+    assert doc_pipeline._prov_tracer is prov_tracer
+    assert pipeline._sub_prov_tracer is not None
+    assert sub_pipeline._prov_tracer is pipeline._sub_prov_tracer
+    assert matcher._prov_tracer is sub_pipeline._sub_prov_tracer
+
+
+def _get_uppercaser_doc_pipeline(n_workers=1):
+    uppercaser = _Uppercaser(output_label="uppercased_sentence")
+    step = PipelineStep(
+        operation=uppercaser,
+        input_keys=["SENTENCE"],
+        output_keys=["UPPERCASE"],
+    )
+    pipeline = Pipeline(
+        steps=[step],
+        input_keys=step.input_keys,
+        output_keys=step.output_keys,
+    )
+    return DocPipeline(
+        pipeline=pipeline,
+        labels_by_input_key={"SENTENCE": ["sentence"]},
+        n_workers=n_workers,
+    )
+
+
+@pytest.mark.parametrize("n_workers", [1, 2])
+def test_run_iter(n_workers):
+    """Doc pipeline consuming documents from a generator"""
+    doc_pipeline = _get_uppercaser_doc_pipeline(n_workers)
+
+    nb_docs_read = 0
+
+    def doc_generator():
+        nonlocal nb_docs_read
+        for _ in range(25):
+            nb_docs_read += 1
+            yield _get_doc()
+
+    docs_iter = doc_pipeline.run_iter(
+        doc_generator(), batch_size=4, max_docs_in_flight=8
+    )
+    docs = []
+    for doc in docs_iter:
+        # documents are read lazily, in batches
+        assert nb_docs_read - len(docs) <= 8
+        docs.append(doc)
+
+        sentence_anns = doc.anns.get(label="sentence")
+        uppercased_anns = doc.anns.get(label="uppercased_sentence")
+        expected_texts = [a.text.upper() for a in sentence_anns]
+        assert [a.text for a in uppercased_anns] == expected_texts
+
+    assert len(docs) == 25
+
+
+def test_run_iter_max_docs_in_flight_too_low():
+    doc_pipeline = _get_uppercaser_doc_pipeline(n_workers=2)
+    docs_iter = doc_pipeline.run_iter(
+        [_get_doc() for _ in range(4)], batch_size=4, max_docs_in_flight=2
+    )
+    with pytest.raises(ValueError, match="must be at least batch_size"):
+        next(docs_iter)
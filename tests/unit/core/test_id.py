@@ -1,5 +1,21 @@
+import multiprocessing
+import re
 import uuid
-from medkit.core import generate_deterministic_id
+
+import pytest
+
+from medkit.core import (
+    generate_deterministic_id,
+    generate_id,
+    get_id_generator,
+    set_id_generator,
+)
+
+
+@pytest.fixture(autouse=True)
+def _reset_id_generator():
+    yield
+    set_id_generator("uuid")
 
 
 def test_deterministic_id():
@@ -9,3 +25,68 @@ def test_deterministic_id():
     # simulate another call
     second_deterministic_uuid = generate_deterministic_id(uid)
     assert first_deterministic_uuid == second_deterministic_uuid
+
+
+def test_default_generator():
+    assert get_id_generator() == "uuid"
+    uid = generate_id()
+    assert str(uuid.UUID(uid)) == uid
+
+
+@pytest.mark.parametrize(
+    "name,pattern",
+    [
+        ("uuid", r"[0-9a-f]{8}-([0-9a-f]{4}-){3}[0-9a-f]{12}"),
+        ("counter", r"[a-z2-7]{16}-[0-9a-f]+"),
+        ("base32", r"[a-z2-7]{26}"),
+    ],
+)
+def test_builtin_generators(name, pattern):
+    set_id_generator(name)
+    assert get_id_generator() == name
+    uids = [generate_id() for _ in range(1000)]
+    assert len(set(uids)) == len(uids)
+    assert all(re.fullmatch(pattern, uid) for uid in uids)
+
+
+def test_counter_generator():
+    set_id_generator("counter")
+    uids = [generate_id() for _ in range(20)]
+    prefixes = {uid.split("-")[0] for uid in uids}
+    assert len(prefixes) == 1
+    assert [int(uid.split("-")[1], 16) for uid in uids] == sorted(
+        int(uid.split("-")[1], 16) for uid in uids
+    )
+
+
+def test_custom_generator():
+    uids = iter(["a", "b"])
+    set_id_generator(lambda: next(uids))
+    assert generate_id() == "a"
+    assert generate_id() == "b"
+
+
+def test_unknown_generator():
+    with pytest.raises(ValueError, match="Unknown id generator"):
+        set_id_generator("foo")
+    assert get_id_generator() == "uuid"
+
+
+def _generate_ids(nb_ids):
+    return [generate_id() for _ in range(nb_ids)]
+
+
+@pytest.mark.skipif(
+    "fork" not in multiprocessing.get_all_start_methods(),
+    reason="fork start method not available",
+)
+@pytest.mark.parametrize("name", ["counter", "base32"])
+def test_unique_across_processes(name):
+    set_id_generator(name)
+    # identifiers generated before forking must not be generated again by children
+    uids = _generate_ids(100)
+    ctx = multiprocessing.get_context("fork")
+    with ctx.Pool(2) as pool:
+        for child_uids in pool.map(_generate_ids, [100] * 4):
+            uids += child_uids
+    assert len(set(uids)) == len(uids)
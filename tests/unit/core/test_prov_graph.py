@@ -1,7 +1,7 @@
 import pytest
 
 from medkit.core import generate_id
-from medkit.core._prov_graph import ProvGraph, ProvNode
+from medkit.core._prov_graph import CompactProvGraph, ProvGraph, ProvNode
 
 
 def test_basic():
@@ -354,3 +354,75 @@ def test_sanity_check():
         Exception, match="Source identifier .* has no corresponding node"
     ):
         graph_6.check_sanity()
+
+
+def _fill_graph(graph, ids):
+    graph.add_node(ids[0], ids[10], source_ids=[])
+    graph.add_node(ids[1], ids[10], source_ids=[])
+    # sources with and without nodes
+    graph.add_node(ids[2], ids[11], source_ids=[ids[0], ids[1], ids[3]])
+    graph.add_node(ids[4], ids[11], source_ids=[ids[0]])
+    # stub node completed
+    graph.add_node(ids[3], ids[12], source_ids=[ids[5]])
+
+
+def test_compact_graph():
+    """Compact graph must behave like default graph"""
+    ids = [generate_id() for _ in range(15)]
+    graph = ProvGraph()
+    _fill_graph(graph, ids)
+    compact_graph = CompactProvGraph()
+    _fill_graph(compact_graph, ids)
+
+    assert compact_graph.get_nodes() == graph.get_nodes()
+    for node in graph.get_nodes():
+        assert compact_graph.has_node(node.data_item_id)
+        assert compact_graph.get_node(node.data_item_id) == node
+    assert not compact_graph.has_node(ids[14])
+    # operation ids are not nodes
+    assert not compact_graph.has_node(ids[10])
+    compact_graph.check_sanity()
+
+    # node added twice
+    with pytest.raises(AssertionError):
+        compact_graph.add_node(ids[4], ids[11], source_ids=[])
+
+
+def test_compact_graph_sub_graphs():
+    ids = [generate_id() for _ in range(15)]
+    graph = CompactProvGraph()
+    _fill_graph(graph, ids)
+
+    sub_graph = ProvGraph()
+    sub_graph.add_node(ids[6], ids[13], source_ids=[ids[0]])
+    graph.add_sub_graph(ids[11], sub_graph)
+    assert graph.get_sub_graph(ids[11]) is sub_graph
+
+    # graphs of another type are merged in compact graph
+    other_graph = ProvGraph()
+    other_graph.add_node(ids[7], ids[13], source_ids=[ids[6]])
+    graph.update(other_graph)
+    node_6 = graph.get_node(ids[6])
+    assert node_6.operation_id is None
+    assert node_6.derived_ids == [ids[7]]
+
+    # default graph can be merged with compact graph
+    default_graph = ProvGraph()
+    default_graph.update(graph)
+    assert default_graph.get_nodes() == graph.get_nodes()
+    graph.check_sanity()
+    default_graph.check_sanity()
+
+
+def test_compact_graph_shared_interner():
+    """Size of a compact graph must not depend on identifiers of other graphs"""
+    ids = [generate_id() for _ in range(15)]
+    graph = CompactProvGraph()
+    _fill_graph(graph, ids)
+
+    sub_graph = CompactProvGraph(graph._interner)
+    sub_graph.add_node(ids[6], ids[13], source_ids=[ids[0]])
+    assert len(sub_graph._op_indices) == 2
+    assert [n.data_item_id for n in sub_graph.get_nodes()] == [ids[6], ids[0]]
+    assert not sub_graph.has_node(ids[1])
+    sub_graph.check_sanity()
@@ -0,0 +1,45 @@
+from medkit.core import ResultCache
+
+
+def test_basic(tmp_path):
+    cache = ResultCache(tmp_path / "cache.db")
+    assert cache.get("a") is None
+    cache.put("a", b"data a")
+    assert cache.get("a") == b"data a"
+    assert cache.size == 6
+
+    # replace existing entry
+    cache.put("a", b"new data a")
+    assert cache.get("a") == b"new data a"
+    assert cache.size == 10
+
+    cache.clear()
+    assert cache.get("a") is None
+    assert cache.size == 0
+
+
+def test_eviction(tmp_path):
+    cache = ResultCache(tmp_path / "cache.db", max_size=10)
+    cache.put("a", b"aaaa")
+    cache.put("b", b"bbbb")
+    # "a" is now the most recently used entry
+    cache.get("a")
+    cache.put("c", b"cccc")
+    assert cache.size == 8
+    assert cache.get("b") is None
+    assert cache.get("a") == b"aaaa"
+    assert cache.get("c") == b"cccc"
+
+
+def test_reopen(tmp_path):
+    path = tmp_path / "cache.db"
+    with ResultCache(path, max_size=10) as cache:
+        cache.put("a", b"aaaa")
+        cache.put("b", b"bbbb")
+
+    # entries and usage info are retrieved from the database
+    cache = ResultCache(path, max_size=10)
+    assert cache.size == 8
+    cache.put("c", b"cccc")
+    assert cache.get("a") is None
+    assert cache.get("b") == b"bbbb"
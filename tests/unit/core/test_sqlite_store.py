@@ -0,0 +1,61 @@
+from medkit.core import Attribute, GlobalStore, SQLiteStore
+from medkit.core.text import Entity, Segment, Span, TextDocument
+
+
+def _get_doc(nb_sentences):
+    doc = TextDocument(text="Hello")
+    for i in range(nb_sentences):
+        text = f"Hello {i}"
+        sentence = Segment(label="sentence", spans=[Span(0, len(text))], text=text)
+        sentence.attrs.add(Attribute(label="index", value=i))
+        doc.anns.add(sentence)
+    return doc
+
+
+def test_basic(tmp_path):
+    store = SQLiteStore(tmp_path / "store.db", cache_size=10, write_batch_size=4)
+    GlobalStore.init_store(store)
+
+    doc = _get_doc(nb_sentences=50)
+    # most annotations are not in memory anymore
+    assert len(store._cache) <= 10
+
+    sentences = doc.anns.get(label="sentence")
+    assert [s.text for s in sentences] == [f"Hello {i}" for i in range(50)]
+    assert [s.attrs.get(label="index")[0].value for s in sentences] == list(range(50))
+    assert store.get_parent_item(sentences[0].attrs.get()[0].uid) == sentences[0]
+
+
+def test_modified_items_are_persisted(tmp_path):
+    store = SQLiteStore(tmp_path / "store.db", cache_size=10, write_batch_size=4)
+    GlobalStore.init_store(store)
+
+    doc = _get_doc(nb_sentences=50)
+    entity = Entity(label="name", spans=[Span(0, 5)], text="Hello")
+    doc.anns.add(entity)
+    # attribute added to item in cache, then evicted
+    entity.attrs.add(Attribute(label="negation", value=True))
+    del entity
+    for sentence in doc.anns.get(label="sentence"):
+        sentence.metadata["seen"] = True
+
+    entity = doc.anns.get(label="name")[0]
+    assert entity.attrs.get(label="negation")[0].value is True
+    for sentence in doc.anns.get(label="sentence"):
+        assert sentence.metadata["seen"] is True
+
+
+def test_reopen(tmp_path):
+    path = tmp_path / "store.db"
+    with SQLiteStore(path, cache_size=10) as store:
+        GlobalStore.init_store(store)
+        doc = _get_doc(nb_sentences=20)
+        sentence_ids = [s.uid for s in doc.anns]
+    GlobalStore.del_store()
+
+    # items can be retrieved from another store using the same file
+    store = SQLiteStore(path, cache_size=10)
+    sentence = store.get_data_item(sentence_ids[3])
+    assert sentence.text == "Hello 3"
+    assert sentence.attrs.get(label="index")[0].value == 3
+    assert store.get_data_item("unknown") is None
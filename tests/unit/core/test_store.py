@@ -1,6 +1,8 @@
 import pytest
 
+from medkit.core import Attribute
 from medkit.core.store import _DictStore, GlobalStore
+from medkit.core.text import Entity, Segment, Span, TextDocument
 
 
 class SubStore(_DictStore):
@@ -19,3 +21,60 @@ def test_global_store_init_store_error():
     assert isinstance(store, _DictStore)
     with pytest.raises(RuntimeError):
         GlobalStore.init_store(SubStore())
+
+
+def test_release_when_doc_discarded():
+    store = GlobalStore.get_store()
+    doc = TextDocument(text="Hello")
+    entity = Entity(label="name", spans=[Span(0, 5)], text="Hello")
+    entity.attrs.add(Attribute(label="negation", value=False))
+    doc.anns.add(entity)
+    doc.anns.add(Segment(label="sentence", spans=[Span(0, 5)], text="Hello"))
+    assert len(store) == 3
+
+    # entity is still referenced so its attribute is kept
+    del doc
+    assert len(store) == 1
+    assert entity.attrs.get(label="negation")[0].value is False
+
+    del entity
+    assert len(store) == 0
+
+
+def test_release_items_stored_twice():
+    store = GlobalStore.get_store()
+    doc = TextDocument(text="Hello")
+    doc.anns.add(Segment(label="sentence", spans=[Span(0, 5)], text="Hello"))
+    # copy of the document, sharing the same annotation uids
+    doc_copy = TextDocument.from_dict(doc.to_dict())
+    assert len(store) == 1
+
+    del doc
+    assert len(store) == 1
+    assert doc_copy.anns.get(label="sentence")[0].text == "Hello"
+
+    del doc_copy
+    assert len(store) == 0
+
+
+def test_global_store_scope():
+    global_store = GlobalStore.get_store()
+
+    with GlobalStore.scope() as scoped_store:
+        assert GlobalStore.get_store() is scoped_store
+        assert scoped_store is not global_store
+        doc = TextDocument(text="Hello")
+        doc.anns.add(Segment(label="sentence", spans=[Span(0, 5)], text="Hello"))
+
+    assert GlobalStore.get_store() is global_store
+    assert len(global_store) == 0
+    # document still uses scoped store
+    assert len(scoped_store) == 1
+    assert doc.anns.get(label="sentence")[0].text == "Hello"
+
+    # custom store
+    store = SubStore()
+    with GlobalStore.scope(store) as scoped_store:
+        assert scoped_store is store
+        assert GlobalStore.get_store() is store
+    assert GlobalStore.get_store() is global_store
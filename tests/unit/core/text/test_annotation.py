@@ -1,7 +1,12 @@
+import pickle
+
 import pytest
 
-from medkit.core.text.annotation import Entity
+from medkit.core.attribute import Attribute
+from medkit.core.attribute_container import AttributeContainer
+from medkit.core.text.annotation import Entity, Segment
 from medkit.core.text.span import Span, ModifiedSpan
+from medkit.core.text.entity_attribute_container import EntityAttributeContainer
 from medkit.core.text.entity_norm_attribute import EntityNormAttribute
 
 
@@ -21,6 +26,37 @@ def test_spans_for_segment():
         )  # wrong mixed span
 
 
+def test_normalized_spans():
+    entity = Entity(
+        label="disease",
+        text="asthme",
+        spans=[Span(0, 1), ModifiedSpan(length=5, replaced_spans=[Span(1, 6)])],
+    )
+    assert entity.normalized_spans == [Span(0, 6)]
+    assert entity.original_range == (0, 6)
+    # computed only once
+    assert entity.normalized_spans is entity.normalized_spans
+
+    # recomputed when spans are reassigned
+    entity.spans = [Span(10, 12), ModifiedSpan(length=4, replaced_spans=[])]
+    assert entity.normalized_spans == [Span(10, 12)]
+    assert entity.original_range == (10, 12)
+    entity.spans = [ModifiedSpan(length=6, replaced_spans=[])]
+    assert entity.normalized_spans == []
+    assert entity.original_range is None
+
+    # cache is not taken into account when comparing or pickling
+    entity_1 = Entity(label="disease", text="asthme", spans=[Span(0, 6)])
+    entity_2 = Entity(label="disease", text="asthme", spans=[Span(0, 6)])
+    entity_2.uid = entity_1.uid
+    entity_2.attrs = entity_1.attrs
+    entity_1.normalized_spans
+    assert entity_1 == entity_2
+    assert (
+        "_normalized_spans_cache" not in pickle.loads(pickle.dumps(entity_1)).__dict__
+    )
+
+
 def test_normalization():
     """Test normalization helper"""
 
@@ -37,3 +73,30 @@ def test_normalization():
     norms = entity.attrs.get_norms()
     assert len(norms) == 1
     assert norms[0] == norm
+
+
+def test_lazy_attrs():
+    entity = Entity(label="disease", text="asthme", spans=[Span(0, 6)])
+    # container is only created when accessed
+    assert entity._attrs is None
+    assert entity.to_dict()["attrs"] == []
+    assert entity._attrs is None
+    assert len(entity.attrs) == 0
+    assert isinstance(entity.attrs, EntityAttributeContainer)
+    assert entity.attrs is entity.attrs
+
+    # attributes passed at init are added to the container
+    attr = Attribute(label="negation", value=True)
+    entity = Entity(label="disease", text="asthme", spans=[Span(0, 6)], attrs=[attr])
+    assert entity.attrs.get() == [attr]
+
+    # custom container class
+    segment = Segment(
+        label="sentence",
+        text="asthme",
+        spans=[Span(0, 6)],
+        attr_container_class=EntityAttributeContainer,
+    )
+    assert isinstance(segment.attrs, EntityAttributeContainer)
+    segment = Segment(label="sentence", text="asthme", spans=[Span(0, 6)])
+    assert type(segment.attrs) is AttributeContainer
@@ -0,0 +1,198 @@
+import pytest
+
+from medkit.core import Attribute, Pipeline, PipelineStep, ProvTracer, ResultCache
+from medkit.core.text import CachedOperation, Entity, NEROperation, Segment, Span
+from medkit.text.ner import (
+    RegexpMatcher,
+    RegexpMatcherNormalization,
+    RegexpMatcherRule,
+)
+
+
+class _CountingMatcher(NEROperation):
+    """Create an entity for each segment, counting segments processed"""
+
+    def __init__(self, label, uid=None):
+        init_args = locals()
+        init_args.pop("self")
+        super().__init__(**init_args)
+
+        self.label = label
+        self.nb_segments = 0
+
+    def run(self, segments):
+        self.nb_segments += len(segments)
+        entities = []
+        for segment in segments:
+            entity = Entity(label=self.label, spans=segment.spans, text=segment.text)
+            entities.append(entity)
+            if self._prov_tracer is not None:
+                self._prov_tracer.add_prov(entity, self.description, [segment])
+        return entities
+
+
+def _get_segments():
+    texts = ["Le patient a du diabète", "Pas de fièvre", "Le patient a du diabète"]
+    segments = []
+    offset = 0
+    for text in texts:
+        segment = Segment(
+            label="sentence", spans=[Span(offset, offset + len(text))], text=text
+        )
+        segment.attrs.add(Attribute(label="negation", value=text.startswith("Pas")))
+        segments.append(segment)
+        offset += len(text) + 1
+    return segments
+
+
+def _get_matcher():
+    rule = RegexpMatcherRule(
+        regexp="diabète|fièvre",
+        label="problem",
+        id="id_problem",
+        normalizations=[RegexpMatcherNormalization(kb_name="umls", kb_id="C0011849")],
+    )
+    return RegexpMatcher(rules=[rule], attrs_to_copy=["negation"])
+
+
+def _check_anns_equal(anns, expected_anns):
+    """Check equality of annotations and attributes, ignoring identifiers"""
+    assert len(anns) == len(expected_anns)
+    for ann, expected_ann in zip(anns, expected_anns):
+        ann_dict = ann.to_dict()
+        expected_ann_dict = expected_ann.to_dict()
+        for d in (ann_dict, expected_ann_dict):
+            del d["uid"]
+            for attr_dict in d["attrs"]:
+                del attr_dict["uid"]
+        assert ann_dict == expected_ann_dict
+
+
+def test_basic(tmp_path):
+    matcher = _CountingMatcher(label="sentence_entity")
+    cached_matcher = CachedOperation(matcher, tmp_path / "cache.db")
+
+    segments = _get_segments()
+    entities = cached_matcher.run(segments)
+    assert [e.text for e in entities] == [s.text for s in segments]
+    # segments with identical text, spans and attributes are all computed on
+    # the first run
+    assert matcher.nb_segments == 3
+
+    entities_2 = cached_matcher.run(_get_segments())
+    assert matcher.nb_segments == 3
+    _check_anns_equal(entities_2, entities)
+    # cached annotations get new identifiers
+    assert {e.uid for e in entities_2}.isdisjoint(e.uid for e in entities)
+
+    # segments with different spans are not in the cache
+    text = "Pas de fièvre"
+    segment = Segment(label="sentence", spans=[Span(0, len(text))], text=text)
+    segment.attrs.add(Attribute(label="negation", value=True))
+    cached_matcher.run([segment])
+    assert matcher.nb_segments == 4
+
+
+def test_cache_key(tmp_path):
+    cache = ResultCache(tmp_path / "cache.db")
+    matcher = _CountingMatcher(label="sentence_entity")
+    CachedOperation(matcher, cache).run(_get_segments())
+    assert matcher.nb_segments == 3
+
+    # same config, cache is reused
+    matcher = _CountingMatcher(label="sentence_entity")
+    CachedOperation(matcher, cache).run(_get_segments())
+    assert matcher.nb_segments == 0
+
+    # different config or version
+    matcher = _CountingMatcher(label="other_label")
+    CachedOperation(matcher, cache).run(_get_segments())
+    assert matcher.nb_segments == 3
+    matcher = _CountingMatcher(label="sentence_entity")
+    CachedOperation(matcher, cache, version="v2").run(_get_segments())
+    assert matcher.nb_segments == 3
+
+
+def test_regexp_matcher(tmp_path):
+    expected_entities = _get_matcher().run(_get_segments())
+
+    cached_matcher = CachedOperation(_get_matcher(), tmp_path / "cache.db")
+    entities = cached_matcher.run(_get_segments())
+    _check_anns_equal(entities, expected_entities)
+    entities = cached_matcher.run(_get_segments())
+    _check_anns_equal(entities, expected_entities)
+
+
+def _check_prov(prov_tracer, entity, segment, op_desc):
+    prov = prov_tracer.get_prov(entity.uid)
+    assert prov.op_desc == op_desc
+    assert prov.source_data_items == [segment]
+
+    copied_attr = entity.attrs.get(label="negation")[0]
+    prov = prov_tracer.get_prov(copied_attr.uid)
+    assert prov.op_desc == op_desc
+    assert prov.source_data_items == segment.attrs.get(label="negation")
+
+    norm_attr = entity.attrs.norms[0]
+    prov = prov_tracer.get_prov(norm_attr.uid)
+    assert prov.op_desc == op_desc
+    assert prov.source_data_items == [segment]
+
+
+@pytest.mark.parametrize("is_cached", [False, True])
+def test_prov(tmp_path, is_cached):
+    matcher = _get_matcher()
+    cached_matcher = CachedOperation(matcher, tmp_path / "cache.db")
+    if is_cached:
+        cached_matcher.run(_get_segments())
+
+    prov_tracer = ProvTracer()
+    cached_matcher.set_prov_tracer(prov_tracer)
+    segments = _get_segments()
+    entities = cached_matcher.run(segments)
+
+    assert len(entities) == 3
+    _check_prov(prov_tracer, entities[0], segments[0], matcher.description)
+    _check_prov(prov_tracer, entities[1], segments[1], matcher.description)
+    _check_prov(prov_tracer, entities[2], segments[2], matcher.description)
+
+
+def test_restore_prov_tracer(tmp_path):
+    matcher = _get_matcher()
+    cached_matcher = CachedOperation(matcher, tmp_path / "cache.db")
+    cached_matcher.run(_get_segments())
+    # tracer is unset after computing
+    assert matcher._prov_tracer is None
+
+    # tracer previously set on the wrapped operation is restored
+    prov_tracer = ProvTracer()
+    matcher.set_prov_tracer(prov_tracer)
+    cached_matcher = CachedOperation(matcher, tmp_path / "other_cache.db")
+    cached_matcher.run(_get_segments())
+    assert matcher._prov_tracer is prov_tracer
+
+
+def _get_pipeline():
+    step = PipelineStep(
+        operation=_get_matcher(), input_keys=["sentences"], output_keys=["entities"]
+    )
+    return Pipeline(steps=[step], input_keys=["sentences"], output_keys=["entities"])
+
+
+@pytest.mark.parametrize("with_prov", [False, True])
+def test_pipeline(tmp_path, with_prov):
+    expected_entities = _get_pipeline().run(_get_segments())
+
+    pipeline = _get_pipeline()
+    cached_pipeline = CachedOperation(pipeline, tmp_path / "cache.db")
+    if with_prov:
+        prov_tracer = ProvTracer()
+        cached_pipeline.set_prov_tracer(prov_tracer)
+
+    for _ in range(2):
+        segments = _get_segments()
+        entities = cached_pipeline.run(segments)
+        _check_anns_equal(entities, expected_entities)
+        if with_prov:
+            for entity, segment in zip(entities, segments):
+                _check_prov(prov_tracer, entity, segment, pipeline.description)
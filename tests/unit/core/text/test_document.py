@@ -63,6 +63,61 @@ def test_get_annotations_by_label(init_data):
     assert doc.anns.get(label=ent1.label) == [ent1, ent3]
 
 
+def test_get_annotations_by_type(init_data):
+    doc, ent1, ent2, segment, relation, attribute = init_data
+    ent1.keys.add("superkey")
+    segment.keys.add("superkey")
+    doc.anns.add(ent1)
+    doc.anns.add(segment)
+    doc.anns.add(ent2)
+    doc.anns.add(relation)
+
+    assert doc.anns.get_entities() == [ent1, ent2]
+    assert doc.anns.get_entities(label=ent2.label) == [ent2]
+    assert doc.anns.get_entities(key="superkey") == [ent1]
+    assert doc.anns.get_entities(label=ent2.label, key="superkey") == []
+    assert doc.anns.get_segments() == [segment]
+    assert doc.anns.get_segments(key="superkey") == [segment]
+    assert doc.anns.get_segments(label=ent1.label) == []
+    assert doc.anns.get_relations() == [relation]
+    assert doc.anns.get_relations(source_id=ent1.uid) == [relation]
+    assert doc.anns.get_relations(label="toto", source_id=ent1.uid) == [relation]
+    assert doc.anns.get_relations(source_id=ent2.uid) == []
+
+
+def test_get_annotations_by_position():
+    text = "Le patient a une toux sèche. Pas de fièvre."
+    doc = TextDocument(text=text)
+    sentence_1 = Segment(label="sentence", spans=[Span(0, 28)], text=text[0:28])
+    sentence_2 = Segment(label="sentence", spans=[Span(29, 43)], text=text[29:43])
+    entity_1 = Entity(label="symptom", spans=[Span(17, 27)], text=text[17:27])
+    entity_2 = Entity(label="symptom", spans=[Span(36, 42)], text=text[36:42])
+    relation = Relation(label="rel", source_id=entity_1.uid, target_id=entity_2.uid)
+    empty_entity = Entity(label="symptom", spans=[], text="")
+    # annotations are returned in order of position
+    for ann in [entity_2, sentence_2, relation, entity_1, empty_entity, sentence_1]:
+        doc.anns.add(ann)
+
+    assert doc.anns.get_overlapping(0, len(text)) == [
+        sentence_1,
+        entity_1,
+        sentence_2,
+        entity_2,
+    ]
+    assert doc.anns.get_overlapping(20, 29) == [sentence_1, entity_1]
+    assert doc.anns.get_overlapping(20, 29, label="sentence") == [sentence_1]
+    assert doc.anns.get_overlapping(28, 29) == []
+    assert doc.anns.get_contained(0, 28) == [sentence_1, entity_1]
+    assert doc.anns.get_contained(17, 43, label="symptom") == [entity_1, entity_2]
+
+    # index is updated when adding annotations after a query
+    entity_3 = Entity(label="symptom", spans=[Span(17, 21)], text=text[17:21])
+    entity_3.keys.add("key")
+    doc.anns.add(entity_3)
+    assert doc.anns.get_contained(17, 28) == [entity_3, entity_1]
+    assert doc.anns.get_contained(17, 28, key="key") == [entity_3]
+
+
 def test_raw_segment():
     # raw text segment automatically generated
     text = "This is the raw text."
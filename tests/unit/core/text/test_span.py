@@ -0,0 +1,40 @@
+import copy
+import dataclasses
+import pickle
+
+import pytest
+
+from medkit.core.text.span import AnySpan, ModifiedSpan, Span
+
+
+def test_span():
+    span = Span(2, 8)
+    assert span.start == 2 and span.end == 8
+    assert span.length == 6
+    assert span == Span(start=2, end=8)
+    assert span != Span(2, 9)
+    assert hash(span) == hash(Span(2, 8))
+    assert span.overlaps(Span(7, 10))
+    assert not span.overlaps(Span(8, 10))
+    # spans are frozen and slotted
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        span.start = 3
+    assert not hasattr(span, "__dict__")
+
+
+def test_modified_span():
+    span = ModifiedSpan(length=3, replaced_spans=[Span(0, 5)])
+    assert span == ModifiedSpan(3, [Span(0, 5)])
+    assert not hasattr(span, "__dict__")
+
+
+def test_dict_conversion():
+    for span in (Span(2, 8), ModifiedSpan(length=3, replaced_spans=[Span(0, 5)])):
+        assert AnySpan.from_dict(span.to_dict()) == span
+
+
+def test_copy_and_pickle():
+    for span in (Span(2, 8), ModifiedSpan(length=3, replaced_spans=[Span(0, 5)])):
+        assert pickle.loads(pickle.dumps(span)) == span
+        assert copy.copy(span) == span
+        assert copy.deepcopy(span) == span
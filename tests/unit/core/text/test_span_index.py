@@ -0,0 +1,82 @@
+import random
+
+import pytest
+
+from medkit.core.text import ModifiedSpan, Span
+from medkit.core.text._span_index import SpanIndex
+
+
+def test_add():
+    index = SpanIndex()
+    assert index.add([Span(0, 5), ModifiedSpan(1, [Span(7, 9)])], "a")
+    # empty ranges are not indexed
+    assert not index.add([], "b")
+    assert not index.add([Span(3, 3)], "c")
+    assert len(index) == 1
+    assert index.get_overlapping(8, 20) == ["a"]
+    assert index.get_contained(0, 9) == ["a"]
+    assert index.get_contained(0, 8) == []
+    assert index.get_at(4) == ["a"]
+    assert index.get_at(9) == []
+
+
+def test_order():
+    index = SpanIndex()
+    index.add_range(10, 20, "a")
+    index.add_range(0, 30, "b")
+    index.add_range(10, 20, "c")
+    index.add_range(10, 15, "d")
+    # ordered by start, end, then insertion order
+    assert index.get_overlapping(0, 100) == ["b", "d", "a", "c"]
+
+
+def test_empty_query():
+    index = SpanIndex()
+    index.add_range(0, 10, "a")
+    # same results whether items are pending or in the tree
+    assert index.get_overlapping(5, 5) == []
+    assert index.get_contained(5, 5) == []
+    for i in range(100):
+        index.add_range(i, i + 10, str(i))
+    index.get_at(0)  # triggers rebuild
+    assert not index._pending
+    assert index.get_overlapping(5, 5) == []
+    assert index.get_contained(5, 5) == []
+
+
+def _get_overlapping_by_scan(ranges, start, end):
+    return [
+        (range_start, range_end, i)
+        for range_start, range_end, i in sorted(ranges)
+        if range_start < end and start < range_end
+    ]
+
+
+@pytest.mark.parametrize("nb_items", [1, 7, 16, 100, 1000])
+def test_random(nb_items):
+    rng = random.Random(nb_items)
+    index = SpanIndex()
+    ranges = []
+    for i in range(nb_items):
+        start = rng.randrange(1000)
+        # mostly short ranges and a few long ones
+        length = rng.randrange(1, 1000) if rng.random() < 0.05 else rng.randrange(1, 20)
+        ranges.append((start, start + length, i))
+        index.add_range(start, start + length, (start, start + length, i))
+
+        # query while adding items
+        if rng.random() < 0.1:
+            start = rng.randrange(1000)
+            end = start + rng.randrange(1, 50)
+            expected = _get_overlapping_by_scan(ranges, start, end)
+            assert index.get_overlapping(start, end) == expected
+
+    for _ in range(100):
+        start = rng.randrange(-10, 1100)
+        end = start + rng.randrange(1, 200)
+        expected = _get_overlapping_by_scan(ranges, start, end)
+        assert index.get_overlapping(start, end) == expected
+        expected = [r for r in expected if r[0] >= start and r[1] <= end]
+        assert index.get_contained(start, end) == expected
+        expected = _get_overlapping_by_scan(ranges, start, start + 1)
+        assert index.get_at(start) == expected
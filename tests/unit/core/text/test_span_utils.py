@@ -44,6 +44,23 @@ def test_remove():
         remove(text, spans, [(34, 35)])
 
 
+def test_replace_contiguous_and_empty_ranges():
+    text = "abcdef"
+    spans = [Span(0, 6)]
+    text, spans = replace(
+        text, spans, [(0, 1), (1, 3), (4, 4), (5, 6)], ["X", "", "Y", "Z"]
+    )
+    assert text == "XdYeZ"
+    assert spans == [
+        ModifiedSpan(1, [Span(0, 1)]),
+        # empty replacement of (1, 3) leaves no span
+        Span(3, 4),
+        ModifiedSpan(1, []),
+        Span(4, 5),
+        ModifiedSpan(1, [Span(5, 6)]),
+    ]
+
+
 def test_extract():
     text = "Hello, my name is John Doe."
     spans = [Span(0, 27)]
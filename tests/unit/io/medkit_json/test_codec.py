@@ -0,0 +1,84 @@
+import json
+import math
+
+import pytest
+
+from medkit.core import Attribute
+from medkit.core.text import (
+    Entity,
+    EntityNormAttribute,
+    ModifiedSpan,
+    Relation,
+    Segment,
+    Span,
+    TextAnnotation,
+    TextDocument,
+)
+from medkit.io.medkit_json._codec import (
+    decode_text_annotation,
+    decode_text_document,
+    dumps,
+    loads,
+)
+
+
+class _CustomEntity(Entity):
+    pass
+
+
+def _build_doc():
+    doc = TextDocument(uid="d1", text="Pas d'asthme ni d'ùlcère.", metadata={"id": 1})
+    sentence = Segment(
+        uid="s1",
+        label="sentence",
+        text="Pas d'asthme ni d'ulcere.",
+        spans=[Span(0, 18), ModifiedSpan(length=6, replaced_spans=[Span(18, 24)])]
+        + [Span(24, 25)],
+    )
+    doc.anns.add(sentence)
+    entity_1 = Entity(uid="e1", label="disease", spans=[Span(6, 12)], text="asthme")
+    entity_1.attrs.add(Attribute(uid="a1", label="negation", value=True))
+    entity_1.attrs.add(EntityNormAttribute(kb_name="umls", kb_id="C0004096"))
+    doc.anns.add(entity_1)
+    entity_2 = _CustomEntity(
+        uid="e2", label="disease", spans=[Span(18, 24)], text="ùlcère"
+    )
+    doc.anns.add(entity_2)
+    relation = Relation(uid="r1", label="and", source_id="e1", target_id="e2")
+    doc.anns.add(relation)
+    doc.attrs.add(Attribute(uid="a2", label="score", value=0.5))
+    return doc
+
+
+def test_decode():
+    doc = _build_doc()
+    doc_data = json.loads(json.dumps(doc.to_dict()))
+    assert decode_text_document(doc_data) == TextDocument.from_dict(doc_data)
+    assert decode_text_document(doc_data) == doc
+
+    for ann in doc.anns:
+        ann_data = json.loads(json.dumps(ann.to_dict()))
+        decoded_ann = decode_text_annotation(ann_data)
+        assert type(decoded_ann) is type(ann)
+        assert decoded_ann == TextAnnotation.from_dict(ann_data)
+
+
+def test_decode_wrong_class():
+    span_data = Span(0, 5).to_dict()
+    with pytest.raises(ValueError):
+        decode_text_annotation(span_data)
+
+
+def test_dumps():
+    doc_data = _build_doc().to_dict()
+    assert dumps(doc_data) == json.dumps(doc_data, ensure_ascii=False)
+
+
+def test_loads():
+    data = {"text": "ùlcère", "values": [1, 2.5, None, True]}
+    assert loads(json.dumps(data)) == data
+    assert loads(json.dumps(data).encode()) == data
+    # values rejected by fast backends
+    data = loads(json.dumps({"value": float("nan"), "big_int": 2**70}))
+    assert math.isnan(data["value"])
+    assert data["big_int"] == 2**70
@@ -1,3 +1,6 @@
+import pytest
+
+from medkit.core.text import TextDocument
 from medkit.io import medkit_json
 from tests.unit.io.medkit_json._text_common import (
     DOC_JSON_FILE,
@@ -37,3 +40,76 @@ def test_load_document_split():
 
     expected_doc = build_doc()
     assert doc == expected_doc
+
+
+def _save_many_docs(output_file, nb_docs=50):
+    docs = [
+        TextDocument(uid=f"d{i}", text=f"Document n°{i} " + "x" * (i % 7))
+        for i in range(nb_docs)
+    ]
+    medkit_json.save_text_documents(docs, output_file)
+    return docs
+
+
+@pytest.mark.parametrize("n_shards", [1, 2, 3, 7, 80])
+def test_load_documents_shards(tmp_path, n_shards):
+    input_file = tmp_path / "docs.jsonl"
+    docs = _save_many_docs(input_file)
+
+    # each document is in exactly one shard
+    loaded_docs = []
+    for shard_index in range(n_shards):
+        loaded_docs += medkit_json.load_text_documents(
+            input_file, n_shards=n_shards, shard_index=shard_index
+        )
+    assert loaded_docs == docs
+
+    with pytest.raises(ValueError):
+        next(medkit_json.load_text_documents(input_file, n_shards=2, shard_index=2))
+
+
+def test_load_document_at(tmp_path):
+    input_file = tmp_path / "docs.jsonl"
+    docs = _save_many_docs(input_file)
+
+    nb_docs = medkit_json.build_text_documents_index(input_file)
+    assert nb_docs == len(docs)
+    index_file = tmp_path / "docs.jsonl.idx"
+    assert index_file.stat().st_size == 8 * len(docs)
+
+    for i in (0, 17, len(docs) - 1):
+        assert medkit_json.load_text_document_at(input_file, i) == docs[i]
+    with pytest.raises(IndexError):
+        medkit_json.load_text_document_at(input_file, len(docs))
+
+    # index is rebuilt when missing
+    index_file.unlink()
+    assert medkit_json.load_text_document_at(input_file, 3) == docs[3]
+    assert index_file.exists()
+
+    # custom index file
+    custom_index_file = tmp_path / "index.bin"
+    assert (
+        medkit_json.load_text_document_at(input_file, 5, index_file=custom_index_file)
+        == docs[5]
+    )
+    assert custom_index_file.exists()
+
+
+def test_load_documents_non_ascii_compatible_encoding(tmp_path):
+    input_file = tmp_path / "docs.jsonl"
+    docs = [TextDocument(uid=f"d{i}", text=f"Document n°{i}") for i in range(5)]
+    medkit_json.save_text_documents(docs, input_file, encoding="utf-16")
+
+    loaded_docs = medkit_json.load_text_documents(input_file, encoding="utf-16")
+    assert list(loaded_docs) == docs
+
+    # byte ranges and offsets can't be used with such encodings
+    with pytest.raises(ValueError, match="sharding is only supported"):
+        next(
+            medkit_json.load_text_documents(
+                input_file, encoding="utf-16", n_shards=2, shard_index=0
+            )
+        )
+    with pytest.raises(ValueError, match="only ASCII-compatible"):
+        medkit_json.build_text_documents_index(input_file, encoding="utf-16")
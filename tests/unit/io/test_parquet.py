@@ -0,0 +1,131 @@
+import pytest
+
+pytest.importorskip(modname="pyarrow", reason="pyarrow is not installed")
+
+from medkit.core import Attribute  # noqa: E402
+from medkit.core.text import (  # noqa: E402
+    Entity,
+    EntityNormAttribute,
+    ModifiedSpan,
+    Relation,
+    Segment,
+    Span,
+    TextDocument,
+)
+from medkit.io.parquet import (  # noqa: E402
+    load_text_anns,
+    load_text_documents,
+    read_table,
+    save_text_documents,
+)
+
+
+def _get_docs():
+    doc_1 = TextDocument(
+        uid="d1", text="I have diabetes and asthma.", metadata={"id": 1}
+    )
+    doc_1.attrs.add(Attribute(uid="a1", label="language", value="en"))
+    sentence = Segment(
+        uid="s1",
+        label="sentence",
+        spans=[
+            ModifiedSpan(length=4, replaced_spans=[Span(0, 1), Span(1, 6)]),
+            Span(6, 27),
+        ],
+        text="I've diabetes and asthma.",
+    )
+    doc_1.anns.add(sentence)
+    entity_1 = Entity(
+        uid="e1",
+        label="disease",
+        spans=[Span(7, 15)],
+        text="diabetes",
+        metadata={"source": "dict"},
+    )
+    entity_1.attrs.add(Attribute(uid="a2", label="is_negated", value=False))
+    entity_1.attrs.add(
+        EntityNormAttribute(
+            uid="a3", kb_name="umls", kb_id="C0011849", kb_version="2021AB"
+        )
+    )
+    doc_1.anns.add(entity_1)
+    entity_2 = Entity(uid="e2", label="disease", spans=[Span(20, 26)], text="asthma")
+    entity_2.attrs.add(Attribute(uid="a4", label="is_negated", value=None))
+    doc_1.anns.add(entity_2)
+    relation = Relation(uid="r1", label="and", source_id="e1", target_id="e2")
+    relation.attrs.add(Attribute(uid="a5", label="score", value=0.5))
+    doc_1.anns.add(relation)
+
+    # document without annotations
+    doc_2 = TextDocument(uid="d2", text="No annotation here.")
+
+    doc_3 = TextDocument(uid="d3", text="I have a headache.")
+    entity_3 = Entity(uid="e3", label="symptom", spans=[Span(9, 17)], text="headache")
+    doc_3.anns.add(entity_3)
+
+    return [doc_1, doc_2, doc_3]
+
+
+@pytest.mark.parametrize("memory_map", [True, False])
+def test_save_load(tmp_path, memory_map):
+    docs = _get_docs()
+    save_text_documents(docs, tmp_path)
+    loaded_docs = list(load_text_documents(tmp_path, memory_map=memory_map))
+    assert loaded_docs == docs
+    # order of annotations must be preserved
+    assert [a.uid for a in loaded_docs[0].anns] == ["s1", "e1", "e2", "r1"]
+    assert type(loaded_docs[0].anns.get_by_id("e1").attrs.get_by_id("a3")) is (
+        EntityNormAttribute
+    )
+
+
+def test_small_batches(tmp_path):
+    """Documents must be reassembled correctly when read by batches of rows"""
+    docs = _get_docs()
+    save_text_documents(docs, tmp_path, batch_size=1)
+    loaded_docs = list(load_text_documents(tmp_path, batch_size=1))
+    assert loaded_docs == docs
+
+
+def test_load_anns(tmp_path):
+    docs = _get_docs()
+    save_text_documents(docs, tmp_path)
+
+    entities = list(load_text_anns(tmp_path, filters=[("label", "=", "disease")]))
+    assert entities == [docs[0].anns.get_by_id("e1"), docs[0].anns.get_by_id("e2")]
+
+    relations = list(load_text_anns(tmp_path, table="relations"))
+    assert relations == [docs[0].anns.get_by_id("r1")]
+
+    assert list(load_text_anns(tmp_path, filters=[("label", "=", "drug")])) == []
+
+    with pytest.raises(ValueError, match="Unknown annotation table"):
+        list(load_text_anns(tmp_path, table="documents"))
+
+
+def test_read_table(tmp_path):
+    docs = _get_docs()
+    save_text_documents(docs, tmp_path)
+
+    table = read_table(tmp_path, "entities", columns=["doc_id", "label", "start"])
+    assert table.column_names == ["doc_id", "label", "start"]
+    assert table.to_pydict() == {
+        "doc_id": ["d1", "d1", "d3"],
+        "label": ["disease", "disease", "symptom"],
+        "start": [7, 20, 9],
+    }
+
+    # original text range of modified spans
+    table = read_table(tmp_path, "segments", columns=["start", "end"])
+    assert table.to_pydict() == {"start": [0], "end": [27]}
+
+    table = read_table(
+        tmp_path,
+        "attributes",
+        columns=["owner_id", "value"],
+        filters=[("label", "=", "is_negated")],
+    )
+    assert table.to_pydict() == {"owner_id": ["e1", "e2"], "value": ["false", "null"]}
+
+    with pytest.raises(ValueError, match="Unknown table"):
+        read_table(tmp_path, "sentences")
@@ -182,6 +182,37 @@ def test_case_sensitivity_exclusion_on():
     assert entity.label == "Diabetes"
 
 
+def test_shared_exclusion_regex():
+    sentence = _get_sentence_segment()
+
+    rules = [
+        RegexpMatcherRule(
+            label="Diabetes", regexp="diabetes", exclusion_regexp="type 1"
+        ),
+        RegexpMatcherRule(label="Asthma", regexp="asthma", exclusion_regexp="type 2"),
+        RegexpMatcherRule(label="Type", regexp="type", exclusion_regexp="type 1"),
+    ]
+    matcher = RegexpMatcher(rules=rules)
+    # exclusion patterns are shared by rules with the same exclusion regexp
+    assert matcher._exclusion_patterns[0] is matcher._exclusion_patterns[2]
+    entities = matcher.run([sentence])
+
+    assert [e.label for e in entities] == ["Asthma"]
+
+
+def test_required_literals_case_insensitive():
+    # "i" matches "İ" and "ı" when ignoring case,
+    # rules should not be skipped for such texts
+    text = "İNSULİNE ınsuline"
+    sentence = _get_sentence_segment(text)
+
+    rule = RegexpMatcherRule(label="Insulin", regexp="insuline", case_sensitive=False)
+    matcher = RegexpMatcher(rules=[rule])
+    entities = matcher.run([sentence])
+
+    assert [e.text for e in entities] == ["İNSULİNE", "ınsuline"]
+
+
 def test_unicode_sensitive_off(caplog):
     sentence = _get_sentence_segment("Le patient fait du diabète")
 
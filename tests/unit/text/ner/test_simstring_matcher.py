@@ -6,6 +6,10 @@ try:
 except ImportError:
     spacy = None
 
+import gc
+import pickle
+import weakref
+
 import pytest
 
 from medkit.core import Attribute, ProvTracer
@@ -336,6 +340,106 @@ def test_prov():
     assert attr_prov.source_data_items == [sentence]
 
 
+def test_candidate_cache():
+    """Candidates occurring several times are looked up only once"""
+
+    sentences = [_get_sentence_segment(), _get_sentence_segment()]
+
+    rule = SimstringMatcherRule(term="diabète", label="problem")
+    matcher = SimstringMatcher(rules=[rule])
+    entities = matcher.run(sentences)
+    assert [e.text for e in entities] == ["diabète", "diabète"]
+
+    cache_info = matcher.cache_info()
+    assert cache_info.hits > 0
+    assert cache_info.hits == cache_info.misses == cache_info.currsize
+
+    # without cache
+    matcher = SimstringMatcher(rules=[rule], candidate_cache_size=0)
+    assert matcher.run(sentences)[1].text == "diabète"
+    assert matcher.cache_info().hits == 0
+
+    # bounded cache
+    matcher = SimstringMatcher(rules=[rule], candidate_cache_size=2)
+    assert matcher.run(sentences)[1].text == "diabète"
+    assert matcher.cache_info().currsize == 2
+
+
+def test_rules_in_memory():
+    sentence = _get_sentence_segment()
+
+    rule = SimstringMatcherRule(term="diabète", label="problem")
+    matcher = SimstringMatcher(rules=[rule], rules_in_memory=True)
+    entities = matcher.run([sentence])
+    assert len(entities) == 1
+    assert entities[0].text == "diabète"
+
+
+def _get_sentence_segments():
+    texts = [
+        "Le patient souffre de diabète et d'asthme.",
+        "Pas d'asthme.",
+        "Antécédents de diabète de type 2.",
+        "Aucun problème.",
+    ]
+    return [_get_sentence_segment(text) for text in texts]
+
+
+def test_workers():
+    rules = [
+        SimstringMatcherRule(term="diabète", label="problem"),
+        SimstringMatcherRule(term="asthme", label="problem"),
+    ]
+    expected_entities = SimstringMatcher(rules=rules).run(_get_sentence_segments())
+
+    matcher = SimstringMatcher(rules=rules, attrs_to_copy=["negation"], n_workers=2)
+    prov_tracer = ProvTracer()
+    matcher.set_prov_tracer(prov_tracer)
+    # pool is reused for successive calls
+    for _ in range(2):
+        sentences = _get_sentence_segments()
+        for sentence in sentences:
+            sentence.attrs.add(Attribute(label="negation", value=False))
+        entities = matcher.run(sentences)
+
+        assert [(e.text, e.spans, e.label) for e in entities] == [
+            (e.text, e.spans, e.label) for e in expected_entities
+        ]
+        entity = entities[-1]
+        assert entity.attrs.get(label="negation")[0].value is False
+        prov = prov_tracer.get_prov(entity.uid)
+        assert prov.op_desc == matcher.description
+        assert prov.source_data_items == [sentences[2]]
+    matcher.close()
+
+
+def test_workers_terminated_when_collected():
+    rule = SimstringMatcherRule(term="diabète", label="problem")
+    matcher = SimstringMatcher(rules=[rule], n_workers=2)
+    matcher.run(_get_sentence_segments())
+    processes = list(matcher._pool._pool)
+    assert all(p.is_alive() for p in processes)
+
+    # pool is terminated when the matcher is garbage collected,
+    # even if close() was not called
+    matcher_ref = weakref.ref(matcher)
+    del matcher
+    gc.collect()
+    assert matcher_ref() is None
+    for process in processes:
+        process.join(timeout=10)
+        assert not process.is_alive()
+
+
+def test_pickle():
+    rule = SimstringMatcherRule(term="diabète", label="problem")
+    matcher = SimstringMatcher(rules=[rule], rules_in_memory=True)
+    matcher_copy = pickle.loads(pickle.dumps(matcher))
+    entities = matcher_copy.run([_get_sentence_segment()])
+    assert len(entities) == 1
+    assert entities[0].text == "diabète"
+
+
 def test_load_save_rules(tmpdir):
     rules_file = tmpdir / "rules.yml"
     rules = [
@@ -206,6 +206,186 @@ def test_nb_umls_embeddings_chunks(embeddings_cache_dir):
     assert norm_attr.term == expected_norm_attr.term
 
 
+def _check_same_norm_attrs(normalizer, ref_normalizer, exact_scores=False):
+    entities = [
+        _get_entity(label="disease", text="asthma"),
+        _get_entity(label="disease", text="type 1 diabts"),
+    ]
+    normalizer.run(entities)
+    ref_entities = [
+        _get_entity(label="disease", text="asthma"),
+        _get_entity(label="disease", text="type 1 diabts"),
+    ]
+    ref_normalizer.run(ref_entities)
+
+    for entity, ref_entity in zip(entities, ref_entities):
+        norm_attrs = entity.attrs.get_norms()
+        ref_norm_attrs = ref_entity.attrs.get_norms()
+        assert len(norm_attrs) == len(ref_norm_attrs) == 2
+        for norm_attr, ref_norm_attr in zip(norm_attrs, ref_norm_attrs):
+            assert norm_attr.cui == ref_norm_attr.cui
+            assert norm_attr.term == ref_norm_attr.term
+            if exact_scores:
+                assert norm_attr.score == ref_norm_attr.score
+            else:
+                assert norm_attr.score == pytest.approx(ref_norm_attr.score, abs=1e-3)
+
+
+def test_ann(embeddings_cache_dir):
+    """Approximate nearest neighbour search of umls embeddings"""
+
+    normalizer = UMLSCoderNormalizer(
+        umls_mrconso_file=_PATH_TO_MR_CONSO_FILE,
+        language=_LANGUAGE,
+        model=_MODEL,
+        embeddings_cache_dir=embeddings_cache_dir,
+        max_nb_matches=2,
+        ann_nb_lists=3,
+        ann_nb_probes=3,
+    )
+    # index is stored in cache dir
+    assert (embeddings_cache_dir / "ivf_index_3.npz").exists()
+
+    # searching all lists gives the same results as an exhaustive search
+    ref_normalizer = UMLSCoderNormalizer(
+        umls_mrconso_file=_PATH_TO_MR_CONSO_FILE,
+        language=_LANGUAGE,
+        model=_MODEL,
+        embeddings_cache_dir=embeddings_cache_dir,
+        max_nb_matches=2,
+    )
+    # scores are rounded in the same way
+    _check_same_norm_attrs(normalizer, ref_normalizer, exact_scores=True)
+
+
+def test_umls_embeddings_dtype(embeddings_cache_dir):
+    """Chunked similarity computation with float16 memory-mapped umls embeddings"""
+
+    normalizer = UMLSCoderNormalizer(
+        umls_mrconso_file=_PATH_TO_MR_CONSO_FILE,
+        language=_LANGUAGE,
+        model=_MODEL,
+        embeddings_cache_dir=embeddings_cache_dir,
+        max_nb_matches=2,
+        nb_umls_embeddings_chunks=2,
+        umls_embeddings_dtype="float16",
+    )
+    assert (embeddings_cache_dir / "embeddings_float16.npy").exists()
+
+    ref_normalizer = UMLSCoderNormalizer(
+        umls_mrconso_file=_PATH_TO_MR_CONSO_FILE,
+        language=_LANGUAGE,
+        model=_MODEL,
+        embeddings_cache_dir=embeddings_cache_dir,
+        max_nb_matches=2,
+    )
+    _check_same_norm_attrs(normalizer, ref_normalizer)
+
+
+def test_cache(embeddings_cache_dir):
+    """Entities with same text are matched once, and matches are cached"""
+
+    normalizer = UMLSCoderNormalizer(
+        umls_mrconso_file=_PATH_TO_MR_CONSO_FILE,
+        language=_LANGUAGE,
+        model=_MODEL,
+        embeddings_cache_dir=embeddings_cache_dir,
+    )
+    entities = _get_entities(10)
+    normalizer.run(entities)
+    # only 2 distinct texts among 10 entities
+    cache_info = normalizer.cache_info()
+    assert cache_info.misses == 2
+    assert cache_info.hits == 8
+    assert cache_info.currsize == 2
+
+    # entities with same text have same normalization attributes
+    for entity in entities[2:]:
+        ref_entity = entities[0] if entity.text == entities[0].text else entities[1]
+        norm_attr = entity.attrs.get_norms()[0]
+        ref_norm_attr = ref_entity.attrs.get_norms()[0]
+        assert norm_attr.cui == ref_norm_attr.cui
+        assert norm_attr.score == ref_norm_attr.score
+        assert norm_attr.uid != ref_norm_attr.uid
+
+    # matches are reused on next call
+    normalizer.run(_get_entities(2))
+    assert normalizer.cache_info().hits == 10
+    assert normalizer.cache_info().misses == 2
+
+    normalizer.cache_clear()
+    assert normalizer.cache_info() == (0, 0, 100_000, 0)
+
+
+def test_cache_size(embeddings_cache_dir):
+    normalizer = UMLSCoderNormalizer(
+        umls_mrconso_file=_PATH_TO_MR_CONSO_FILE,
+        language=_LANGUAGE,
+        model=_MODEL,
+        embeddings_cache_dir=embeddings_cache_dir,
+        cache_size=1,
+    )
+    normalizer.run(_get_entities(2))
+    assert normalizer.cache_info().currsize == 1
+
+    # nothing kept between calls but entities are still deduplicated
+    normalizer = UMLSCoderNormalizer(
+        umls_mrconso_file=_PATH_TO_MR_CONSO_FILE,
+        language=_LANGUAGE,
+        model=_MODEL,
+        embeddings_cache_dir=embeddings_cache_dir,
+        cache_size=0,
+    )
+    normalizer.run(_get_entities(4))
+    normalizer.run(_get_entities(4))
+    assert normalizer.cache_info() == (4, 4, 0, 0)
+
+
+def test_persist_cache(embeddings_cache_dir):
+    normalizer = UMLSCoderNormalizer(
+        umls_mrconso_file=_PATH_TO_MR_CONSO_FILE,
+        language=_LANGUAGE,
+        model=_MODEL,
+        embeddings_cache_dir=embeddings_cache_dir,
+        persist_cache=True,
+    )
+    normalizer.cache_clear()
+    entities = _get_entities(2)
+    normalizer.run(entities)
+    assert normalizer.cache_info().misses == 2
+    assert (embeddings_cache_dir / "results_cache.db").exists()
+
+    # matches are retrieved by another normalizer
+    other_normalizer = UMLSCoderNormalizer(
+        umls_mrconso_file=_PATH_TO_MR_CONSO_FILE,
+        language=_LANGUAGE,
+        model=_MODEL,
+        embeddings_cache_dir=embeddings_cache_dir,
+        persist_cache=True,
+    )
+    other_entities = _get_entities(2)
+    other_normalizer.run(other_entities)
+    assert other_normalizer.cache_info().hits == 2
+    assert other_normalizer.cache_info().misses == 0
+    for entity, other_entity in zip(entities, other_entities):
+        norm_attr = entity.attrs.get_norms()[0]
+        other_norm_attr = other_entity.attrs.get_norms()[0]
+        assert other_norm_attr.cui == norm_attr.cui
+        assert other_norm_attr.score == norm_attr.score
+
+    # but not by a normalizer with different search params
+    other_normalizer = UMLSCoderNormalizer(
+        umls_mrconso_file=_PATH_TO_MR_CONSO_FILE,
+        language=_LANGUAGE,
+        model=_MODEL,
+        embeddings_cache_dir=embeddings_cache_dir,
+        max_nb_matches=2,
+        persist_cache=True,
+    )
+    other_normalizer.run(_get_entities(2))
+    assert other_normalizer.cache_info().misses == 2
+
+
 def test_inconsistent_params(module_tmp_dir):
     """Use UMLS embeddings dir containing embeddings pre-computed with different params
     """
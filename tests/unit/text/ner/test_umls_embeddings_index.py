@@ -0,0 +1,69 @@
+import numpy as np
+
+from medkit.text.ner._umls_embeddings_index import IVFIndex
+
+
+def _get_embeddings(nb_embeddings, nb_clusters=20, dim=16):
+    rng = np.random.default_rng(0)
+    centers = rng.normal(size=(nb_clusters, dim))
+    embeddings = centers[rng.integers(0, nb_clusters, size=nb_embeddings)]
+    embeddings += 0.2 * rng.normal(size=embeddings.shape)
+    embeddings /= np.linalg.norm(embeddings, axis=1, keepdims=True)
+    return embeddings.astype(np.float32)
+
+
+def _exact_search(queries, embeddings, k):
+    scores = queries @ embeddings.T
+    return np.argsort(-scores, axis=1)[:, :k].tolist()
+
+
+def test_build():
+    embeddings = _get_embeddings(1000)
+    index = IVFIndex.build(embeddings, nb_lists=32)
+
+    assert index.nb_lists == 32
+    assert index.centroids.shape == (32, 16)
+    # each embedding belongs to exactly one list
+    assert sorted(index.ids.tolist()) == list(range(1000))
+    assert index.offsets[0] == 0 and index.offsets[-1] == 1000
+
+    # no more lists than embeddings
+    index = IVFIndex.build(embeddings[:10], nb_lists=32)
+    assert index.nb_lists == 10
+
+
+def test_search():
+    embeddings = _get_embeddings(1000)
+    queries = embeddings[:50] + 0.01
+    index = IVFIndex.build(embeddings, nb_lists=32)
+    expected_indices = _exact_search(queries, embeddings, k=3)
+
+    # searching all lists is equivalent to an exhaustive search
+    indices, scores = index.search(queries, embeddings, k=3, nb_probes=32)
+    assert indices == expected_indices
+    for query_scores in scores:
+        assert query_scores == sorted(query_scores, reverse=True)
+    np.testing.assert_allclose(
+        scores, np.take_along_axis(queries @ embeddings.T, np.array(indices), axis=1)
+    )
+
+    # good recall when searching a few lists
+    indices, _ = index.search(queries, embeddings, k=3, nb_probes=4)
+    recall = np.mean([i[0] == e[0] for i, e in zip(indices, expected_indices)])
+    assert recall >= 0.9
+
+
+def test_search_memory_mapped_float16(tmp_path):
+    embeddings = _get_embeddings(1000)
+    np.save(tmp_path / "embeddings.npy", embeddings.astype(np.float16))
+    mmap_embeddings = np.load(tmp_path / "embeddings.npy", mmap_mode="r")
+
+    index = IVFIndex.build(mmap_embeddings, nb_lists=32)
+    index.save(tmp_path / "index.npz")
+    loaded_index = IVFIndex.load(tmp_path / "index.npz")
+    np.testing.assert_array_equal(loaded_index.ids, index.ids)
+
+    queries = embeddings[:10]
+    indices, scores = loaded_index.search(queries, mmap_embeddings, k=1, nb_probes=4)
+    assert [i[0] for i in indices] == list(range(10))
+    np.testing.assert_allclose(scores, 1.0, atol=1e-2)
@@ -1,4 +1,6 @@
 from pathlib import Path
+import shelve
+import shutil
 
 import pytest
 
@@ -252,3 +254,58 @@ def test_output_label(output_labels, expected_label, tmpdir):
 
     assert len(entities) == 2
     assert all(ent.label == expected_label for ent in entities)
+
+
+def test_build_database(tmpdir):
+    tmpdir = Path(tmpdir)
+    timings = UMLSMatcher.build_database(
+        _UMLS_DIR, tmpdir / "cache", language="ENG", show_progress=False
+    )
+    assert set(timings) == {"load_semtypes", "build_rules", "write_databases"}
+
+    # parallel build gives the same databases
+    UMLSMatcher.build_database(
+        _UMLS_DIR,
+        tmpdir / "cache_parallel",
+        language="ENG",
+        n_workers=2,
+        show_progress=False,
+    )
+    with shelve.open(str(tmpdir / "cache" / "rules"), flag="r") as rules_db:
+        rules_by_term = dict(rules_db)
+    with shelve.open(str(tmpdir / "cache_parallel" / "rules"), flag="r") as rules_db:
+        assert dict(rules_db) == rules_by_term
+    assert (tmpdir / "cache" / "params.yml").read_text() == (
+        tmpdir / "cache_parallel" / "params.yml"
+    ).read_text()
+
+
+def test_relocated_cache(tmpdir):
+    tmpdir = Path(tmpdir)
+    UMLSMatcher.build_database(
+        _UMLS_DIR, tmpdir / "cache", language="ENG", show_progress=False
+    )
+    shutil.move(tmpdir / "cache", tmpdir / "moved_cache")
+
+    # umls dir not needed when the database exists
+    umls_matcher = UMLSMatcher(
+        umls_dir=None, language="ENG", cache_dir=tmpdir / "moved_cache"
+    )
+    entities = umls_matcher.run([_get_sentence_segment("The patient has asthma.")])
+    assert len(entities) == 1
+    norm_attr = entities[0].attrs.get_norms()[0]
+    assert norm_attr.cui == _ASTHMA_CUI
+    assert norm_attr.umls_version == "2021AB"
+
+    # params must still match
+    with pytest.raises(Exception, match="different params"):
+        UMLSMatcher(
+            umls_dir=None,
+            language="ENG",
+            lowercase=False,
+            cache_dir=tmpdir / "moved_cache",
+        )
+
+    # umls dir needed when there is no database
+    with pytest.raises(ValueError, match="umls_dir must be provided"):
+        UMLSMatcher(umls_dir=None, language="ENG", cache_dir=tmpdir / "empty_cache")
@@ -8,6 +8,8 @@ from medkit.text.ner.umls_utils import (
     preprocess_term_to_match,
     preprocess_acronym,
     guess_umls_version,
+    _get_line_ranges,
+    _load_umls_rows,
 )
 
 
@@ -112,3 +114,21 @@ _VERSION_TEST_PARAMS = [
 def test_guess_umls_version(path):
     version = guess_umls_version(path)
     assert version == "2021AB"
+
+
+def test_load_umls_rows_by_range():
+    file_size = _PATH_TO_MR_CONSO_FILE.stat().st_size
+    ranges = _get_line_ranges(_PATH_TO_MR_CONSO_FILE, nb_ranges=4)
+    assert len(ranges) == 4
+    assert ranges[0][0] == 0 and ranges[-1][1] == file_size
+    assert all(end == start for (_, end), (start, _) in zip(ranges, ranges[1:]))
+
+    # ranges start at line beginnings so they contain all lines, and keeping
+    # the 1st row of each LUI across ranges gives the same result as a
+    # sequential load
+    rows = {}
+    for start, end in ranges:
+        for lui, cui, term in _load_umls_rows(_PATH_TO_MR_CONSO_FILE, start, end):
+            rows.setdefault(lui, (cui, term))
+    entries = list(load_umls_entries(_PATH_TO_MR_CONSO_FILE))
+    assert list(rows.values()) == [(e.cui, e.term) for e in entries]
@@ -1,10 +1,10 @@
 import pytest
-from intervaltree import IntervalTree
 
 from medkit.core import Attribute, ProvTracer
 from medkit.core.text import Segment, TextDocument, span_utils
+from medkit.core.text._span_index import SpanIndex
 from medkit.text.postprocessing import AttributeDuplicator, compute_nested_segments
-from medkit.text.postprocessing.alignment_utils import _create_segments_tree
+from medkit.text.postprocessing.alignment_utils import _create_segments_index
 
 
 def _extract_segment(segment, ranges, label, uid=None):
@@ -50,13 +50,13 @@ def test_compute_nested_segments(doc):
     assert nested[1][1][0].uid == "target_1"
 
 
-def test__create_segments_tree(doc):
+def test__create_segments_index(doc):
     targets = doc.anns.get(label="disease")
-    tree = _create_segments_tree(target_segments=targets)
-    assert isinstance(tree, IntervalTree)
-    assert len(tree.overlap(17, 37)) == 1
-    assert len(tree.overlap(63, 73)) == 1
-    assert len(tree.overlap(0, 100)) == 2
+    index = _create_segments_index(target_segments=targets)
+    assert isinstance(index, SpanIndex)
+    assert len(index.get_overlapping(17, 37)) == 1
+    assert len(index.get_overlapping(63, 73)) == 1
+    assert index.get_overlapping(0, 100) == targets
 
 
 def test_default_attribute_duplicator(doc):
@@ -1,3 +1,5 @@
+import random
+
 from medkit.core.text import Entity, Span
 from medkit.core.text.span import ModifiedSpan
 from medkit.text.postprocessing import filter_overlapping_entities
@@ -39,3 +41,59 @@ def test_filter_entities_with_modified_span():
     # check only the longest is returned
     assert len(filtered_entities) == 1
     assert filtered_entities[0].uid == entities[1].uid
+
+
+def test_filter_entities_adjacent():
+    entities = [
+        Entity(label="CHEM", spans=[Span(0, 12)], text="chlorhydrate"),
+        Entity(label="CHEM", spans=[Span(12, 15)], text=" de"),
+        Entity(label="CHEM", spans=[Span(16, 24)], text="fentanyl"),
+        Entity(label="CHEM", spans=[Span(10, 14)], text="te d"),
+    ]
+    filtered_entities = filter_overlapping_entities(entities)
+    assert filtered_entities == [entities[0], entities[1], entities[2]]
+
+
+def test_filter_entities_empty_range():
+    # entity made of inserted text only, not covering any part of the raw text
+    inserted_entity = Entity(
+        label="CHEM", spans=[ModifiedSpan(length=8, replaced_spans=[])], text="fentanyl"
+    )
+    entities = [
+        inserted_entity,
+        Entity(label="CHEM", spans=[Span(0, 12)], text="chlorhydrate"),
+        Entity(label="CHEM", spans=[Span(0, 24)], text="chlorhydrate de fentanyl"),
+    ]
+    filtered_entities = filter_overlapping_entities(entities)
+    assert filtered_entities == [entities[2], inserted_entity]
+
+
+def _filter_overlapping_entities_with_chars(entities):
+    # reference implementation marking all chars covered by kept entities
+    sorted_entities = sorted(
+        entities,
+        key=lambda e: (e.spans[-1].end - e.spans[0].start, e.spans[0].start),
+        reverse=True,
+    )
+    seen_chars = set()
+    filtered_entities = []
+    for ent in sorted_entities:
+        start, end = ent.spans[0].start, ent.spans[-1].end
+        if start not in seen_chars and end not in seen_chars:
+            seen_chars.update(range(start, end))
+            filtered_entities.append(ent)
+    return sorted(filtered_entities, key=lambda ent: ent.spans[0].start)
+
+
+def test_filter_entities_random():
+    rng = random.Random(0)
+    for _ in range(20):
+        entities = []
+        for _ in range(50):
+            start = rng.randrange(200)
+            end = start + rng.randrange(1, 15)
+            entities.append(
+                Entity(label="CHEM", spans=[Span(start, end)], text="x" * (end - start))
+            )
+        expected_entities = _filter_overlapping_entities_with_chars(entities)
+        assert filter_overlapping_entities(entities) == expected_entities
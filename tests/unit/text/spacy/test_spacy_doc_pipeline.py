@@ -182,3 +182,21 @@ def test_prov(nlp_spacy_modified):
     assert attr_prov.op_desc == spacydoc_pipeline.description
     # it is a medkit entity, medkit object origin was entity
     assert attr_prov.source_data_items == [entity]
+
+
+@pytest.mark.parametrize("batch_size,n_process", [(1, 1), (2, 1), (2, 2)])
+def test_batches(nlp_spacy_modified, batch_size, n_process):
+    spacydoc_pipeline = SpacyDocPipeline(
+        nlp=nlp_spacy_modified, batch_size=batch_size, n_process=n_process
+    )
+    medkit_docs = [_get_doc() for _ in range(5)]
+    spacydoc_pipeline.run(medkit_docs)
+
+    # each doc received its own annotations and attributes
+    for medkit_doc in medkit_docs:
+        assert len(medkit_doc.anns) == 3
+        date = medkit_doc.anns.get(label="DATE")[0]
+        assert date.text == "2005"
+        assert not date.attrs.get(label="is_from_medkit")[0].value
+        disease = medkit_doc.anns.get(label="disease")[0]
+        assert disease.attrs.get(label="is_from_medkit")[0].value
@@ -93,3 +93,15 @@ def test_prov(nlp_spacy_modified):
     assert attr_prov.data_item == attribute
     assert attr_prov.op_desc == pipe.description
     assert attr_prov.source_data_items == [segment]
+
+
+@pytest.mark.parametrize("batch_size,n_process", [(1, 1), (2, 1), (2, 2)])
+def test_batches(nlp_spacy_modified, batch_size, n_process):
+    segments = [_get_segment() for _ in range(5)]
+    pipe = SpacyPipeline(nlp_spacy_modified, batch_size=batch_size, n_process=n_process)
+    new_segments = pipe.run(segments)
+
+    # 2 entities per segment, in the same order as segments
+    assert len(new_segments) == 10
+    assert [seg.label for seg in new_segments] == ["PERSON", "DATE"] * 5
+    assert all(seg.attrs.get(label="has_numbers") for seg in new_segments)
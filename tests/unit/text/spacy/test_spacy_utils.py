@@ -159,6 +159,26 @@ def test_medkit_to_spacy_doc_all_anns(nlp_spacy):
     assert len(spacy_doc.spans["PEOPLE"]) == 2
 
 
+def test_medkit_to_spacy_doc_discontinuous_entity(nlp_spacy):
+    # discontinuous entities are converted to their expanded span
+    medkit_doc = TextDocument(text=TEXT)
+    spans = [Span(4, 11), Span(13, 20)]
+    entity = Entity(label="person", spans=spans, text="patient father")
+    medkit_doc.anns.add(entity)
+
+    with pytest.warns(UserWarning, match="are discontinuous"):
+        spacy_doc = spacy_utils.build_spacy_doc_from_medkit_doc(
+            nlp=nlp_spacy,
+            medkit_doc=medkit_doc,
+            labels_anns=None,
+            attrs=[],
+            include_medkit_info=False,
+        )
+    assert len(spacy_doc.ents) == 1
+    spacy_entity = spacy_doc.ents[0]
+    assert (spacy_entity.start_char, spacy_entity.end_char) == (4, 20)
+
+
 def test_medkit_to_spacy_doc_all_anns_family_attr(nlp_spacy):
     medkit_doc = _get_doc()
     raw_segment = medkit_doc.raw_segment
@@ -0,0 +1,51 @@
+import pytest
+
+from medkit.text.utils._regexp_literals import (
+    RulePrefilter,
+    fold_case,
+    get_required_literals,
+)
+
+
+@pytest.mark.parametrize(
+    "regexp,case_sensitive,expected_literals",
+    [
+        ("diabetes", True, ["diabetes"]),
+        ("DIABETES", False, ["diabetes"]),
+        ("type ?1 diabetes", True, ["1 diabetes"]),
+        (r"\d+ mg", True, [" mg"]),
+        (r"n\.b\b", True, ["n.b"]),
+        ("asthma|[^a-z]IDM[^a-z]|type.{0,5}1", True, ["asthma", "IDM", "type"]),
+        ("(type 1|type 2) diabetes", True, [" diabetes"]),
+        ("a{2}sthma", True, ["sthma"]),
+        # alternative without literal
+        ("asthma|[0-9]+", True, None),
+        # inline flags
+        ("(?i)diabetes", True, None),
+        ("DIABÈTE", False, ["diabète"]),
+    ],
+)
+def test_required_literals(regexp, case_sensitive, expected_literals):
+    assert get_required_literals(regexp, case_sensitive) == expected_literals
+
+
+def test_fold_case():
+    # chars matching each other when ignoring case have the same folded version
+    assert fold_case("İNSULİNE") == fold_case("ınsuline") == "insuline"
+    assert fold_case("ſ") == fold_case("S") == "s"
+    assert fold_case("DIABÈTE") == "diabète"
+
+
+def test_rule_prefilter():
+    regexps = ["diabetes", "asthma|covid", "[0-9]+", "DIABETES", "diabete"]
+    case_sensitive = [True, True, True, False, False]
+    unicode_sensitive = [True, True, True, True, False]
+    prefilter = RulePrefilter(regexps, case_sensitive, unicode_sensitive)
+
+    text = "Patient has asthma and type 1 diabète"
+    text_ascii = "Patient has asthma and type 1 diabete"
+    assert prefilter.get_candidate_rules(text, text_ascii) == [1, 2, 4]
+    text = "Patient has type 1 Diabetes"
+    assert prefilter.get_candidate_rules(text, text) == [2, 3, 4]
+    # rules without literals are always returned
+    assert prefilter.get_candidate_rules("Nothing", "Nothing") == [2]